@@ -0,0 +1,43 @@
+# app/api/routes_audit.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.models.audit import AuditEvent
+from app.schemas.audit import AuditEventRead, AuditPage
+
+router = APIRouter(prefix="/api/audit", tags=["Audit"])
+
+
+@router.get("", response_model=AuditPage)
+def list_audit_events(
+    entity: Optional[str] = Query(None, description="user, role, department, blog, author or category"),
+    entity_id: Optional[int] = Query(None, description="Requires entity"),
+    actor_id: Optional[int] = None,
+    before: Optional[int] = Query(None, description="`next` from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Newest first. Pages by id (`before`), so each page is one index range
+    scan however deep it goes. Events appear within AUDIT_FLUSH_SECONDS of the write.
+    """
+    if entity_id is not None and entity is None:
+        raise HTTPException(status_code=400, detail="entity_id requires entity")
+    stmt = select(AuditEvent).order_by(AuditEvent.id.desc()).limit(limit)
+    if entity is not None:
+        stmt = stmt.where(AuditEvent.entity == entity)
+    if entity_id is not None:
+        stmt = stmt.where(AuditEvent.entity_id == entity_id)
+    if actor_id is not None:
+        stmt = stmt.where(AuditEvent.actor_id == actor_id)
+    if before is not None:
+        stmt = stmt.where(AuditEvent.id < before)
+
+    events = db.execute(stmt).scalars().all()
+    return {
+        "items": [AuditEventRead.model_validate(e) for e in events],
+        "next": events[-1].id if len(events) == limit else None,
+    }
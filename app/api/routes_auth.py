@@ -6,6 +6,7 @@ from app.models.user import User
 from app.schemas.auth import LoginRequest, TokenResponse
 from app.schemas.user import UserRead
 from app.core.security import create_access_token
+from app.core.metrics import record_login
 
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
 
@@ -13,10 +14,12 @@ router = APIRouter(prefix="/api/auth", tags=["Auth"])
 def login(creds: LoginRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == creds.email).first()
     if not user or not user.check_password(creds.password):
+        record_login(success=False)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
+    record_login(success=True)
     token = create_access_token({"sub": str(user.id), "email": user.email})
     return TokenResponse(token=token, user=UserRead.model_validate(user))
@@ -1,23 +1,53 @@
 # app/api/routes_authors.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.core import cache
+from app.core.compression import json_response
+from app.db import reads
+from app.db.errors import constraint_errors
 from app.models.author import Author
-from app.schemas.author import AuthorCreate, AuthorRead, AuthorUpdate
+from app.models.blog import Blog
+from app.models.blog_documents import BlogDocument
+from app.schemas.batch import BatchRead
+from app.schemas.author import AuthorCreate, AuthorRead, AuthorUpdate, AuthorWithCounts
+from app.schemas.job import JobRead
+from app.services import audit, cascade, changes, documents, suggest
+from app.utils.batch import in_request_order, parse_keys
 
 router = APIRouter(prefix="/api/authors", tags=["Authors"])
 
-@router.get("", response_model=List[AuthorRead])
-def list_authors(db: Session = Depends(get_db)):
-    authors = db.query(Author).order_by(Author.name).all()
-    return [AuthorRead.model_validate(a) for a in authors]
+# Unique column -> 400 detail
+_CONFLICTS = {"slug": "Author slug already exists"}
+
+_WITH_COUNTS = TypeAdapter(List[AuthorWithCounts])
+
+
+@router.get("", response_model=Union[List[AuthorWithCounts], List[AuthorRead]])
+def list_authors(
+    request: Request,
+    with_counts: bool = Query(False, description="Add published `posts` and `latest_post_at`"),
+    sort: Literal["name", "count"] = Query("name", description="`count` (most posts first) needs with_counts"),
+    db: Session = Depends(get_db),
+):
+    if not with_counts:
+        if sort != "name":
+            raise HTTPException(status_code=400, detail="sort=count requires with_counts=true")
+        return [AuthorRead.model_validate(a) for a in reads.rows(db, reads.AUTHORS)]
+
+    # One grouped query; the result is cached until an author or blog write.
+    hit = cache.lookup(request)
+    if hit is not None:
+        return json_response(hit.body, hit.encoding)
+    rows = _WITH_COUNTS.validate_python(reads.rows(db, reads.AUTHORS_WITH_COUNTS[sort]))
+    return cache.send(request, _WITH_COUNTS.dump_json(rows), ["authors:list", "blogs:list"])
 
 @router.post("", response_model=AuthorRead, status_code=status.HTTP_201_CREATED)
 def create_author(body: AuthorCreate, db: Session = Depends(get_db)):
-    if db.query(Author).filter(Author.slug == body.slug).first():
-        raise HTTPException(status_code=400, detail="Author slug already exists")
     author = Author(
         name=body.name,
         slug=body.slug,
@@ -26,10 +56,20 @@ def create_author(body: AuthorCreate, db: Session = Depends(get_db)):
         avatar=str(body.avatar) if body.avatar else None,
     )
     db.add(author)
-    db.commit()
-    db.refresh(author)
+    with constraint_errors(db, **_CONFLICTS):
+        db.commit()
+    audit.record("author", author.id, "create", audit.snapshot(author))
+    cache.invalidate("authors:list")
+    suggest.upsert("author", author.id, author.name, author.slug)
     return AuthorRead.model_validate(author)
 
+@router.get("/batch", response_model=BatchRead[AuthorRead, int])
+def get_authors_batch(ids: str = Query(..., description="Comma-separated ids, e.g. 1,2,3"), db: Session = Depends(get_db)):
+    keys = parse_keys(ids, int)
+    rows = db.query(Author).filter(Author.id.in_(keys)).all()
+    items, missing = in_request_order(keys, rows, lambda r: r.id)
+    return {"items": [AuthorRead.model_validate(r) for r in items], "missing": missing}
+
 @router.get("/{author_id}", response_model=AuthorRead)
 def get_author(author_id: int, db: Session = Depends(get_db)):
     author = db.query(Author).get(author_id)
@@ -38,7 +78,9 @@ def get_author(author_id: int, db: Session = Depends(get_db)):
     return AuthorRead.model_validate(author)
 
 @router.put("/{author_id}", response_model=AuthorRead)
-def update_author(author_id: int, body: AuthorUpdate, db: Session = Depends(get_db)):
+def update_author(
+    author_id: int, body: AuthorUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     author = db.query(Author).get(author_id)
     if not author:
         raise HTTPException(status_code=404, detail="Author not found")
@@ -52,16 +94,37 @@ def update_author(author_id: int, body: AuthorUpdate, db: Session = Depends(get_
         author.bio = body.bio
     if body.avatar is not None:
         author.avatar = str(body.avatar)
+    diff = audit.diff(author)
     db.add(author)
-    db.commit()
-    db.refresh(author)
+    changes.record_where(db, Blog.author_id == author.id)
+    documents.drop(db, BlogDocument.author_id == author.id)
+    with constraint_errors(db, **_CONFLICTS):
+        db.commit()
+    audit.record("author", author.id, "update", diff)
+    background_tasks.add_task(documents.rebuild_missing_in_background)
+    cache.invalidate(f"author:{author.id}", "authors:list", "blogs:list")
+    suggest.upsert("author", author.id, author.name, author.slug)
     return AuthorRead.model_validate(author)
 
-@router.delete("/{author_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_author(author_id: int, db: Session = Depends(get_db)):
-    author = db.query(Author).get(author_id)
-    if not author:
+@router.delete(
+    "/{author_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={202: {"model": JobRead, "description": "Deletion queued (background=true)"}},
+)
+def delete_author(
+    author_id: int,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Delete after responding; poll GET /api/jobs/{id}"),
+    db: Session = Depends(get_db),
+):
+    """Deletes the author and all of its blogs in batches (see app/services/cascade.py)."""
+    if not db.query(Author.id).filter(Author.id == author_id).first():
         raise HTTPException(status_code=404, detail="Author not found")
-    db.delete(author)
-    db.commit()
+    if background:
+        job = cascade.start_job(db, "author", author_id)
+        background_tasks.add_task(cascade.run_job, job.id, "author", author_id)
+        return JSONResponse(JobRead.model_validate(job).model_dump(mode="json"), status_code=status.HTTP_202_ACCEPTED)
+    removed = cascade.delete_owner("author", author_id)
+    cache.invalidate(f"author:{author_id}", "authors:list", "blogs:list")
+    background_tasks.add_task(cascade.reindex, "author", author_id, removed)
     return None
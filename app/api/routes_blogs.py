@@ -1,18 +1,42 @@
 # app/api/routes_blogs.py
-from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+import hashlib
+from typing import List, Optional, Any, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy import func, select
 
 from app.api.deps import get_db
+from app.core import cache
+from app.core.compression import cached_body, json_response
+from app.core.config import settings
+from app.db import reads
+from app.db.errors import constraint_errors
 from app.models.blog import Blog
 from app.models.author import Author
 from app.models.category import Category
+from app.models.blog_documents import BlogDocument
+from app.models.related import BlogRelated
+from app.schemas.batch import BatchRead
 from app.schemas.blog import BlogRead, BlogCreate, BlogUpdate
+from app.schemas.changes import BlogChangesPage
+from app.schemas.related import RelatedBlog
+from app.schemas.views import PopularBlog
+from app.services import audit, changes, documents, related, rollups, suggest, views
+from app.utils.batch import in_request_order, parse_keys
+from app.utils.fieldsets import dump_json, load_options, parse_fields
 from app.utils.slugify import slugify
 
 router = APIRouter(prefix="/api/blogs", tags=["Blogs"])
 
+# BlogRead fields backed by a relationship: (relationship, foreign key)
+_RELATIONS = {
+    "author": (Blog.author, Blog.author_id),
+    "category": (Blog.category_obj, Blog.category_id),
+}
+_FIELDS_DOC = "Comma-separated BlogRead fields to return, e.g. id,slug,title,banner_img"
+_CONFLICTS = {"slug": "Slug already in use"}
+
 
 def _normalise_sections(sections: Optional[List[Any]]) -> Optional[List[dict]]:
     """
@@ -51,8 +75,85 @@ def _normalise_sections(sections: Optional[List[Any]]) -> Optional[List[dict]]:
     return normalized
 
 
+def _filtered_blogs(
+    db: Session,
+    q: Optional[str],
+    category: Optional[str],
+    author: Optional[str],
+    published: Optional[bool],
+):
+    query = db.query(Blog)
+
+    if published is not None:
+        query = query.filter(Blog.is_published == published)
+
+    if category:
+        query = query.join(Category).filter(func.lower(Category.slug) == category.lower())
+
+    if author:
+        query = query.join(Author).filter(func.lower(Author.slug) == author.lower())
+
+    if q:
+        q_like = f"%{q.lower()}%"
+        query = query.filter(
+            func.lower(Blog.title).like(q_like) | func.lower(func.coalesce(Blog.deck, "")).like(q_like)
+        )
+
+    return query
+
+
+def _with_revisions(query, fields: Optional[Tuple[str, ...]] = None):
+    """
+    Select only what identifies the current revision of each blog's payload:
+    the blog's own `revision` counter plus its nested author's and category's
+    (when the fieldset includes them). The counters go up on every UPDATE, so
+    two edits within one clock tick still get different keys, which
+    `updated_at` (whole seconds on MySQL) would not.
+    """
+    entities = [Blog.id, Blog.slug, Blog.revision, Blog.author_id, Blog.category_id]
+    if fields is None or "author" in fields:
+        author_rev = aliased(Author)
+        query = query.outerjoin(author_rev, author_rev.id == Blog.author_id)
+        entities.append(author_rev.revision)
+    if fields is None or "category" in fields:
+        category_rev = aliased(Category)
+        query = query.outerjoin(category_rev, category_rev.id == Blog.category_id)
+        entities.append(category_rev.revision)
+    return query.with_entities(*entities)
+
+
+def _load_blogs(db: Session, fields: Optional[Tuple[str, ...]]):
+    if fields is None:
+        return db.query(Blog).options(joinedload(Blog.author), joinedload(Blog.category_obj))
+    return db.query(Blog).options(*load_options(Blog, fields, _RELATIONS))
+
+
+def _tags(blog_id: int, author_id: Optional[int], category_id: Optional[int]) -> List[str]:
+    """Response-cache tags for a payload built from this blog."""
+    tags = [f"blog:{blog_id}"]
+    if author_id is not None:
+        tags.append(f"author:{author_id}")
+    if category_id is not None:
+        tags.append(f"category:{category_id}")
+    return tags
+
+
+def _respond(request: Request, key: Tuple, build, tags: List[str]):
+    body, encoding = cached_body(request, key, build)
+    cache.store(request, body, encoding, tags)
+    return json_response(body, encoding)
+
+
+def _dump_blogs(blogs: List[Any], fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """`blogs` are ORM objects, or `reads.blogs_by_id` dicts when `fields` is None."""
+    if fields is not None:
+        return dump_json(BlogRead, blogs, fields)
+    return b"[" + b",".join(BlogRead.model_validate(b).model_dump_json().encode() for b in blogs) + b"]"
+
+
 @router.get("", response_model=List[BlogRead])
 def list_blogs(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = Query(10, le=100),
@@ -60,6 +161,7 @@ def list_blogs(
     category: Optional[str] = None,
     author: Optional[str] = None,
     published: Optional[bool] = True,
+    fields: Optional[str] = Query(None, description=_FIELDS_DOC),
 ):
     """
     List blogs with optional filters:
@@ -68,55 +170,194 @@ def list_blogs(
     - author: author slug
     - published: boolean
     Pagination: skip, limit
+    Sparse fieldset: fields (only those columns are loaded; author/category
+    are only joined when asked for)
+
+    The page's revisions are read first; the full rows are only loaded and
+    serialized when that exact page has not been served (and compressed) before.
     """
-    query = db.query(Blog).options(joinedload(Blog.author), joinedload(Blog.category_obj))
+    hit = cache.lookup(request)
+    if hit is not None:
+        return json_response(hit.body, hit.encoding)
+
+    fieldset = parse_fields(fields, BlogRead)
+    query = _filtered_blogs(db, q, category, author, published)
+    revisions = tuple(
+        _with_revisions(query, fieldset).order_by(Blog.created_at.desc()).offset(skip).limit(limit).all()
+    )
 
-    if published is not None:
-        query = query.filter(Blog.is_published == published)
+    def build() -> bytes:
+        ids = [r[0] for r in revisions]
+        if not ids:
+            return b"[]"
+        if fieldset is None:
+            return _dump_blogs(reads.blogs_by_id(db, ids))
+        rows = _load_blogs(db, fieldset).filter(Blog.id.in_(ids)).all()
+        by_id = {b.id: b for b in rows}
+        return _dump_blogs([by_id[i] for i in ids if i in by_id], fieldset)
+
+    tags = {"blogs:list"}
+    for blog_id, _, _, author_id, category_id, *_ in revisions:
+        tags.update(_tags(blog_id, author_id, category_id)[1:])  # blog writes drop blogs:list anyway
+    return _respond(request, ("blogs", fieldset, revisions), build, sorted(tags))
+
+
+@router.get("/popular", response_model=List[PopularBlog])
+def popular_blogs(
+    window: str = Query("7d", pattern=r"^\d{1,3}d$", description="Look-back in days, e.g. 7d"),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Most viewed published blogs over the window (ranking cached briefly)."""
+    days = int(window[:-1])
+    if not 1 <= days <= 365:
+        raise HTTPException(status_code=400, detail="window must be between 1d and 365d")
+    return views.popular(days, limit)
 
-    if category:
-        query = query.join(Category).filter(func.lower(Category.slug) == category.lower())
 
-    if author:
-        query = query.join(Author).filter(func.lower(Author.slug) == author.lower())
+def _parse_token(token: Optional[str]) -> Optional[int]:
+    if token is None or token == "":
+        return None
+    if not token.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid change token")
+    return int(token)
 
-    if q:
-        q_like = f"%{q.lower()}%"
-        query = query.filter(
-            func.lower(Blog.title).like(q_like) | func.lower(func.coalesce(Blog.deck, "")).like(q_like)
-        )
 
-    items = query.order_by(Blog.created_at.desc()).offset(skip).limit(limit).all()
-    return [BlogRead.model_validate(b) for b in items]
+@router.get("/changes", response_model=BlogChangesPage)
+def get_blog_changes(
+    since: Optional[str] = Query(None, description="Token from a previous call; omit to get the current token"),
+    limit: int = Query(200, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """
+    Blogs created or updated since `since` (with their current payload) and
+    tombstones (`op: "delete"`) for deleted ones. Call again with `next`;
+    `has_more` means the next page is already waiting.
+    """
+    return changes.read(db, _parse_token(since), limit)
 
 
-@router.get("/{slug}", response_model=BlogRead)
-def get_blog(slug: str, db: Session = Depends(get_db)):
-    blog = (
+@router.get("/changes/stream")
+async def stream_blog_changes(
+    request: Request,
+    since: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+):
+    """The changes feed as Server-Sent Events; reconnects resume from Last-Event-ID."""
+    token = _parse_token(last_event_id or since)
+    return StreamingResponse(
+        changes.stream(request, token),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/batch", response_model=BatchRead[BlogRead, str])
+def get_blogs_batch(
+    slugs: str = Query(..., description="Comma-separated slugs, e.g. a,b,c"),
+    db: Session = Depends(get_db),
+):
+    """Several blogs by slug in one query, in the requested order."""
+    keys = parse_keys(slugs)
+    rows = (
         db.query(Blog)
         .options(joinedload(Blog.author), joinedload(Blog.category_obj))
+        .filter(Blog.slug.in_(keys))
+        .all()
+    )
+    items, missing = in_request_order(keys, rows, lambda b: b.slug)
+    return {"items": [BlogRead.model_validate(b) for b in items], "missing": missing}
+
+
+@router.get("/{slug}", response_model=BlogRead)
+def get_blog(
+    slug: str,
+    request: Request,
+    fields: Optional[str] = Query(None, description=_FIELDS_DOC),
+    db: Session = Depends(get_db),
+):
+    hit = cache.lookup(request)
+    if hit is not None:
+        if settings.VIEW_COUNTING:
+            views.record(cache.tag_id(hit.tags, "blog"))
+        return json_response(hit.body, hit.encoding)
+
+    fieldset = parse_fields(fields, BlogRead)
+    if fieldset is None:
+        # Materialized JSON (app/services/documents.py): one key lookup, no ORM work.
+        doc = db.execute(
+            select(
+                BlogDocument.blog_id, BlogDocument.author_id, BlogDocument.category_id, BlogDocument.body,
+            ).where(BlogDocument.slug == slug)
+        ).first()
+        if doc is not None:
+            if settings.VIEW_COUNTING:
+                views.record(doc.blog_id)
+            tags = _tags(doc.blog_id, doc.author_id, doc.category_id)
+            # Keyed on the content: built_at has whole-second resolution on MySQL.
+            key = ("doc", slug, hashlib.blake2b(doc.body, digest_size=16).digest())
+            return _respond(request, key, lambda: doc.body, tags)
+
+    revision = _with_revisions(db.query(Blog).filter(Blog.slug == slug), fieldset).first()
+    if not revision:
+        raise HTTPException(status_code=404, detail="Blog not found")
+    if settings.VIEW_COUNTING:
+        views.record(revision[0])
+
+    def build() -> bytes:
+        blog = _load_blogs(db, fieldset).filter(Blog.id == revision[0]).first()
+        if fieldset is not None:
+            return dump_json(BlogRead, blog, fieldset)
+        return BlogRead.model_validate(blog).model_dump_json().encode()
+
+    blog_id, _, _, author_id, category_id = revision[:5]
+    return _respond(request, ("blog", fieldset, tuple(revision)), build, _tags(blog_id, author_id, category_id))
+
+
+@router.get("/{slug}/related", response_model=List[RelatedBlog])
+def get_related_blogs(slug: str, limit: int = Query(6, ge=1, le=50), db: Session = Depends(get_db)):
+    """Precomputed related posts, best match first (see app/services/related.py)."""
+    row = (
+        db.query(BlogRelated.related)
+        .join(Blog, Blog.id == BlogRelated.blog_id)
         .filter(Blog.slug == slug)
         .first()
     )
-    if not blog:
-        raise HTTPException(status_code=404, detail="Blog not found")
-    return BlogRead.model_validate(blog)
+    if row is None:
+        if not db.query(Blog.id).filter(Blog.slug == slug).first():
+            raise HTTPException(status_code=404, detail="Blog not found")
+        return []
+    return row[0][:limit]
+
+
+def _refresh_related(background_tasks: BackgroundTasks, removed: Optional[List[int]] = None) -> None:
+    if settings.RELATED_ENABLED:
+        background_tasks.add_task(related.refresh, removed or ())
+
+
+def _free_slug(db: Session, base: str) -> str:
+    """`base`, or `base-2`, `base-3`, ... whichever is free first (one query)."""
+    pattern = base.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "-%"
+    taken = set(
+        db.execute(
+            select(Blog.slug).where((Blog.slug == base) | Blog.slug.like(pattern, escape="\\"))
+        ).scalars()
+    )
+    slug, i = base, 1
+    while slug in taken:
+        i += 1
+        slug = f"{base}-{i}"
+    return slug
 
 
 @router.post("", response_model=BlogRead, status_code=status.HTTP_201_CREATED)
-def create_blog(body: BlogCreate, db: Session = Depends(get_db)):
+def create_blog(body: BlogCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     Create blog:
     - slug generated from title (unique enforced)
     - supports sections (JSON), banner_img/banner_title OR cover/cover_alt
     - validates author_id and category_id
     """
-    base = body.slug or slugify(body.title)
-    slug = base
-    i = 1
-    while db.query(Blog).filter(Blog.slug == slug).first():
-        i += 1
-        slug = f"{base}-{i}"
+    slug = _free_slug(db, body.slug or slugify(body.title))
 
     # Validate author/category
     author = None
@@ -161,13 +402,21 @@ def create_blog(body: BlogCreate, db: Session = Depends(get_db)):
         blog.author_slug = author.slug
 
     db.add(blog)
-    db.commit()
-    db.refresh(blog)
+    with constraint_errors(db, **_CONFLICTS):
+        db.flush()
+        changes.record(db, [blog], "upsert")
+        documents.write(db, [blog])
+        rollups.apply(db, added=rollups.blog_buckets(blog))
+        db.commit()
+    audit.record("blog", blog.id, "create", audit.snapshot(blog))
+    cache.invalidate("blogs:list")
+    _refresh_related(background_tasks)
+    suggest.upsert("blog", blog.id, blog.title, blog.slug)
     return BlogRead.model_validate(blog)
 
 
 @router.put("/{slug}", response_model=BlogRead)
-def update_blog(slug: str, body: BlogUpdate, db: Session = Depends(get_db)):
+def update_blog(slug: str, body: BlogUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     Partial update for blog. Accepts same fields as create.
     If sections provided, they replace existing sections.
@@ -175,14 +424,13 @@ def update_blog(slug: str, body: BlogUpdate, db: Session = Depends(get_db)):
     blog = db.query(Blog).filter(Blog.slug == slug).first()
     if not blog:
         raise HTTPException(status_code=404, detail="User not found")
+    counted = rollups.blog_buckets(blog)
 
     if body.title is not None:
         blog.title = body.title
 
     # slug update (optional)
-    if body.slug is not None and body.slug != blog.slug:
-        if db.query(Blog).filter(Blog.slug == body.slug).first():
-            raise HTTPException(status_code=400, detail="Slug already in use")
+    if body.slug is not None:
         blog.slug = body.slug
 
     if body.deck is not None:
@@ -223,17 +471,35 @@ def update_blog(slug: str, body: BlogUpdate, db: Session = Depends(get_db)):
         if getattr(body, field, None) is not None:
             setattr(blog, field, getattr(body, field))
 
+    diff = audit.diff(blog)
     db.add(blog)
-    db.commit()
-    db.refresh(blog)
+    with constraint_errors(db, **_CONFLICTS):
+        db.flush()
+        changes.record(db, [blog], "upsert")
+        documents.write(db, [blog])
+        rollups.apply(db, counted, rollups.blog_buckets(blog))
+        db.commit()
+    audit.record("blog", blog.id, "update", diff)
+    cache.invalidate(f"blog:{blog.id}", "blogs:list")
+    _refresh_related(background_tasks)
+    suggest.upsert("blog", blog.id, blog.title, blog.slug)
     return BlogRead.model_validate(blog)
 
 
 @router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_blog(slug: str, db: Session = Depends(get_db)):
+def delete_blog(slug: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     blog = db.query(Blog).filter(Blog.slug == slug).first()
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
+    blog_id = blog.id
+    final = audit.snapshot(blog)
+    changes.record(db, [blog], "delete")
+    documents.drop(db, BlogDocument.blog_id == blog_id)
+    rollups.apply(db, removed=rollups.blog_buckets(blog))
     db.delete(blog)
     db.commit()
+    audit.record("blog", blog_id, "delete", final)
+    cache.invalidate(f"blog:{blog_id}", "blogs:list")
+    _refresh_related(background_tasks, removed=[blog_id])
+    suggest.remove("blog", [blog_id])
     return None
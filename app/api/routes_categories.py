@@ -1,29 +1,69 @@
 # app/api/routes_categories.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.core import cache
+from app.core.compression import json_response
+from app.db import reads
+from app.db.errors import constraint_errors
 from app.models.category import Category
-from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
+from app.models.blog import Blog
+from app.models.blog_documents import BlogDocument
+from app.schemas.batch import BatchRead
+from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate, CategoryWithCounts
+from app.schemas.job import JobRead
+from app.services import audit, cascade, changes, documents, suggest
+from app.utils.batch import in_request_order, parse_keys
 
 router = APIRouter(prefix="/api/categories", tags=["Categories"])
 
-@router.get("", response_model=List[CategoryRead])
-def list_categories(db: Session = Depends(get_db)):
-    cats = db.query(Category).order_by(Category.name).all()
-    return [CategoryRead.model_validate(c) for c in cats]
+# Unique column -> 400 detail
+_CONFLICTS = {"slug": "Category slug already exists", "name": "Category name already exists"}
+
+_WITH_COUNTS = TypeAdapter(List[CategoryWithCounts])
+
+
+@router.get("", response_model=Union[List[CategoryWithCounts], List[CategoryRead]])
+def list_categories(
+    request: Request,
+    with_counts: bool = Query(False, description="Add published `posts` and `latest_post_at`"),
+    sort: Literal["name", "count"] = Query("name", description="`count` (most posts first) needs with_counts"),
+    db: Session = Depends(get_db),
+):
+    if not with_counts:
+        if sort != "name":
+            raise HTTPException(status_code=400, detail="sort=count requires with_counts=true")
+        return [CategoryRead.model_validate(c) for c in reads.rows(db, reads.CATEGORIES)]
+
+    # One grouped query; the result is cached until a category or blog write.
+    hit = cache.lookup(request)
+    if hit is not None:
+        return json_response(hit.body, hit.encoding)
+    rows = _WITH_COUNTS.validate_python(reads.rows(db, reads.CATEGORIES_WITH_COUNTS[sort]))
+    return cache.send(request, _WITH_COUNTS.dump_json(rows), ["categories:list", "blogs:list"])
 
 @router.post("", response_model=CategoryRead, status_code=status.HTTP_201_CREATED)
 def create_category(body: CategoryCreate, db: Session = Depends(get_db)):
-    if db.query(Category).filter(Category.slug == body.slug).first():
-        raise HTTPException(status_code=400, detail="Category slug already exists")
     cat = Category(name=body.name, slug=body.slug, description=body.description)
     db.add(cat)
-    db.commit()
-    db.refresh(cat)
+    with constraint_errors(db, **_CONFLICTS):
+        db.commit()
+    audit.record("category", cat.id, "create", audit.snapshot(cat))
+    cache.invalidate("categories:list")
+    suggest.upsert("category", cat.id, cat.name, cat.slug)
     return CategoryRead.model_validate(cat)
 
+@router.get("/batch", response_model=BatchRead[CategoryRead, int])
+def get_categories_batch(ids: str = Query(..., description="Comma-separated ids, e.g. 1,2,3"), db: Session = Depends(get_db)):
+    keys = parse_keys(ids, int)
+    rows = db.query(Category).filter(Category.id.in_(keys)).all()
+    items, missing = in_request_order(keys, rows, lambda r: r.id)
+    return {"items": [CategoryRead.model_validate(r) for r in items], "missing": missing}
+
 @router.get("/{category_id}", response_model=CategoryRead)
 def get_category(category_id: int, db: Session = Depends(get_db)):
     cat = db.query(Category).get(category_id)
@@ -32,7 +72,9 @@ def get_category(category_id: int, db: Session = Depends(get_db)):
     return CategoryRead.model_validate(cat)
 
 @router.put("/{category_id}", response_model=CategoryRead)
-def update_category(category_id: int, body: CategoryUpdate, db: Session = Depends(get_db)):
+def update_category(
+    category_id: int, body: CategoryUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     cat = db.query(Category).get(category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -42,16 +84,37 @@ def update_category(category_id: int, body: CategoryUpdate, db: Session = Depend
         cat.slug = body.slug
     if body.description is not None:
         cat.description = body.description
+    diff = audit.diff(cat)
     db.add(cat)
-    db.commit()
-    db.refresh(cat)
+    changes.record_where(db, Blog.category_id == cat.id)
+    documents.drop(db, BlogDocument.category_id == cat.id)
+    with constraint_errors(db, **_CONFLICTS):
+        db.commit()
+    audit.record("category", cat.id, "update", diff)
+    background_tasks.add_task(documents.rebuild_missing_in_background)
+    cache.invalidate(f"category:{cat.id}", "categories:list", "blogs:list")
+    suggest.upsert("category", cat.id, cat.name, cat.slug)
     return CategoryRead.model_validate(cat)
 
-@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(category_id: int, db: Session = Depends(get_db)):
-    cat = db.query(Category).get(category_id)
-    if not cat:
+@router.delete(
+    "/{category_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={202: {"model": JobRead, "description": "Deletion queued (background=true)"}},
+)
+def delete_category(
+    category_id: int,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Delete after responding; poll GET /api/jobs/{id}"),
+    db: Session = Depends(get_db),
+):
+    """Deletes the category and all of its blogs in batches (see app/services/cascade.py)."""
+    if not db.query(Category.id).filter(Category.id == category_id).first():
         raise HTTPException(status_code=404, detail="Category not found")
-    db.delete(cat)
-    db.commit()
+    if background:
+        job = cascade.start_job(db, "category", category_id)
+        background_tasks.add_task(cascade.run_job, job.id, "category", category_id)
+        return JSONResponse(JobRead.model_validate(job).model_dump(mode="json"), status_code=status.HTTP_202_ACCEPTED)
+    removed = cascade.delete_owner("category", category_id)
+    cache.invalidate(f"category:{category_id}", "categories:list", "blogs:list")
+    background_tasks.add_task(cascade.reindex, "category", category_id, removed)
     return None
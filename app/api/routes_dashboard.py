@@ -0,0 +1,41 @@
+# app/api/routes_dashboard.py
+from typing import Dict, List
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.schemas.dashboard import DashboardStats
+from app.services import rollups
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+
+def _buckets(counts: Dict[str, int], by_count: bool = True) -> List[dict]:
+    """Largest first; months (`by_count=False`) stay in calendar order."""
+    items = sorted(counts.items(), key=lambda kv: -kv[1]) if by_count else counts.items()
+    return [{"key": key, "count": count} for key, count in items]
+
+
+@router.get("/stats", response_model=DashboardStats)
+def dashboard_stats(db: Session = Depends(get_db)):
+    """All dashboard figures from the `dashboard_stats` rollups in one query."""
+    stats = rollups.stats(db)
+    blog_status = stats.get("blogs_by_status", {})
+    user_status = stats.get("users_by_status", {})
+    return {
+        "blogs": {
+            "total": sum(blog_status.values()),
+            "published": blog_status.get("published", 0),
+            "draft": blog_status.get("draft", 0),
+            "by_month": _buckets(stats.get("blogs_by_month", {}), by_count=False),
+            "by_category": _buckets(stats.get("blogs_by_category", {})),
+            "by_author": _buckets(stats.get("blogs_by_author", {})),
+        },
+        "users": {
+            "total": sum(user_status.values()),
+            "active": user_status.get("active", 0),
+            "inactive": user_status.get("inactive", 0),
+            "by_role": _buckets(stats.get("users_by_role", {})),
+            "by_department": _buckets(stats.get("users_by_department", {})),
+        },
+    }
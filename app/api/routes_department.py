@@ -1,36 +1,59 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.core import cache
+from app.core.compression import json_response
+from app.db import reads
+from app.db.errors import constraint_errors
 from app.models.department import Department
 from app.schemas.department import (
     DepartmentRead,
     DepartmentCreate,
     DepartmentUpdate,
+    DepartmentWithCounts,
 )
+from app.services import audit
 
 router = APIRouter(prefix="/api/departments", tags=["Departments"])
 
 
-@router.get("", response_model=List[DepartmentRead])
-def list_departments(db: Session = Depends(get_db)):
-    depts = db.query(Department).all()
-    return [DepartmentRead.model_validate(d) for d in depts]
+_WITH_COUNTS = TypeAdapter(List[DepartmentWithCounts])
+
+
+@router.get("", response_model=Union[List[DepartmentWithCounts], List[DepartmentRead]])
+def list_departments(
+    request: Request,
+    with_counts: bool = Query(False, description="Add `members` (users in the department)"),
+    sort: Literal["id", "name", "count"] = Query("id", description="`name` or `count` (most members first) need with_counts"),
+    db: Session = Depends(get_db),
+):
+    if not with_counts:
+        if sort != "id":
+            raise HTTPException(status_code=400, detail=f"sort={sort} requires with_counts=true")
+        return [DepartmentRead.model_validate(d) for d in reads.rows(db, reads.DEPARTMENTS)]
+
+    # One grouped query; the result is cached until a department or user write.
+    hit = cache.lookup(request)
+    if hit is not None:
+        return json_response(hit.body, hit.encoding)
+    rows = _WITH_COUNTS.validate_python(reads.rows(db, reads.DEPARTMENTS_WITH_COUNTS[sort]))
+    return cache.send(request, _WITH_COUNTS.dump_json(rows), ["departments:list"])
 
 
 @router.post("", response_model=DepartmentRead, status_code=status.HTTP_201_CREATED)
 def create_department(body: DepartmentCreate, db: Session = Depends(get_db)):
-    if db.query(Department).filter(Department.name == body.name).first():
-        raise HTTPException(status_code=400, detail="Department already exists")
-
     dept = Department(
         name=body.name,
         description=body.description,
     )
     db.add(dept)
-    db.commit()
-    db.refresh(dept)
+    with constraint_errors(db, name="Department already exists"):
+        db.commit()
+    audit.record("department", dept.id, "create", audit.snapshot(dept))
+    cache.invalidate("departments:list")
     return DepartmentRead.model_validate(dept)
 
 
@@ -40,7 +63,7 @@ def update_department(
     body: DepartmentUpdate,
     db: Session = Depends(get_db),
 ):
-    dept = db.query(Department).get(dept_id)
+    dept = db.get(Department, dept_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
 
@@ -51,7 +74,9 @@ def update_department(
     if body.is_active is not None:
         dept.is_active = body.is_active
 
-    db.add(dept)
-    db.commit()
-    db.refresh(dept)
+    diff = audit.diff(dept)
+    with constraint_errors(db, name="Department already exists"):
+        db.commit()
+    audit.record("department", dept.id, "update", diff)
+    cache.invalidate("departments:list")
     return DepartmentRead.model_validate(dept)
@@ -0,0 +1,23 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.core import slow_queries
+
+router = APIRouter(prefix="/api/internal", tags=["Internal"])
+
+
+@router.get("/slow-queries", response_model=List[dict])
+def list_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent slow statements first, with EXPLAIN output when sampled."""
+    if slow_queries.recorder is None:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled")
+    return slow_queries.recorder.entries(limit)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries():
+    if slow_queries.recorder is None:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled")
+    slow_queries.recorder.clear()
+    return None
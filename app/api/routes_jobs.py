@@ -0,0 +1,17 @@
+# app/api/routes_jobs.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.models.job import Job
+from app.schemas.job import JobRead
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    job = db.query(Job).get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobRead.model_validate(job)
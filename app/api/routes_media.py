@@ -0,0 +1,75 @@
+# app/api/routes_media.py
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.core.config import settings
+from app.schemas.media import MediaRead, MediaVariant
+from app.services import media
+
+router = APIRouter(prefix="/api/media", tags=["Media"])
+
+
+def _base_url(request: Request) -> str:
+    return settings.MEDIA_BASE_URL or str(request.base_url).rstrip("/") + settings.MEDIA_URL_PATH
+
+
+def _to_read(request: Request, meta: dict) -> MediaRead:
+    base = _base_url(request)
+    digest = meta["hash"]
+    return MediaRead(
+        hash=digest,
+        url=media.public_url(base, digest, meta["file"]),
+        content_type=meta["content_type"],
+        size=meta["size"],
+        width=meta.get("width"),
+        height=meta.get("height"),
+        variants=[
+            MediaVariant(
+                width=v["width"],
+                height=v["height"],
+                format=v["format"],
+                url=media.public_url(base, digest, v["file"]),
+            )
+            for v in meta.get("variants", [])
+        ],
+        duplicate=meta.get("duplicate", False),
+    )
+
+
+# The body is parsed by hand (see media.multipart_file), so describe it for /docs.
+_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("", response_model=MediaRead, status_code=status.HTTP_201_CREATED, openapi_extra=_UPLOAD_BODY)
+async def upload_media(request: Request):
+    """
+    Upload an image as the `file` field of a multipart form. Identical bytes
+    are stored once; the response lists the original plus resized WebP
+    variants, all as absolute URLs.
+    """
+    try:
+        media.check_length(request.headers.get("content-length"))
+        meta = await media.store_upload(media.multipart_file(request, "file"))
+    except media.MediaError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    return _to_read(request, meta)
+
+
+@router.get("/{digest}", response_model=MediaRead)
+def get_media(digest: str, request: Request):
+    meta = media.load(digest)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Media not found")
+    return _to_read(request, meta)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_latest
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
@@ -3,30 +3,30 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.db import reads
+from app.db.errors import constraint_errors
 from app.models.role import Role
 from app.schemas.role import RoleRead, RoleCreate, RoleUpdate
+from app.services import audit
 
 router = APIRouter(prefix="/api/roles", tags=["Roles"])
 
 @router.get("", response_model=List[RoleRead])
 def list_roles(db: Session = Depends(get_db)):
-    roles = db.query(Role).all()
-    return [RoleRead.model_validate(r) for r in roles]
+    return [RoleRead.model_validate(r) for r in reads.rows(db, reads.ROLES)]
 
 @router.post("", response_model=RoleRead, status_code=status.HTTP_201_CREATED)
 def create_role(body: RoleCreate, db: Session = Depends(get_db)):
-    if db.query(Role).filter(Role.name == body.name).first():
-        raise HTTPException(status_code=400, detail="Role already exists")
-
     role = Role(name=body.name, description=body.description)
     db.add(role)
-    db.commit()
-    db.refresh(role)
+    with constraint_errors(db, name="Role already exists"):
+        db.commit()
+    audit.record("role", role.id, "create", audit.snapshot(role))
     return RoleRead.model_validate(role)
 
 @router.put("/{role_id}", response_model=RoleRead)
 def update_role(role_id: int, body: RoleUpdate, db: Session = Depends(get_db)):
-    role = db.query(Role).get(role_id)
+    role = db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
 
@@ -35,7 +35,8 @@ def update_role(role_id: int, body: RoleUpdate, db: Session = Depends(get_db)):
     if body.description is not None:
         role.description = body.description
 
-    db.add(role)
-    db.commit()
-    db.refresh(role)
+    diff = audit.diff(role)
+    with constraint_errors(db, name="Role already exists"):
+        db.commit()
+    audit.record("role", role.id, "update", diff)
     return RoleRead.model_validate(role)
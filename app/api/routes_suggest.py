@@ -0,0 +1,21 @@
+# app/api/routes_suggest.py
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Query
+
+from app.schemas.suggest import Suggestion
+from app.services import suggest
+
+router = APIRouter(prefix="/api/suggest", tags=["Suggest"])
+
+
+@router.get("", response_model=List[Suggestion])
+def get_suggestions(
+    q: str = Query(..., min_length=1, max_length=100),
+    type: Optional[Literal["blog", "author", "category"]] = None,
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Typeahead for the admin pickers and search box. Matches the start of a
+    title/name, the start of any later word in it, or the slug.
+    """
+    return suggest.suggest(q, [type] if type else None, limit)
@@ -1,31 +1,47 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
 
 from app.api.deps import get_db
+from app.core import cache
+from app.db.errors import constraint_errors
 from app.models.user import User
 from app.models.role import Role
 from app.models.department import Department
+from app.schemas.batch import BatchIds, BatchRead
 from app.schemas.user import UserRead, UserCreate, UserUpdate
+from app.services import audit, rollups
+from app.utils.batch import in_request_order, unique_keys
+from app.utils.emp_id_generator import generate_employee_id
+from app.utils.fieldsets import dump_json, load_options, parse_fields
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
-
-# ==========================
-# Generate Employee ID
-# ==========================
-def generate_employee_id(db: Session) -> str:
-    last_user = db.query(User).order_by(User.id.desc()).first()
-    next_number = (last_user.id if last_user else 0) + 1
-    return f"AW{str(next_number).zfill(3)}"
+# UserRead fields backed by a relationship: (relationship, foreign key)
+_RELATIONS = {
+    "role": (User.role, User.role_id),
+    "department": (User.department, User.department_id),
+}
+_FIELDS_DOC = "Comma-separated UserRead fields to return, e.g. id,username,full_name"
+# Unique/foreign key column -> 400 detail
+_CONFLICTS = {
+    "username": "Username already in use",
+    "email": "Email already in use",
+    "role_id": "Invalid role_id",
+    "department_id": "Invalid department_id",
+}
 
 
 # ==========================
 # LIST USERS
 # ==========================
 @router.get("", response_model=List[UserRead])
-def list_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
+def list_users(fields: Optional[str] = Query(None, description=_FIELDS_DOC), db: Session = Depends(get_db)):
+    fieldset = parse_fields(fields, UserRead)
+    if fieldset is not None:
+        users = db.query(User).options(*load_options(User, fieldset, _RELATIONS)).all()
+        return Response(dump_json(UserRead, users, fieldset), media_type="application/json")
+    users = db.query(User).options(joinedload(User.role), joinedload(User.department)).all()
     return [UserRead.model_validate(u) for u in users]
 
 
@@ -34,25 +50,18 @@ def list_users(db: Session = Depends(get_db)):
 # ==========================
 @router.post("", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 def create_user(body: UserCreate, db: Session = Depends(get_db)):
-
-    if db.query(User).filter(User.username == body.username).first():
-        raise HTTPException(status_code=400, detail="Username already in use")
-
-    if db.query(User).filter(User.email == body.email).first():
-        raise HTTPException(status_code=400, detail="Email already in use")
-
-    role = db.query(Role).get(body.role_id)
+    # Username/email uniqueness is left to the unique constraints.
+    role = db.get(Role, body.role_id)
     if not role:
         raise HTTPException(status_code=400, detail="Invalid role_id")
 
     department = None
     if body.department_id:
-        department = db.query(Department).get(body.department_id)
+        department = db.get(Department, body.department_id)
         if not department:
             raise HTTPException(status_code=400, detail="Invalid department_id")
 
     user = User(
-        emp_id=generate_employee_id(db),
         username=body.username,
         full_name=body.full_name,
         email=body.email,
@@ -63,16 +72,53 @@ def create_user(body: UserCreate, db: Session = Depends(get_db)):
     user.set_password(body.password)
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    with constraint_errors(db, **_CONFLICTS):
+        db.flush()
+        user.emp_id = generate_employee_id(user.id)
+        rollups.apply(db, added=rollups.user_buckets(user))
+        db.commit()
+    audit.record("user", user.id, "create", audit.snapshot(user))
+    if user.department_id is not None:
+        cache.invalidate("departments:list")  # member counts
     return UserRead.model_validate(user)
 
 
+# ==========================
+# BATCH GET USERS
+# ==========================
+@router.post("/batch", response_model=BatchRead[UserRead, int])
+def get_users_batch(body: BatchIds, db: Session = Depends(get_db)):
+    keys = unique_keys(body.ids)
+    users = (
+        db.query(User)
+        .options(joinedload(User.role), joinedload(User.department))
+        .filter(User.id.in_(keys))
+        .all()
+    )
+    items, missing = in_request_order(keys, users, lambda u: u.id)
+    return {"items": [UserRead.model_validate(u) for u in items], "missing": missing}
+
+
 # ==========================
 # GET SINGLE USER
 # ==========================
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(
+    user_id: int,
+    fields: Optional[str] = Query(None, description=_FIELDS_DOC),
+    db: Session = Depends(get_db),
+):
+    fieldset = parse_fields(fields, UserRead)
+    if fieldset is not None:
+        user = (
+            db.query(User)
+            .options(*load_options(User, fieldset, _RELATIONS))
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return Response(dump_json(UserRead, user, fieldset), media_type="application/json")
     user = db.query(User).get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -84,25 +130,22 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
 # ==========================
 @router.put("/{user_id}", response_model=UserRead)
 def update_user(user_id: int, body: UserUpdate, db: Session = Depends(get_db)):
-    user = db.query(User).get(user_id)
+    user = db.get(User, user_id, options=[joinedload(User.role), joinedload(User.department)])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    counted = rollups.user_buckets(user)
 
-    if body.username and body.username != user.username:
-        if db.query(User).filter(User.username == body.username).first():
-            raise HTTPException(status_code=400, detail="Username already in use")
+    if body.username:
         user.username = body.username
 
     if body.full_name is not None:
         user.full_name = body.full_name
 
-    if body.email and body.email != user.email:
-        if db.query(User).filter(User.email == body.email).first():
-            raise HTTPException(status_code=400, detail="Email already in use")
+    if body.email:
         user.email = body.email
 
     if body.department_id is not None:
-        dept = db.query(Department).get(body.department_id)
+        dept = db.get(Department, body.department_id)
         if not dept:
             raise HTTPException(status_code=400, detail="Invalid department_id")
         user.department = dept
@@ -111,7 +154,7 @@ def update_user(user_id: int, body: UserUpdate, db: Session = Depends(get_db)):
         user.is_active = body.is_active
 
     if body.role_id is not None:
-        role = db.query(Role).get(body.role_id)
+        role = db.get(Role, body.role_id)
         if not role:
             raise HTTPException(status_code=400, detail="Invalid role_id")
         user.role = role
@@ -119,6 +162,12 @@ def update_user(user_id: int, body: UserUpdate, db: Session = Depends(get_db)):
     if body.password:
         user.set_password(body.password)
 
-    db.commit()
-    db.refresh(user)
+    diff = audit.diff(user)
+    with constraint_errors(db, **_CONFLICTS):
+        db.flush()
+        rollups.apply(db, counted, rollups.user_buckets(user))
+        db.commit()
+    audit.record("user", user.id, "update", diff)
+    if "department_id" in diff:
+        cache.invalidate("departments:list")  # member counts
     return UserRead.model_validate(user)
@@ -0,0 +1,184 @@
+# app/core/admission.py
+"""
+Admission control in front of the sync threadpool.
+
+Each request is matched to a route group (first matching rule wins). A group
+caps its own concurrency and keeps a bounded wait queue; on top of that a
+global limiter sized to the threadpool hands free slots to the waiter with
+the best priority (lowest number) first, so public blog reads keep flowing
+while admin writes or expensive logins queue. A request that finds its queue
+full, or that waits past its group's deadline, gets `503` with `Retry-After`
+instead of piling up behind the threadpool until the client times out.
+
+Groups come from `ADMISSION_GROUPS` (a JSON list of objects with the fields
+of `AdmissionGroup`) or fall back to `DEFAULT_GROUPS`.
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.core.metrics import ADMISSION_REJECTIONS
+from app.db.session import threadpool_size
+
+
+@dataclass
+class AdmissionGroup:
+    name: str
+    limit: int
+    queue: int
+    timeout: float
+    priority: int = 1
+    methods: Tuple[str, ...] = ()
+    prefixes: Tuple[str, ...] = ()
+    retry_after: Optional[int] = None
+    limiter: "PriorityLimiter" = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.methods = tuple(m.upper() for m in self.methods)
+        self.prefixes = tuple(self.prefixes)
+        self.limiter = PriorityLimiter(self.limit, self.queue)
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return not self.prefixes or path.startswith(self.prefixes)
+
+
+DEFAULT_GROUPS = [
+    dict(name="public_reads", methods=["GET"], prefixes=["/api/blogs", "/api/categories", "/api/authors"],
+         limit=32, queue=256, timeout=2.0, priority=0),
+    dict(name="auth", methods=["POST"], prefixes=["/api/auth"],
+         limit=4, queue=32, timeout=5.0, priority=1),
+    dict(name="admin_reads", methods=["GET"], prefixes=["/api/"],
+         limit=16, queue=128, timeout=3.0, priority=1),
+    dict(name="writes", methods=["POST", "PUT", "PATCH", "DELETE"], prefixes=["/api/"],
+         limit=8, queue=64, timeout=5.0, priority=2),
+]
+
+
+class PriorityLimiter:
+    """
+    asyncio counterpart of a semaphore with a bounded, priority-ordered wait
+    queue. Only used from the event loop, so it needs no locking.
+    """
+
+    def __init__(self, capacity: int, max_waiting: int) -> None:
+        self.capacity = capacity
+        self.max_waiting = max_waiting
+        self.in_use = 0
+        self.waiting = 0
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int, timeout: float) -> Optional[str]:
+        """Returns None once a slot is held, otherwise why it was refused."""
+        if self.in_use < self.capacity and not self.waiting:
+            self.in_use += 1
+            return None
+        if self.waiting >= self.max_waiting:
+            return "queue_full"
+        if timeout <= 0:
+            return "deadline"
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), future))
+        self.waiting += 1
+        try:
+            done, _ = await asyncio.wait({future}, timeout=timeout)
+        except BaseException:
+            # Client went away while queued: hand the slot on if we got one.
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+                self.waiting -= 1
+            raise
+        if done:
+            return None
+        future.cancel()
+        self.waiting -= 1
+        return "deadline"
+
+    def release(self) -> None:
+        while self._heap:
+            _, _, future = heapq.heappop(self._heap)
+            if not future.done():
+                # Hand the slot straight to the next waiter; in_use is unchanged.
+                self.waiting -= 1
+                future.set_result(None)
+                return
+        self.in_use -= 1
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, groups: List[AdmissionGroup], global_limit: int, exempt: Tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.groups = groups
+        self.exempt = exempt
+        self.global_limiter = PriorityLimiter(global_limit, sum(g.queue for g in groups))
+
+    def _match(self, method: str, path: str) -> Optional[AdmissionGroup]:
+        if path.startswith(self.exempt):
+            return None
+        for group in self.groups:
+            if group.matches(method, path):
+                return group
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        group = self._match(scope["method"], scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = time.monotonic() + group.timeout
+        refused = await group.limiter.acquire(group.priority, group.timeout)
+        if refused:
+            await self._reject(group, refused, scope, receive, send)
+            return
+        try:
+            refused = await self.global_limiter.acquire(group.priority, deadline - time.monotonic())
+            if refused:
+                await self._reject(group, refused, scope, receive, send)
+                return
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.global_limiter.release()
+        finally:
+            group.limiter.release()
+
+    async def _reject(self, group: AdmissionGroup, reason: str, scope, receive, send) -> None:
+        ADMISSION_REJECTIONS.labels(group.name, reason).inc()
+        retry_after = group.retry_after or max(1, math.ceil(group.timeout))
+        response = JSONResponse(
+            {"detail": "Server is busy, please retry shortly"},
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
+
+
+def load_groups(spec: str) -> List[AdmissionGroup]:
+    raw = json.loads(spec) if spec else DEFAULT_GROUPS
+    return [AdmissionGroup(**g) for g in raw]
+
+
+def install(app, settings) -> None:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        groups=load_groups(settings.ADMISSION_GROUPS),
+        # Admitting more than the threadpool runs only moves the queue behind the limiter.
+        global_limit=settings.ADMISSION_GLOBAL_LIMIT or threadpool_size(),
+        exempt=tuple(settings.ADMISSION_EXEMPT_PATHS),
+    )
@@ -0,0 +1,235 @@
+# app/core/cache.py
+"""
+Shared response cache with tag-based invalidation.
+
+Read endpoints store the exact bytes they sent (per Content-Encoding) under
+the request's path and query, tagged with the entities the payload was built
+from: `blog:{id}`, `author:{id}`, `category:{id}` and `blogs:list`. A hit
+is served without touching the database. Write handlers call
+`invalidate(...)` with the tags they touched after committing, which drops
+exactly the dependent entries. `RESPONSE_CACHE_TTL` bounds how long anything
+can live regardless.
+
+Every invalidation takes the next number of a sequence, and each tag
+remembers the number of its last invalidation. `lookup()` snapshots the
+sequence before the handler reads the database, and `store()` refuses to
+cache a payload if any of its tags was invalidated after that snapshot: the
+rows it was built from may predate the write, and caching it under the new
+state would serve stale data for the whole TTL.
+
+Backends (`RESPONSE_CACHE`):
+
+- `memory`: per-process LRU with TTL. Invalidation only reaches the worker
+  that handled the write, so other workers serve their copy until the TTL,
+  which makes it fine for a single worker or a short TTL.
+- `redis`: shared by all workers (`REDIS_URL`, requires the `redis`
+  package, Redis >= 6.2). The sequence is a counter and the tags a sorted
+  set scored by their last invalidation; an entry remembers the scores it
+  was stored under, so invalidating a tag makes every entry carrying it
+  stale. Redis errors count as misses.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.compression import compress, json_response, negotiate
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class Entry(NamedTuple):
+    body: bytes
+    encoding: Optional[str]  # Content-Encoding of body
+    tags: Tuple[str, ...]
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Entry]]" = OrderedDict()
+        self._by_tag: Dict[str, set] = {}
+        self._seq = 0
+        self._invalidated: Dict[str, int] = {}  # tag -> seq of its last invalidation
+        self._lock = threading.Lock()
+
+    def token(self) -> Optional[int]:
+        with self._lock:
+            return self._seq
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, entry: Entry, ttl: float, token: int) -> None:
+        with self._lock:
+            if any(self._invalidated.get(tag, 0) > token for tag in entry.tags):
+                return
+            self._remove(key)
+            self._data[key] = (time.monotonic() + ttl, entry)
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries:
+                self._remove(next(iter(self._data)))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._seq += 1
+            for tag in tags:
+                self._invalidated[tag] = self._seq
+                for key in self._by_tag.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._by_tag.clear()
+
+    def _remove(self, key: str) -> None:
+        item = self._data.pop(key, None)
+        if item is None:
+            return
+        for tag in item[1].tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+
+class RedisBackend:
+    """Entries are stored as `<json header: encoding + tag versions>\\n<body>`."""
+
+    def __init__(self, client, prefix: str = "aw:cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+        self.seq_key = prefix + "seq"
+        self.tags_key = prefix + "tags"
+
+    def _versions(self, tags) -> list:
+        return [int(v or 0) for v in self.client.zmscore(self.tags_key, list(tags))] if tags else []
+
+    def token(self) -> Optional[int]:
+        try:
+            return int(self.client.get(self.seq_key) or 0)
+        except redis.RedisError:
+            logger.warning("Response cache read failed", exc_info=True)
+            return None
+
+    def get(self, key: str) -> Optional[Entry]:
+        try:
+            raw = self.client.get(self.prefix + key)
+            if raw is None:
+                return None
+            header, _, body = raw.partition(b"\n")
+            header = json.loads(header)
+            stored = header["tags"]
+            if stored and self._versions(stored) != list(stored.values()):
+                return None
+            return Entry(body, header["encoding"], tuple(stored))
+        except redis.RedisError:
+            logger.warning("Response cache read failed", exc_info=True)
+            return None
+
+    def set(self, key: str, entry: Entry, ttl: float, token: int) -> None:
+        try:
+            versions = self._versions(entry.tags)
+            if any(v > token for v in versions):
+                return
+            header = json.dumps({"encoding": entry.encoding, "tags": dict(zip(entry.tags, versions))})
+            self.client.set(self.prefix + key, header.encode() + b"\n" + entry.body, ex=max(1, int(ttl)))
+        except redis.RedisError:
+            logger.warning("Response cache write failed", exc_info=True)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        try:
+            seq = self.client.incr(self.seq_key)
+            # GT: a slower concurrent invalidation never moves a score back.
+            self.client.zadd(self.tags_key, {tag: seq for tag in tags}, gt=True)
+        except redis.RedisError:
+            logger.exception("Response cache invalidation failed")
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+def build_backend(settings):
+    if settings.RESPONSE_CACHE == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_ENTRIES)
+    if settings.RESPONSE_CACHE == "redis":
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE=redis needs the 'redis' package")
+        return RedisBackend(redis.Redis.from_url(settings.REDIS_URL))
+    return None
+
+
+backend = build_backend(settings)
+
+
+def request_key(request: Request) -> str:
+    """Path, sorted query and the encoding this client negotiates."""
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    return f"{request.url.path}?{query}|{encoding or 'identity'}"
+
+
+def lookup(request: Request) -> Optional[Entry]:
+    """Call before reading the database: it also snapshots the invalidation sequence for `store()`."""
+    if backend is None:
+        return None
+    request.state.cache_token = backend.token()
+    return backend.get(request_key(request))
+
+
+def store(request: Request, body: bytes, encoding: Optional[str], tags: Iterable[str]) -> None:
+    if backend is None:
+        return
+    token = getattr(request.state, "cache_token", None)
+    if token is None:  # no lookup() before the read, or Redis was down: nothing to check against
+        return
+    backend.set(request_key(request), Entry(body, encoding, tuple(tags)), settings.RESPONSE_CACHE_TTL, token)
+
+
+def send(request: Request, body: bytes, tags: Iterable[str]) -> Response:
+    """Compress a freshly built JSON `body` for this client, store it and send it."""
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    if encoding is not None and len(body) >= settings.COMPRESSION_MIN_SIZE:
+        body = compress(body, encoding)
+    else:
+        encoding = None
+    store(request, body, encoding, tags)
+    return json_response(body, encoding)
+
+
+def invalidate(*tags: str) -> None:
+    """Call after committing a write, with every tag the write affects."""
+    if backend is not None and tags:
+        backend.invalidate(tags)
+
+
+def tag_id(tags: Iterable[str], kind: str) -> Optional[int]:
+    """The id in the first `kind:{id}` tag, e.g. the blog a cached detail page is for."""
+    prefix = kind + ":"
+    for tag in tags:
+        if tag.startswith(prefix):
+            return int(tag[len(prefix):])
+    return None
@@ -0,0 +1,191 @@
+# app/core/compression.py
+"""
+Negotiated gzip / brotli response compression.
+
+`CompressionMiddleware` compresses any complete response body over
+`COMPRESSION_MIN_SIZE` bytes using the best encoding the client accepts
+(brotli when the `brotli` package is installed, otherwise gzip). Streaming
+responses and bodies that already carry a Content-Encoding pass through.
+
+`cached_json_response` is for payloads that only change with a known
+revision, such as a blog at a given `revision` counter: the JSON body and each
+compressed variant are built once per revision and then served from an
+in-process LRU, so popular articles are not re-encoded on every hit.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+SUPPORTED = ("br", "gzip") if brotli is not None else ("gzip",)
+_SKIP_CONTENT_TYPES = ("text/event-stream",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the preferred supported encoding from an Accept-Encoding header."""
+    if not accept_encoding or not settings.COMPRESSION_ENABLED:
+        return None
+    offered = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip().lower()] = q
+    wildcard = offered.get("*", 0.0)
+    for encoding in SUPPORTED:
+        if offered.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    if encoding == "br":
+        quality = settings.BROTLI_CACHED_QUALITY if cached else settings.BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = 9 if cached else settings.GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or headers.get("content-type", "").startswith(_SKIP_CONTENT_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming or tiny: not worth buffering or encoding.
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[key] = value
+            self._size += len(value)
+            while self._data and (len(self._data) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+
+body_cache = CompressedBodyCache(
+    max_entries=settings.COMPRESSED_CACHE_ENTRIES,
+    max_bytes=settings.COMPRESSED_CACHE_MAX_BYTES,
+)
+
+
+def cached_json_response(request: Request, key: Tuple, build: Callable[[], bytes]) -> Response:
+    """
+    Serve `build()` (JSON bytes) for a revision `key`, compressing each
+    encoding at most once per key. `key` must change whenever the payload does.
+    """
+    body, encoding = cached_body(request, key, build)
+    return json_response(body, encoding)
+
+
+def cached_body(request: Request, key: Tuple, build: Callable[[], bytes]) -> Tuple[bytes, Optional[str]]:
+    """The body `cached_json_response` would send, and its Content-Encoding."""
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        body = body_cache.get((key, encoding))
+        if body is not None:
+            return body, encoding
+
+    identity = body_cache.get((key, None))
+    if identity is None:
+        identity = build()
+        body_cache.set((key, None), identity)
+
+    if encoding is None or len(identity) < settings.COMPRESSION_MIN_SIZE:
+        return identity, None
+
+    body = compress(identity, encoding, cached=True)
+    body_cache.set((key, encoding), body)
+    return body, encoding
+
+
+def json_response(body: bytes, encoding: Optional[str]) -> Response:
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
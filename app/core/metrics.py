@@ -0,0 +1,180 @@
+# app/core/metrics.py
+"""
+Prometheus metrics for HTTP routes, the threadpool, the DB pool and queries.
+
+Requests are labelled by the route template (`/api/blogs/{slug}`), never the
+raw URL, so label cardinality stays bounded. When several uvicorn workers
+run, point `PROMETHEUS_MULTIPROC_DIR` at an empty directory before they
+start; every worker then writes its samples there and `/metrics` aggregates
+all of them no matter which worker answers the scrape.
+"""
+import os
+import time
+
+import anyio.to_thread
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+from app.core.request_context import route_template
+from app.db.events import add_query_observer
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_BUSY = Gauge(
+    "threadpool_busy_threads", "Worker threads running sync handlers",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_WAITING = Gauge(
+    "threadpool_waiting_tasks", "Sync handlers queued for a free worker thread",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_SIZE = Gauge(
+    "threadpool_size", "Worker thread capacity",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool")
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_seconds", "Time to obtain a pooled connection (wait + connect + pre-ping)",
+    buckets=DB_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Connections currently checked out",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Histogram(
+    "db_query_duration_seconds", "SQL statement duration by statement type",
+    ["operation"], buckets=DB_BUCKETS,
+)
+LOGINS = Counter("auth_logins_total", "Login attempts by result", ["result"])
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total", "Requests shed with 503 by admission control",
+    ["group", "reason"],
+)
+AUDIT_EVENTS = Counter(
+    "audit_events_total", "Audit events by outcome (queued, written, dropped, failed)",
+    ["outcome"],
+)
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+def record_login(success: bool) -> None:
+    LOGINS.labels(result="success" if success else "failure").inc()
+
+
+def _sample_threadpool() -> None:
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    THREADPOOL_BUSY.set(limiter.borrowed_tokens)
+    THREADPOOL_WAITING.set(limiter.statistics().tasks_waiting)
+    THREADPOOL_SIZE.set(limiter.total_tokens)
+
+
+class MetricsMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        _sample_threadpool()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            _sample_threadpool()
+            route = route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+
+
+def _observe_query(conn, statement, parameters, duration, executemany, context) -> None:
+    operation = statement.lstrip()[:6].upper()
+    DB_QUERIES.labels(operation if operation in _OPERATIONS else "OTHER").observe(duration)
+
+
+def _time_checkouts(pool) -> None:
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+
+def instrument_engine(engine) -> None:
+    _time_checkouts(engine.pool)
+
+    @event.listens_for(engine, "engine_disposed")
+    def _on_dispose(engine):
+        # dispose() swaps in a fresh pool (e.g. app.serve's post_fork); time that one too.
+        _time_checkouts(engine.pool)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_IN_USE.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_IN_USE.dec()
+
+    add_query_observer(engine, _observe_query)
+
+
+def render_latest() -> tuple:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def install(app, engine) -> None:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
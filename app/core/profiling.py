@@ -0,0 +1,110 @@
+# app/core/profiling.py
+"""
+Per-request SQL profiling.
+
+When `SQL_PROFILING` is on, every HTTP response carries a `Server-Timing`
+header:
+
+    db      total time spent in cursor.execute (desc = statement count)
+    serialize  time between the last statement and the response start,
+               i.e. model validation and JSON encoding in the handler
+    total   wall time until the response started
+
+and a warning is logged when the same statement shape runs more than
+`SQL_REPEAT_THRESHOLD` times in one request - the usual N+1 signature of a
+lazy relationship loaded once per row. When the setting is off neither the
+middleware nor the engine listeners are installed.
+"""
+import logging
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.db.events import add_query_observer
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_IN_LIST = re.compile(r"\(\s*" + _PLACEHOLDER + r"(?:\s*,\s*" + _PLACEHOLDER + r")*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestProfile:
+    __slots__ = ("statements", "db_time", "last_query_end", "shapes")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_time = 0.0
+        self.last_query_end: Optional[float] = None
+        self.shapes: Dict[str, int] = {}
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so IN-lists of any length compare equal."""
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _observe(conn, statement, parameters, duration, executemany, context) -> None:
+    profile = _current.get()
+    if profile is None:
+        return
+    profile.statements += 1
+    profile.db_time += duration
+    profile.last_query_end = time.perf_counter()
+    shape = statement_shape(statement)
+    profile.shapes[shape] = profile.shapes.get(shape, 0) + 1
+
+
+class SQLProfilingMiddleware:
+    def __init__(self, app, repeat_threshold: int = 5) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                serialize = now - (profile.last_query_end or start)
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.db_time * 1000:.2f};desc="{profile.statements} queries", '
+                    f"serialize;dur={serialize * 1000:.2f}, "
+                    f"total;dur={(now - start) * 1000:.2f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._report_repeats(scope, profile)
+
+    def _report_repeats(self, scope, profile: RequestProfile) -> None:
+        for shape, count in profile.shapes.items():
+            if count > self.repeat_threshold:
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times in one request: %s",
+                    scope["method"], scope["path"], count, shape,
+                )
+
+
+def install(app, engine, repeat_threshold: int) -> None:
+    add_query_observer(engine, _observe)
+    app.add_middleware(SQLProfilingMiddleware, repeat_threshold=repeat_threshold)
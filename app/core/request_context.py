@@ -0,0 +1,40 @@
+# app/core/request_context.py
+"""
+Makes the current request's ASGI scope reachable from code that has no
+Request object, such as engine event listeners running in the threadpool.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+def route_template(scope: dict) -> str:
+    """`/api/blogs/{slug}` rather than the raw URL; set by the router on match."""
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+def current_scope() -> Optional[dict]:
+    return _scope.get()
+
+
+def current_route() -> Optional[str]:
+    scope = _scope.get()
+    if scope is None:
+        return None
+    return f"{scope['method']} {route_template(scope)}"
+
+
+class RequestContextMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _scope.reset(token)
@@ -0,0 +1,178 @@
+# app/core/slow_queries.py
+"""
+Slow-query recorder.
+
+Statements slower than `SLOW_QUERY_THRESHOLD_MS` are captured with their
+(redacted) parameters, the route that issued them and the duration. A
+sampled share of slow SELECTs is re-run as EXPLAIN on a separate connection
+in a background thread, so the request that was already slow does not wait
+for the plan. Entries are kept in a bounded ring buffer (newest last) and
+optionally appended to a rotating JSONL file.
+"""
+import json
+import logging
+import random
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, List, Optional
+
+from app.core.request_context import current_route, current_scope
+from app.db.events import SKIP_OBSERVERS, add_query_observer
+
+logger = logging.getLogger(__name__)
+
+_SENSITIVE = re.compile(r"password|passwd|secret|token|hash", re.IGNORECASE)
+_HASH_PREFIXES = ("$pbkdf2", "$2a$", "$2b$", "$argon2")
+REDACTED = "***"
+MAX_PARAM_LENGTH = 200
+
+
+def _bind_names(context) -> Optional[List[str]]:
+    compiled = getattr(context, "compiled", None)
+    if compiled is None:
+        return None
+    names = getattr(compiled, "positiontup", None)
+    return list(names) if names else None
+
+
+def _safe_value(name: Optional[str], value: Any) -> Any:
+    if name is not None and _SENSITIVE.search(name):
+        return REDACTED
+    if isinstance(value, str):
+        if value.startswith(_HASH_PREFIXES):
+            return REDACTED
+        return value if len(value) <= MAX_PARAM_LENGTH else value[:MAX_PARAM_LENGTH] + "…"
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return _safe_value(None, str(value))
+
+
+def redact_parameters(parameters: Any, context=None) -> Any:
+    """Copy of the bound parameters that is safe to log."""
+    if isinstance(parameters, dict):
+        return {k: _safe_value(k, v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: one entry per row
+            return [redact_parameters(p, context) for p in parameters]
+        names = _bind_names(context) or []
+        return [
+            _safe_value(names[i] if i < len(names) else None, v)
+            for i, v in enumerate(parameters)
+        ]
+    return parameters
+
+
+class SlowQueryRecorder:
+    def __init__(
+        self,
+        engine,
+        threshold_ms: float,
+        buffer_size: int = 200,
+        explain_sample_rate: float = 1.0,
+        log_file: Optional[str] = None,
+        log_max_bytes: int = 10 * 1024 * 1024,
+        log_backups: int = 5,
+    ) -> None:
+        self.engine = engine
+        self.threshold = threshold_ms / 1000.0
+        self.explain_sample_rate = explain_sample_rate
+        self._entries = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        # EXPLAINs waiting for the explainer thread; beyond this, skip them.
+        self._pending = threading.BoundedSemaphore(16)
+        self._file_logger = None
+        if log_file:
+            self._file_logger = logging.getLogger("app.slow_queries.file")
+            self._file_logger.propagate = False
+            self._file_logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(log_file, maxBytes=log_max_bytes, backupCount=log_backups)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._file_logger.addHandler(handler)
+
+    # ------------------------------
+    # Capture
+    # ------------------------------
+    def observe(self, conn, statement, parameters, duration, executemany, context) -> None:
+        if duration < self.threshold:
+            return
+        scope = current_scope()
+        entry = {
+            "recorded_at": datetime.utcnow().isoformat() + "Z",
+            "duration_ms": round(duration * 1000.0, 3),
+            "route": current_route(),
+            "path": scope["path"] if scope else None,
+            "statement": statement,
+            "parameters": redact_parameters(parameters, context),
+            "executemany": executemany,
+            "explain": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning("Slow query (%.1f ms) on %s: %s", entry["duration_ms"], entry["route"], statement)
+
+        if (
+            not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < self.explain_sample_rate
+            and self._pending.acquire(blocking=False)
+        ):
+            self._explainer.submit(self._explain, entry, statement, parameters)
+        else:
+            self._write(entry)
+
+    def _explain(self, entry: dict, statement: str, parameters: Any) -> None:
+        prefix = "EXPLAIN QUERY PLAN " if self.engine.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            with self.engine.connect() as conn:
+                conn = conn.execution_options(**{SKIP_OBSERVERS: True})
+                rows = conn.exec_driver_sql(prefix + statement, parameters).mappings().all()
+                entry["explain"] = [{k: _safe_value(None, v) for k, v in row.items()} for row in rows]
+        except Exception as exc:  # a failed EXPLAIN must never surface to callers
+            entry["explain"] = {"error": str(exc)}
+        finally:
+            self._pending.release()
+            self._write(entry)
+
+    def _write(self, entry: dict) -> None:
+        if self._file_logger is not None:
+            self._file_logger.info(json.dumps(entry, default=str))
+
+    # ------------------------------
+    # Read / reset
+    # ------------------------------
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            items = list(self._entries)
+        items.reverse()
+        return items[:limit] if limit else items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        self._explainer.shutdown(wait=True)
+
+
+recorder: Optional[SlowQueryRecorder] = None
+
+
+def install(engine, settings) -> SlowQueryRecorder:
+    global recorder
+    recorder = SlowQueryRecorder(
+        engine,
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        buffer_size=settings.SLOW_QUERY_BUFFER_SIZE,
+        explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        log_file=settings.SLOW_QUERY_LOG_FILE or None,
+        log_max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        log_backups=settings.SLOW_QUERY_LOG_BACKUPS,
+    )
+    add_query_observer(engine, recorder.observe)
+    return recorder
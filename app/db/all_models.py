@@ -0,0 +1,18 @@
+# app/db/all_models.py
+"""
+Import every model so mapper relationships resolve and Base.metadata is
+complete. Command-line tools import this instead of app.main.
+"""
+from app.models.audit import AuditEvent  # noqa: F401
+from app.models.author import Author  # noqa: F401
+from app.models.blog import Blog  # noqa: F401
+from app.models.blog_changes import BlogChange  # noqa: F401
+from app.models.blog_documents import BlogDocument  # noqa: F401
+from app.models.blog_views import BlogViewCount  # noqa: F401
+from app.models.category import Category  # noqa: F401
+from app.models.dashboard import DashboardStat  # noqa: F401
+from app.models.department import Department  # noqa: F401
+from app.models.job import Job  # noqa: F401
+from app.models.related import BlogRelated  # noqa: F401
+from app.models.role import Role  # noqa: F401
+from app.models.user import User  # noqa: F401
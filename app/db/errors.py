@@ -0,0 +1,70 @@
+# app/db/errors.py
+"""
+Turn constraint violations into the 400s the API has always returned.
+
+Write endpoints no longer SELECT before inserting to check that a username
+or slug is free; they write straight away and let the unique constraint
+decide. `constraint_errors` wraps the flush/commit and maps the violated
+column to its message:
+
+    with constraint_errors(db, username="Username already in use", email="Email already in use"):
+        db.commit()
+
+Each driver reports the column differently: MySQL names the key (`users.username`,
+`ix_users_email`) or the foreign key column, SQLite reports `users.username`,
+and PostgreSQL reports `Key (username)=...`. A violation that matches none
+of the columns is re-raised unchanged.
+"""
+import re
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+_IDENTIFIERS = (
+    re.compile(r"for key '([^']+)'"),                      # MySQL duplicate entry
+    re.compile(r"foreign key \(`([^`]+)`\)"),              # MySQL foreign key
+    re.compile(r"constraint failed: ([\w.]+(?:, [\w.]+)*)"),  # SQLite
+    re.compile(r"key \(([^)]+)\)="),                       # PostgreSQL detail
+    re.compile(r'constraint "([^"]+)"'),                   # PostgreSQL constraint name
+)
+
+
+def _identifiers(exc: IntegrityError) -> List[str]:
+    message = str(exc.orig).lower()
+    found = []
+    for pattern in _IDENTIFIERS:
+        for match in pattern.findall(message):
+            found.extend(part.strip() for part in match.split(","))
+    return found
+
+
+def violated(exc: IntegrityError, column: str) -> bool:
+    """True if `exc` names `column` (as `col`, `table.col` or an index ending in `_col`)."""
+    return any(
+        ident == column or ident.endswith("." + column) or ident.endswith("_" + column)
+        or ident.endswith("_" + column + "_key")  # PostgreSQL's default unique name
+        for ident in _identifiers(exc)
+    )
+
+
+def conflict_detail(exc: IntegrityError, details: dict) -> Optional[str]:
+    for column, detail in details.items():
+        if violated(exc, column):
+            return detail
+    return None
+
+
+@contextmanager
+def constraint_errors(db: Session, **details: str) -> Iterator[None]:
+    """Roll back and raise HTTP 400 with `details[column]` on a constraint violation."""
+    try:
+        yield
+    except IntegrityError as exc:
+        db.rollback()
+        detail = conflict_detail(exc, details)
+        if detail is None:
+            raise
+        raise HTTPException(status_code=400, detail=detail) from None
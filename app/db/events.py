@@ -0,0 +1,53 @@
+# app/db/events.py
+"""
+Shared cursor-level timing for the engine.
+
+Listeners are only attached once the first observer registers, so an app
+with every instrumentation feature switched off pays nothing per statement.
+Observers are called as
+`fn(conn, statement, parameters, duration, executemany, context)` with
+`duration` in seconds.
+"""
+import time
+from typing import Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QueryObserver = Callable[..., None]
+
+_observers: List[QueryObserver] = []
+_instrumented = set()
+
+# Connections executing with this option are invisible to observers
+# (used for statements the instrumentation issues itself).
+SKIP_OBSERVERS = "skip_query_observers"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    if conn.get_execution_options().get(SKIP_OBSERVERS):
+        return
+    for observer in _observers:
+        observer(conn, statement, parameters, duration, executemany, context)
+
+
+def _handle_error(context):
+    # A failed execute never reaches after_cursor_execute; drop its start time.
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def add_query_observer(engine: Engine, observer: QueryObserver) -> None:
+    if id(engine) not in _instrumented:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+        _instrumented.add(id(engine))
+    if observer not in _observers:
+        _observers.append(observer)
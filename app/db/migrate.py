@@ -0,0 +1,334 @@
+# app/db/migrate.py
+"""
+Versioned schema migrations.
+
+Migrations live in `app/db/migrations/vNNNN_<name>.py`; each module defines
+`VERSION` (an int), a docstring whose first line describes it, and
+`upgrade(op)` taking an `Operations`. A migration declares the tables it
+creates as its own `Table(...)` snapshot rather than importing the models, so
+replaying history builds the schema as it was at each version. Applied
+versions are recorded in `schema_migrations`, so every migration runs once per
+database, in order.
+Operations are idempotent (they check the live schema first), which makes a
+migration safe to re-run after a partial failure and lets the baseline adopt
+databases created by the old `create_all` startup.
+
+Index builds are online where the database supports it: on MySQL they run as
+`ALTER TABLE ... ADD INDEX ..., ALGORITHM=INPLACE, LOCK=NONE`, so reads and
+writes continue while the index is built.
+
+    python -m app.db.migrate upgrade   # apply pending migrations
+    python -m app.db.migrate current   # show applied / pending versions
+    python -m app.db.migrate check     # diff the models against the database
+"""
+import importlib
+import logging
+import pkgutil
+import sys
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy import (
+    Column, DateTime, DefaultClause, ForeignKeyConstraint, Integer, MetaData, String, Table, UniqueConstraint,
+    inspect, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex, Index
+
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.db.migrations"
+MYSQL_LOCK_NAME = "aw_schema_migrations"
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Operations:
+    """Idempotent DDL helpers handed to each migration's `upgrade(op)`."""
+
+    def __init__(self, conn: Connection) -> None:
+        self.conn = conn
+        self.dialect = conn.dialect.name
+
+    def _inspector(self):
+        # A fresh inspector every time: earlier steps may have changed the schema.
+        return inspect(self.conn)
+
+    def has_table(self, table: str) -> bool:
+        return self._inspector().has_table(table)
+
+    def execute(self, sql: str, **params) -> None:
+        self.conn.execute(text(sql), params)
+
+    def create_table(self, table: Table) -> None:
+        table.create(self.conn, checkfirst=True)
+
+    def add_column(self, table: str, column: Column) -> None:
+        if column.name in {c["name"] for c in self._inspector().get_columns(table)}:
+            return
+        ddl = f"{column.name} {column.type.compile(dialect=self.conn.dialect)}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+        if column.server_default is not None:
+            ddl += f" DEFAULT {column.server_default.arg}"
+        self.execute(f"ALTER TABLE {table} ADD COLUMN {ddl}")
+
+    def create_index(self, name: str, table: str, columns: Sequence[str], unique: bool = False) -> None:
+        """Skips the build when an index over exactly these columns already exists."""
+        columns = list(columns)
+        for existing in self._inspector().get_indexes(table):
+            if existing["name"] == name or existing["column_names"] == columns:
+                return
+        if self.dialect == "mysql":
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            self.execute(
+                f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(columns)}), ALGORITHM=INPLACE, LOCK=NONE"
+            )
+        else:
+            table_obj = Table(table, MetaData(), *(Column(c) for c in columns))
+            self.conn.execute(CreateIndex(Index(name, *(table_obj.c[c] for c in columns), unique=unique)))
+
+    def drop_index(self, name: str, table: str) -> None:
+        if name not in {i["name"] for i in self._inspector().get_indexes(table)}:
+            return
+        if self.dialect == "mysql":
+            self.execute(f"ALTER TABLE {table} DROP INDEX {name}, ALGORITHM=INPLACE, LOCK=NONE")
+        else:
+            self.execute(f"DROP INDEX {name}")
+
+    def set_foreign_key_ondelete(self, table: str, column: str, referred: str, ondelete: str) -> None:
+        """
+        Recreate the FK on `table.column` with the given ON DELETE rule. MySQL
+        and PostgreSQL drop and re-add the constraint; SQLite cannot alter a
+        constraint, so the table is rebuilt (`_rebuild_sqlite_table`).
+        """
+        for fk in self._inspector().get_foreign_keys(table):
+            if fk["constrained_columns"] != [column]:
+                continue
+            if _live_ondelete(fk) == _ondelete(ondelete):
+                return
+            if self.dialect == "sqlite":
+                self._rebuild_sqlite_table(table, {column: ondelete})
+                return
+            drop = "DROP FOREIGN KEY" if self.dialect == "mysql" else "DROP CONSTRAINT"
+            self.execute(f"ALTER TABLE {table} {drop} {fk['name']}")
+            self.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {fk['name']} FOREIGN KEY ({column}) "
+                f"REFERENCES {referred} (id) ON DELETE {ondelete}"
+            )
+            return
+
+    def _rebuild_sqlite_table(self, table: str, ondelete: dict) -> None:
+        """
+        SQLite's documented table rebuild: copy the rows into a new table
+        declared with the changed FKs, drop the old one, rename, and restore
+        its indexes and triggers.
+
+        FK enforcement is switched off for the swap (otherwise dropping the
+        old table would cascade into the tables that reference it), which
+        SQLite only allows outside a transaction, so the pending work is
+        committed first. `foreign_key_check` confirms nothing was orphaned
+        before the rebuild commits.
+        """
+        self.conn.commit()
+        enforced = self.conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        self.conn.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        try:
+            # Reflection also loads the referenced tables, so the new FKs resolve.
+            metadata = MetaData()
+            old = Table(table, metadata, autoload_with=self.conn)
+            extras = self.conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') "
+                "AND sql IS NOT NULL",
+                (table,),
+            ).scalars().all()
+
+            new = Table(f"_rebuild_{table}", metadata)
+            for column in old.columns:
+                new.append_column(Column(
+                    column.name,
+                    column.type,
+                    nullable=column.nullable,
+                    primary_key=column.primary_key,
+                    autoincrement=column.autoincrement,
+                    server_default=(
+                        DefaultClause(column.server_default.arg) if column.server_default is not None else None
+                    ),
+                ))
+            for fk in old.foreign_key_constraints:
+                columns = [c.name for c in fk.columns]
+                rule = ondelete.get(columns[0], fk.ondelete) if len(columns) == 1 else fk.ondelete
+                new.append_constraint(ForeignKeyConstraint(
+                    columns, [e.target_fullname for e in fk.elements],
+                    name=fk.name, ondelete=rule, onupdate=fk.onupdate,
+                ))
+            for constraint in old.constraints:
+                if isinstance(constraint, UniqueConstraint):
+                    new.append_constraint(UniqueConstraint(*(c.name for c in constraint.columns), name=constraint.name))
+
+            new.create(self.conn)
+            names = ", ".join(f'"{c.name}"' for c in old.columns)
+            self.execute(f'INSERT INTO "{new.name}" ({names}) SELECT {names} FROM "{table}"')
+            self.execute(f'DROP TABLE "{table}"')
+            self.execute(f'ALTER TABLE "{new.name}" RENAME TO "{table}"')
+            for sql in extras:
+                self.conn.exec_driver_sql(sql)
+            orphans = self.conn.exec_driver_sql(f'PRAGMA foreign_key_check("{table}")').all()
+            if orphans:
+                raise RuntimeError(f"Rebuilding {table} left {len(orphans)} rows violating a foreign key")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            if enforced:
+                self.conn.exec_driver_sql("PRAGMA foreign_keys = ON")
+
+
+def _ondelete(rule: Optional[str]) -> str:
+    # Reflection omits the default rule on some backends and spells it out on others.
+    rule = (rule or "NO ACTION").upper()
+    return "NO ACTION" if rule == "RESTRICT" else rule
+
+
+def _live_ondelete(fk: dict) -> str:
+    return _ondelete((fk.get("options") or {}).get("ondelete"))
+
+
+# ------------------------------
+# Runner
+# ------------------------------
+def load_migrations() -> List:
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    modules = [
+        importlib.import_module(f"{MIGRATIONS_PACKAGE}.{info.name}")
+        for info in pkgutil.iter_modules(package.__path__)
+        if info.name.startswith("v")
+    ]
+    modules.sort(key=lambda m: m.VERSION)
+    versions = [m.VERSION for m in modules]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return modules
+
+
+def _description(module) -> str:
+    return (module.__doc__ or module.__name__).strip().splitlines()[0][:255]
+
+
+def applied_versions(conn: Connection) -> List[int]:
+    schema_migrations.create(conn, checkfirst=True)
+    return sorted(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """Apply every pending migration up to `target`; returns the versions applied."""
+    done = []
+    with engine.connect() as conn:
+        if conn.dialect.name == "mysql":
+            # Several workers may start at once; only one migrates.
+            # GET_LOCK returns 0 on timeout and NULL on error; neither holds the lock.
+            acquired = conn.execute(text("SELECT GET_LOCK(:name, 300)"), {"name": MYSQL_LOCK_NAME}).scalar()
+            if acquired != 1:
+                raise RuntimeError(f"Could not acquire the {MYSQL_LOCK_NAME} lock (GET_LOCK returned {acquired})")
+        try:
+            applied = set(applied_versions(conn))
+            conn.commit()
+            for module in load_migrations():
+                if module.VERSION in applied or (target is not None and module.VERSION > target):
+                    continue
+                logger.info("Applying migration %s: %s", module.VERSION, _description(module))
+                module.upgrade(Operations(conn))
+                conn.execute(
+                    schema_migrations.insert().values(
+                        version=module.VERSION, description=_description(module), applied_at=datetime.utcnow(),
+                    )
+                )
+                conn.commit()
+                done.append(module.VERSION)
+        finally:
+            if conn.dialect.name == "mysql":
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MYSQL_LOCK_NAME})
+    return done
+
+
+def check(engine: Engine) -> List[str]:
+    """Differences between the ORM models and the live schema (empty = in sync)."""
+    import app.db.all_models  # noqa: F401
+
+    problems = []
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"missing table {table.name}")
+            continue
+        live_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in live_columns:
+                problems.append(f"missing column {table.name}.{column.name}")
+        for column in live_columns - set(table.columns.keys()):
+            problems.append(f"column {table.name}.{column} is not in the models")
+        live_indexes = {tuple(i["column_names"]) for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            columns = tuple(c.name for c in index.columns)
+            if columns not in live_indexes:
+                problems.append(f"missing index {index.name} on {table.name} {columns}")
+        live_fks = {tuple(fk["constrained_columns"]): fk for fk in inspector.get_foreign_keys(table.name)}
+        for fk in table.foreign_key_constraints:
+            columns = tuple(c.name for c in fk.columns)
+            live = live_fks.get(columns)
+            target = (fk.referred_table.name, [e.column.name for e in fk.elements])
+            if live is None:
+                problems.append(f"missing foreign key on {table.name} {columns}")
+            elif (live["referred_table"], live["referred_columns"]) != target:
+                problems.append(
+                    f"foreign key on {table.name} {columns} references "
+                    f"{live['referred_table']}{tuple(live['referred_columns'])}, models say {target[0]}{tuple(target[1])}"
+                )
+            elif _live_ondelete(live) != _ondelete(fk.ondelete):
+                problems.append(
+                    f"foreign key on {table.name} {columns} is ON DELETE {_live_ondelete(live)}, "
+                    f"models say {_ondelete(fk.ondelete)}"
+                )
+    return problems
+
+
+def main(argv: List[str]) -> int:
+    from app.db.session import engine
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    command = argv[0] if argv else ""
+    if command == "upgrade":
+        target = int(argv[1]) if len(argv) > 1 else None
+        applied = upgrade(engine, target)
+        print(f"Applied {applied}" if applied else "Already up to date")
+        return 0
+    if command == "current":
+        with engine.connect() as conn:
+            applied = set(applied_versions(conn))
+            conn.commit()
+        for module in load_migrations():
+            state = "applied" if module.VERSION in applied else "pending"
+            print(f"{module.VERSION:>4}  {state:<8} {_description(module)}")
+        return 0
+    if command == "check":
+        problems = check(engine)
+        for problem in problems:
+            print(problem)
+        print("Schema matches the models" if not problems else f"{len(problems)} difference(s)")
+        return 1 if problems else 0
+    print("usage: python -m app.db.migrate upgrade [VERSION] | current | check", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,119 @@
+# app/db/migrations/v0001_baseline.py
+"""Baseline: the tables created by create_all before migrations existed."""
+from sqlalchemy import (
+    JSON, Boolean, Column, Date, DateTime, ForeignKey, Integer, MetaData, String, Table, Text,
+)
+
+VERSION = 1
+
+# A frozen snapshot of the schema at this version, not the live models: later
+# migrations add the blog/user query indexes (v0002) and ON DELETE CASCADE on
+# blogs.author_id / blogs.category_id (v0003).
+metadata = MetaData()
+
+roles = Table(
+    "roles", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(50), unique=True, nullable=False),
+    Column("description", String(255)),
+)
+
+departments = Table(
+    "departments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), unique=True, nullable=False),
+    Column("description", String(255)),
+    Column("is_active", Boolean),
+)
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("emp_id", String(10), unique=True, index=True),
+    Column("username", String(50), unique=True, nullable=False),
+    Column("full_name", String(120), nullable=False),
+    Column("email", String(120), unique=True, index=True, nullable=False),
+    Column("password_hash", String(255), nullable=False),
+    Column("is_active", Boolean),
+    Column("role_id", Integer, ForeignKey("roles.id"), nullable=False),
+    Column("department_id", Integer, ForeignKey("departments.id"), nullable=True),
+)
+
+authors = Table(
+    "authors", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(120), nullable=False),
+    Column("slug", String(120), nullable=False, unique=True, index=True),
+    Column("role", String(120), nullable=True),
+    Column("bio", Text, nullable=True),
+    Column("avatar", String(1024), nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+categories = Table(
+    "categories", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(150), nullable=False, unique=True, index=True),
+    Column("slug", String(150), nullable=False, unique=True, index=True),
+    Column("description", Text, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+blogs = Table(
+    "blogs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(255), nullable=False),
+    Column("slug", String(255), nullable=False, unique=True, index=True),
+    Column("banner_img", String(1024), nullable=True),
+    Column("banner_title", String(512), nullable=True),
+    Column("cover", String(1024), nullable=True),
+    Column("cover_alt", String(512), nullable=True),
+    Column("deck", String(512), nullable=True),
+    Column("content", Text, nullable=True),
+    Column("content_html", Text, nullable=True),
+    Column("sections", JSON, nullable=True),
+    Column("author_id", Integer, ForeignKey("authors.id"), nullable=True),
+    Column("category_id", Integer, ForeignKey("categories.id"), nullable=True),
+    Column("author_name", String(120), nullable=True),
+    Column("author_slug", String(120), nullable=True),
+    Column("read_mins", Integer, nullable=True),
+    Column("is_published", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+blog_related = Table(
+    "blog_related", metadata,
+    Column("blog_id", Integer, ForeignKey("blogs.id", ondelete="CASCADE"), primary_key=True),
+    Column("related", JSON, nullable=False),
+    Column("updated_at", DateTime),
+)
+
+blog_view_counts = Table(
+    "blog_view_counts", metadata,
+    Column("blog_id", Integer, ForeignKey("blogs.id", ondelete="CASCADE"), primary_key=True),
+    Column("bucket", Date, primary_key=True, index=True),
+    Column("views", Integer, nullable=False),
+)
+
+jobs = Table(
+    "jobs", metadata,
+    Column("id", String(32), primary_key=True),
+    Column("kind", String(50), nullable=False),
+    Column("target_id", Integer, nullable=True),
+    Column("status", String(20), nullable=False),
+    Column("total", Integer, nullable=True),
+    Column("done", Integer, nullable=False),
+    Column("error", Text, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("finished_at", DateTime, nullable=True),
+)
+
+
+def upgrade(op):
+    # sorted_tables: parents before children so foreign keys resolve.
+    for table in metadata.sorted_tables:
+        op.create_table(table)
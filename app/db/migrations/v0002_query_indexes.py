@@ -0,0 +1,16 @@
+# app/db/migrations/v0002_query_indexes.py
+"""Indexes for blog listing/filtering, the related-posts watermark and user joins."""
+
+VERSION = 2
+
+
+def upgrade(op):
+    # list_blogs: WHERE is_published = ? ORDER BY created_at DESC
+    op.create_index("ix_blogs_published_created", "blogs", ["is_published", "created_at"])
+    # ?author= / ?category= filters, cascade deletes
+    op.create_index("ix_blogs_author_id", "blogs", ["author_id"])
+    op.create_index("ix_blogs_category_id", "blogs", ["category_id"])
+    # related.refresh(): WHERE updated_at >= watermark
+    op.create_index("ix_blogs_updated_at", "blogs", ["updated_at"])
+    op.create_index("ix_users_role_id", "users", ["role_id"])
+    op.create_index("ix_users_department_id", "users", ["department_id"])
@@ -0,0 +1,9 @@
+# app/db/migrations/v0003_blog_fk_cascade.py
+"""ON DELETE CASCADE on blogs.author_id / blogs.category_id (SQLite rebuilds the blogs table)."""
+
+VERSION = 3
+
+
+def upgrade(op):
+    op.set_foreign_key_ondelete("blogs", "author_id", "authors", "CASCADE")
+    op.set_foreign_key_ondelete("blogs", "category_id", "categories", "CASCADE")
@@ -0,0 +1,20 @@
+# app/db/migrations/v0004_blog_changes.py
+"""blog_changes: change log with tombstones for /api/blogs/changes."""
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+
+VERSION = 4
+
+metadata = MetaData()
+
+blog_changes = Table(
+    "blog_changes", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("blog_id", Integer, nullable=False, index=True),
+    Column("slug", String(255), nullable=False),
+    Column("op", String(10), nullable=False),
+    Column("changed_at", DateTime, nullable=False),
+)
+
+
+def upgrade(op):
+    op.create_table(blog_changes)
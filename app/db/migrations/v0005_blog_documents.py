@@ -0,0 +1,25 @@
+# app/db/migrations/v0005_blog_documents.py
+"""blog_documents: materialized BlogRead JSON per slug."""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, MetaData, String, Table
+from sqlalchemy.dialects import mysql
+
+VERSION = 5
+
+metadata = MetaData()
+
+# Referenced by the foreign key only; created in v0001.
+Table("blogs", metadata, Column("id", Integer, primary_key=True))
+
+blog_documents = Table(
+    "blog_documents", metadata,
+    Column("slug", String(255), primary_key=True),
+    Column("blog_id", Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False, unique=True),
+    Column("author_id", Integer, nullable=True, index=True),
+    Column("category_id", Integer, nullable=True, index=True),
+    Column("body", LargeBinary().with_variant(mysql.LONGBLOB(), "mysql"), nullable=False),
+    Column("built_at", DateTime, nullable=False),
+)
+
+
+def upgrade(op):
+    op.create_table(blog_documents)
@@ -0,0 +1,26 @@
+# app/db/migrations/v0006_audit_events.py
+"""audit_events: batched audit trail of admin writes."""
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, MetaData, String, Table
+
+VERSION = 6
+
+metadata = MetaData()
+
+audit_events = Table(
+    "audit_events", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("entity", String(20), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("action", String(10), nullable=False),
+    Column("changes", JSON, nullable=True),
+    Column("actor_id", Integer, nullable=True),
+    Column("actor_email", String(120), nullable=True),
+    Column("route", String(120), nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_audit_events_entity", "entity", "entity_id", "id"),
+    Index("ix_audit_events_actor", "actor_id", "id"),
+)
+
+
+def upgrade(op):
+    op.create_table(audit_events)
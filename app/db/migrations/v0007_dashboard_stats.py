@@ -0,0 +1,18 @@
+# app/db/migrations/v0007_dashboard_stats.py
+"""dashboard_stats: rollup counts for the admin dashboard."""
+from sqlalchemy import Column, Integer, MetaData, String, Table
+
+VERSION = 7
+
+metadata = MetaData()
+
+dashboard_stats = Table(
+    "dashboard_stats", metadata,
+    Column("metric", String(32), primary_key=True),
+    Column("bucket", String(32), primary_key=True),
+    Column("value", Integer, nullable=False),
+)
+
+
+def upgrade(op):
+    op.create_table(dashboard_stats)
@@ -0,0 +1,10 @@
+# app/db/migrations/v0008_revisions.py
+"""revision counters on blogs, authors and categories for response body cache keys."""
+from sqlalchemy import Column, Integer
+
+VERSION = 8
+
+
+def upgrade(op):
+    for table in ("blogs", "authors", "categories"):
+        op.add_column(table, Column("revision", Integer, nullable=False, server_default="1"))
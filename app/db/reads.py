@@ -0,0 +1,116 @@
+# app/db/reads.py
+"""
+ORM-free read path for listings.
+
+Read-only list endpoints have no use for identity-map bookkeeping, change
+tracking or relationship instrumentation: the rows are serialized and thrown
+away. The statements below are built once at import time, so each request
+only binds parameters and hits SQLAlchemy's compiled-statement cache. Rows
+come back as plain mappings, which the response schemas validate directly.
+Blog rows are nested into the `BlogRead` shape (`author`, `category`) from a
+single outer-joined SELECT.
+
+The `*_WITH_COUNTS` variants (`?with_counts=true`) add aggregates from one
+grouped subquery, outer-joined so empty owners still appear with 0. Authors
+and categories get published `posts` and `latest_post_at`; departments get
+`members`. There is one prebuilt statement per sort order.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Session
+
+from app.models.author import Author
+from app.models.blog import Blog
+from app.models.category import Category
+from app.models.department import Department
+from app.models.role import Role
+from app.models.user import User
+
+_blogs = Blog.__table__
+_authors = Author.__table__.alias("blog_author")
+_categories = Category.__table__.alias("blog_category")
+
+AUTHORS = select(*Author.__table__.c).order_by(Author.name)
+CATEGORIES = select(*Category.__table__.c).order_by(Category.name)
+ROLES = select(*Role.__table__.c)
+DEPARTMENTS = select(*Department.__table__.c)
+
+
+def _with_post_counts(owner, fk):
+    counts = (
+        select(fk.label("owner_id"), func.count().label("posts"), func.max(_blogs.c.created_at).label("latest_post_at"))
+        .where(_blogs.c.is_published.is_(True), fk.is_not(None))
+        .group_by(fk)
+        .subquery()
+    )
+    posts = func.coalesce(counts.c.posts, 0).label("posts")
+    base = select(*owner.c, posts, counts.c.latest_post_at).outerjoin(counts, counts.c.owner_id == owner.c.id)
+    return {
+        "name": base.order_by(owner.c.name),
+        "count": base.order_by(posts.desc(), owner.c.name),
+    }
+
+
+def _with_member_counts():
+    departments = Department.__table__
+    counts = (
+        select(User.department_id.label("department_id"), func.count().label("members"))
+        .where(User.department_id.is_not(None))
+        .group_by(User.department_id)
+        .subquery()
+    )
+    members = func.coalesce(counts.c.members, 0).label("members")
+    base = select(*departments.c, members).outerjoin(counts, counts.c.department_id == departments.c.id)
+    return {
+        "id": base.order_by(departments.c.id),
+        "name": base.order_by(departments.c.name),
+        "count": base.order_by(members.desc(), departments.c.name),
+    }
+
+
+AUTHORS_WITH_COUNTS = _with_post_counts(Author.__table__, _blogs.c.author_id)
+CATEGORIES_WITH_COUNTS = _with_post_counts(Category.__table__, _blogs.c.category_id)
+DEPARTMENTS_WITH_COUNTS = _with_member_counts()
+
+BLOGS_BY_ID = (
+    select(
+        *_blogs.c,
+        *[c.label(f"author__{c.name}") for c in _authors.c],
+        *[c.label(f"category__{c.name}") for c in _categories.c],
+    )
+    .select_from(
+        _blogs.outerjoin(_authors, _authors.c.id == _blogs.c.author_id)
+        .outerjoin(_categories, _categories.c.id == _blogs.c.category_id)
+    )
+    .where(_blogs.c.id.in_(bindparam("ids", expanding=True)))
+)
+
+
+def rows(db: Session, stmt, **params) -> List[RowMapping]:
+    return db.execute(stmt, params).mappings().all()
+
+
+_BLOG_KEYS = [c.name for c in _blogs.c]
+_AUTHOR_KEYS = [c.name for c in _authors.c]
+_CATEGORY_KEYS = [c.name for c in _categories.c]
+_A = len(_BLOG_KEYS)
+_C = _A + len(_AUTHOR_KEYS)
+
+
+def _nested(keys: List[str], values) -> Optional[Dict]:
+    nested = dict(zip(keys, values))
+    return nested if nested["id"] is not None else None  # outer join found nothing
+
+
+def blogs_by_id(db: Session, ids: Iterable[int]) -> List[Dict]:
+    """`BlogRead`-shaped dicts for `ids`, in that order; unknown ids are skipped."""
+    ids = list(ids)
+    by_id = {}
+    for row in db.execute(BLOGS_BY_ID, {"ids": ids}):
+        blog = dict(zip(_BLOG_KEYS, row[:_A]))
+        blog["author"] = _nested(_AUTHOR_KEYS, row[_A:_C])
+        blog["category"] = _nested(_CATEGORY_KEYS, row[_C:])
+        by_id[blog["id"]] = blog
+    return [by_id[i] for i in ids if i in by_id]
@@ -1,12 +1,61 @@
-from sqlalchemy import create_engine
+from typing import Optional
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db import sqlite
+
+if sqlite.is_sqlite(settings.DATABASE_URL):
+    engine = create_engine(settings.DATABASE_URL, **sqlite.engine_options(settings.DATABASE_URL, settings))
+    sqlite.install(engine, settings)
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+    # Bound lock waits so a change-log row commits within CHANGES_SETTLE_SECONDS
+    # of being recorded (see app/services/changes.py).
+    _LOCK_WAIT = {
+        "mysql": f"SET SESSION innodb_lock_wait_timeout = {int(settings.DB_LOCK_WAIT_SECONDS)}",
+        "postgresql": f"SET lock_timeout = '{int(settings.DB_LOCK_WAIT_SECONDS)}s'",
+    }.get(engine.dialect.name)
+
+    if _LOCK_WAIT:
+        @event.listens_for(engine, "connect")
+        def _bound_lock_waits(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(_LOCK_WAIT)
+            finally:
+                cursor.close()
+            dbapi_connection.commit()  # psycopg2 would otherwise roll the SET back with its first transaction
+
+
+def pool_capacity() -> Optional[int]:
+    """Most connections the engine hands out at once; None if unbounded (in-memory SQLite)."""
+    if sqlite.is_sqlite(settings.DATABASE_URL):
+        if sqlite.is_memory(settings.DATABASE_URL):
+            return None
+        return settings.SQLITE_POOL_SIZE + settings.SQLITE_POOL_OVERFLOW
+    return settings.DB_POOL_SIZE + settings.DB_POOL_OVERFLOW
+
+
+def threadpool_size() -> int:
+    """Threads for sync handlers: `THREADPOOL_SIZE`, else one per pooled connection (anyio's 40 if unbounded)."""
+    return settings.THREADPOOL_SIZE or pool_capacity() or 40
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    # Write endpoints answer from the objects they just wrote; expiring them
+    # on commit would cost a SELECT per object to build the response.
+    expire_on_commit=False,
     bind=engine,
 )
@@ -0,0 +1,73 @@
+# app/db/sqlite.py
+"""
+Embedded SQLite mode (`DATABASE_URL=sqlite:///./aw.db`).
+
+Every pooled connection gets the same pragmas:
+
+- `journal_mode=WAL`: readers never block the (single) writer and vice versa.
+- `synchronous=NORMAL`: fsync on checkpoint instead of on every commit. This
+  is safe with WAL, but a power cut can lose the last few transactions.
+- `mmap_size`, `cache_size`: serve hot pages from memory.
+- `busy_timeout`: writers queue for the lock instead of failing at once.
+- `foreign_keys=ON`: enforce FKs and their ON DELETE rules (SQLite ignores
+  them by default). The pragma enforces what the table DDL says, not what
+  the models say; migration v0003 rebuilds `blogs` so databases created
+  before it carry the same cascades, and `migrate check` flags any FK whose
+  rule differs from the models.
+
+File databases use a normal QueuePool; `:memory:` databases share a single
+connection (StaticPool) so every session sees the same data. JSON columns
+(`Blog.sections`, `BlogRelated.related`) are stored as text and
+round-trip through SQLAlchemy's JSON type, like on MySQL.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import StaticPool
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_memory(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+def engine_options(url: str, settings) -> dict:
+    options = {
+        "connect_args": {
+            "check_same_thread": False,  # sessions move between threadpool threads
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+    }
+    if is_memory(url):
+        options["poolclass"] = StaticPool
+    else:
+        options["pool_size"] = settings.SQLITE_POOL_SIZE
+        options["max_overflow"] = settings.SQLITE_POOL_OVERFLOW
+    return options
+
+
+def install(engine: Engine, settings) -> None:
+    memory = is_memory(str(engine.url))
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KB)}",
+        f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA foreign_keys = ON",
+    ]
+    if not memory:
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
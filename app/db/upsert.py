@@ -0,0 +1,39 @@
+# app/db/upsert.py
+"""Dialect-aware "insert or add to the existing counter" for batched writes."""
+from typing import List, Sequence
+
+from sqlalchemy import Table, and_, insert, update
+
+
+def increment_rows(conn, table: Table, keys: Sequence[str], value: str, rows: List[dict]) -> None:
+    """
+    For each row, insert it or add its `value` column to the existing row with
+    the same `keys`. MySQL and SQLite/PostgreSQL do this in one executemany.
+    """
+    if not rows:
+        return
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(table)
+        stmt = stmt.on_duplicate_key_update({value: table.c[value] + stmt.inserted[value]})
+        conn.execute(stmt, rows)
+    elif dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={value: table.c[value] + stmt.excluded[value]},
+        )
+        conn.execute(stmt, rows)
+    else:
+        for row in rows:
+            where = and_(*(table.c[k] == row[k] for k in keys))
+            result = conn.execute(update(table).where(where).values({value: table.c[value] + row[value]}))
+            if result.rowcount == 0:
+                conn.execute(insert(table).values(**row))
@@ -1,8 +1,16 @@
+import os
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 
-from app.db.session import engine, SessionLocal
-from app.db.base import Base
+from app.core.config import settings
+from app.core import admission, metrics, profiling, slow_queries
+from app.core.compression import CompressionMiddleware
+from app.core.request_context import RequestContextMiddleware
+from app.db import migrate
+from app.db.session import engine, SessionLocal, threadpool_size
 from app.api.routes_auth import router as auth_router
 from app.api.routes_roles import router as roles_router
 from app.api.routes_users import router as users_router
@@ -10,6 +18,14 @@ from app.api.routes_blogs import router as blogs_router
 from app.api.routes_authors import router as authors_router
 from app.api.routes_categories import router as categories_router
 from app.api.routes_department import router as department_router
+from app.api.routes_metrics import router as metrics_router
+from app.api.routes_internal import router as internal_router
+from app.api.routes_media import router as media_router
+from app.api.routes_suggest import router as suggest_router
+from app.api.routes_jobs import router as jobs_router
+from app.api.routes_audit import router as audit_router
+from app.api.routes_dashboard import router as dashboard_router
+from app.services import audit, documents, media, related, rollups, suggest, views
 
 from app.seed.init_data import seed_initial_data
 
@@ -34,17 +50,80 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ------------------------------
+# Compression (gzip / brotli)
+# ------------------------------
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# ------------------------------
+# Admission control (503 + Retry-After under overload)
+# ------------------------------
+if settings.ADMISSION_CONTROL:
+    admission.install(app, settings)
+
+# ------------------------------
+# SQL profiling (Server-Timing header, N+1 warnings)
+# ------------------------------
+if settings.SQL_PROFILING:
+    profiling.install(app, engine, settings.SQL_REPEAT_THRESHOLD)
+
+# ------------------------------
+# Prometheus metrics
+# ------------------------------
+if settings.METRICS_ENABLED:
+    metrics.install(app, engine)
+
+# ------------------------------
+# Slow-query log
+# ------------------------------
+if settings.SLOW_QUERY_LOG:
+    slow_queries.install(engine, settings)
+
+app.add_middleware(RequestContextMiddleware)
+
+# ------------------------------
+# Threadpool sized to the DB pool
+# ------------------------------
+@app.on_event("startup")
+async def size_threadpool():
+    # Each sync handler holds a connection; threads beyond the pool only queue for one.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size()
+
 # ------------------------------
 # Startup
 # ------------------------------
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    if settings.MIGRATE_ON_STARTUP:
+        migrate.upgrade(engine)
     db = SessionLocal()
     try:
         seed_initial_data(db)
     finally:
         db.close()
+    if settings.VIEW_COUNTING:
+        views.start()
+    if settings.AUDIT_LOG:
+        audit.start()
+    rollups.start()
+    documents.rebuild_missing_in_background()
+    if settings.RELATED_ENABLED:
+        related.start()
+    suggest.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if settings.VIEW_COUNTING:
+        views.stop()
+    if settings.AUDIT_LOG:
+        audit.stop()
+    rollups.stop()
+    metrics.mark_process_dead()
+    media.shutdown()
+    if slow_queries.recorder is not None:
+        slow_queries.recorder.close()
 
 # ------------------------------
 # Routes
@@ -56,4 +135,18 @@ app.include_router(blogs_router)
 app.include_router(authors_router)
 app.include_router(categories_router)
 app.include_router(department_router)
+app.include_router(media_router)
+app.include_router(suggest_router)
+app.include_router(jobs_router)
+app.include_router(audit_router)
+app.include_router(dashboard_router)
+
+os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+app.mount(settings.MEDIA_URL_PATH, StaticFiles(directory=settings.MEDIA_ROOT), name="media")
+
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+
+if settings.SLOW_QUERY_LOG:
+    app.include_router(internal_router)
 
@@ -0,0 +1,26 @@
+# app/models/audit.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from app.db.base import Base
+
+class AuditEvent(Base):
+    """
+    Who changed what, written in batches by app/services/audit.py. No FKs:
+    events outlive the rows and users they mention.
+    """
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        # /api/audit filters, newest first (keyset on id)
+        Index("ix_audit_events_entity", "entity", "entity_id", "id"),
+        Index("ix_audit_events_actor", "actor_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(20), nullable=False)      # "user" | "role" | "department" | "blog" | "author" | "category"
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(10), nullable=False)      # "create" | "update" | "delete"
+    changes = Column(JSON, nullable=True)            # {field: [old, new] or null when not recorded}
+    actor_id = Column(Integer, nullable=True)        # JWT "sub"; null for anonymous requests
+    actor_email = Column(String(120), nullable=True)
+    route = Column(String(120), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
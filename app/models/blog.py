@@ -1,13 +1,17 @@
 # app/models/blog.py
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+    Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Index, text
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, synonym
 from app.db.base import Base  # adjust import if your Base lives elsewhere
 
 class Blog(Base):
     __tablename__ = "blogs"
+    __table_args__ = (
+        # list_blogs: WHERE is_published = ? ORDER BY created_at DESC
+        Index("ix_blogs_published_created", "is_published", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -29,8 +33,8 @@ class Blog(Base):
     sections = Column(JSON, nullable=True)
 
     # Foreign keys for author & category
-    author_id = Column(Integer, ForeignKey("authors.id"), nullable=True)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    author_id = Column(Integer, ForeignKey("authors.id", ondelete="CASCADE"), nullable=True, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=True, index=True)
 
     # Denormalised author fields for convenience
     author_name = Column(String(120), nullable=True)
@@ -39,7 +43,10 @@ class Blog(Base):
     read_mins = Column(Integer, nullable=True)
     is_published = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # +1 in the database on every UPDATE; keys cached response bodies (routes_blogs._with_revisions)
+    revision = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("revision + 1"))
 
     author = relationship("Author", back_populates="blogs")
     category_obj = relationship("Category", back_populates="blogs")
+    category = synonym("category_obj")  # the name BlogRead exposes
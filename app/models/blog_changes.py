@@ -0,0 +1,18 @@
+# app/models/blog_changes.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.base import Base
+
+class BlogChange(Base):
+    """
+    Append-only log of blog writes behind /api/blogs/changes. `id` is the sync
+    token; deletes leave a tombstone (op="delete"). No FK to blogs, so
+    tombstones outlive the row.
+    """
+    __tablename__ = "blog_changes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    blog_id = Column(Integer, nullable=False, index=True)
+    slug = Column(String(255), nullable=False)
+    op = Column(String(10), nullable=False)  # "upsert" | "delete"
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,16 @@
+# app/models/blog_documents.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.dialects import mysql
+from app.db.base import Base
+
+class BlogDocument(Base):
+    """Serialized BlogRead JSON of a published blog (see app/services/documents.py)."""
+    __tablename__ = "blog_documents"
+
+    slug = Column(String(255), primary_key=True)
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False, unique=True)
+    author_id = Column(Integer, nullable=True, index=True)
+    category_id = Column(Integer, nullable=True, index=True)
+    body = Column(LargeBinary().with_variant(mysql.LONGBLOB(), "mysql"), nullable=False)
+    built_at = Column(DateTime, nullable=False, default=datetime.utcnow)
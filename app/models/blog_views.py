@@ -0,0 +1,11 @@
+# app/models/blog_views.py
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from app.db.base import Base
+
+class BlogViewCount(Base):
+    """Views per blog per UTC day, accumulated by app/services/views.py."""
+    __tablename__ = "blog_view_counts"
+
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(Date, primary_key=True, index=True)
+    views = Column(Integer, nullable=False, default=0)
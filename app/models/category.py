@@ -1,6 +1,6 @@
 # app/models/category.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -13,5 +13,10 @@ class Category(Base):
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # +1 in the database on every UPDATE; keys cached response bodies (routes_blogs._with_revisions)
+    revision = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("revision + 1"))
 
-    blogs = relationship("Blog", back_populates="category_obj", cascade="all, delete-orphan")
+    blogs = relationship(
+        "Blog", back_populates="category_obj", cascade="all, delete-orphan",
+        passive_deletes=True,  # blogs go with ON DELETE CASCADE / app/services/cascade.py
+    )
@@ -0,0 +1,15 @@
+# app/models/dashboard.py
+from sqlalchemy import Column, Integer, String
+from app.db.base import Base
+
+class DashboardStat(Base):
+    """
+    Pre-aggregated counts behind /api/dashboard/stats, kept current by
+    app/services/rollups.py. `bucket` is a month ("2026-10"), a status, an id
+    or "none".
+    """
+    __tablename__ = "dashboard_stats"
+
+    metric = Column(String(32), primary_key=True)    # e.g. "blogs_by_category"
+    bucket = Column(String(32), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,19 @@
+# app/models/job.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.db.base import Base
+
+class Job(Base):
+    """Progress of a long-running background operation (e.g. a cascade delete)."""
+    __tablename__ = "jobs"
+
+    id = Column(String(32), primary_key=True)           # uuid4 hex
+    kind = Column(String(50), nullable=False)           # e.g. "delete_category"
+    target_id = Column(Integer, nullable=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending | running | done | failed
+    total = Column(Integer, nullable=True)
+    done = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
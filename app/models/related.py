@@ -0,0 +1,13 @@
+# app/models/related.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from app.db.base import Base
+
+class BlogRelated(Base):
+    """Precomputed top-k related posts for one blog (see app/services/related.py)."""
+    __tablename__ = "blog_related"
+
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), primary_key=True)
+    # [{"id", "slug", "title", "deck", "banner_img", "score"}, ...] best first
+    related = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
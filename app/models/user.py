@@ -15,11 +15,11 @@ class User(Base):
     is_active = Column(Boolean, default=True)
 
     # 🔐 Role
-    role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
+    role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, index=True)
     role = relationship("Role", back_populates="users")
 
     # 🏢 Department (FIX)
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True, index=True)
     department = relationship("Department", back_populates="users")
 
     # 🔑 password helpers
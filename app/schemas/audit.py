@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class AuditEventRead(BaseModel):
+    id: int
+    entity: str
+    entity_id: int
+    action: Literal["create", "update", "delete"]
+    changes: Optional[Dict[str, Optional[List[Any]]]] = None  # field -> [old, new]; null = not recorded
+    actor_id: Optional[int] = None
+    actor_email: Optional[str] = None
+    route: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AuditPage(BaseModel):
+    items: List[AuditEventRead]
+    next: Optional[int] = None  # pass back as ?before= for the next (older) page
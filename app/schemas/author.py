@@ -27,3 +27,7 @@ class AuthorRead(AuthorBase):
 
     class Config:
         from_attributes = True
+
+class AuthorWithCounts(AuthorRead):
+    posts: int                                  # published blogs
+    latest_post_at: Optional[datetime] = None   # newest published blog
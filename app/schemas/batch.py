@@ -0,0 +1,16 @@
+# app/schemas/batch.py
+from typing import Generic, List, TypeVar
+from pydantic import BaseModel
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+
+class BatchRead(BaseModel, Generic[T, K]):
+    """Found items in the requested order, plus the keys that matched nothing."""
+    items: List[T]
+    missing: List[K]
+
+
+class BatchIds(BaseModel):
+    ids: List[int]
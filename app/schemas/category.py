@@ -23,3 +23,7 @@ class CategoryRead(CategoryBase):
 
     class Config:
         from_attributes = True
+
+class CategoryWithCounts(CategoryRead):
+    posts: int                                  # published blogs
+    latest_post_at: Optional[datetime] = None   # newest published blog
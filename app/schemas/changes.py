@@ -0,0 +1,21 @@
+# app/schemas/changes.py
+from typing import List, Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+from app.schemas.blog import BlogRead
+
+
+class BlogChangeRead(BaseModel):
+    seq: int                         # position in the change log
+    op: Literal["upsert", "delete"]
+    id: int                          # blog id
+    slug: str
+    changed_at: datetime
+    blog: Optional[BlogRead] = None  # current state, for upserts
+
+
+class BlogChangesPage(BaseModel):
+    changes: List[BlogChangeRead]
+    next: str        # pass back as ?since= (or Last-Event-ID)
+    has_more: bool
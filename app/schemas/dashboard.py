@@ -0,0 +1,29 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class CountBucket(BaseModel):
+    key: str  # "YYYY-MM" for months, an id otherwise; "none" when unset
+    count: int
+
+
+class BlogStats(BaseModel):
+    total: int
+    published: int
+    draft: int
+    by_month: List[CountBucket]
+    by_category: List[CountBucket]
+    by_author: List[CountBucket]
+
+
+class UserStats(BaseModel):
+    total: int
+    active: int
+    inactive: int
+    by_role: List[CountBucket]
+    by_department: List[CountBucket]
+
+
+class DashboardStats(BaseModel):
+    blogs: BlogStats
+    users: UserStats
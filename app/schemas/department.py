@@ -19,3 +19,6 @@ class DepartmentRead(DepartmentBase):
 
     class Config:
         from_attributes = True
+
+class DepartmentWithCounts(DepartmentRead):
+    members: int
@@ -0,0 +1,20 @@
+# app/schemas/job.py
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class JobRead(BaseModel):
+    id: str
+    kind: str
+    target_id: Optional[int] = None
+    status: str
+    total: Optional[int] = None
+    done: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,21 @@
+# app/schemas/media.py
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class MediaVariant(BaseModel):
+    width: int
+    height: int
+    format: str
+    url: str
+
+
+class MediaRead(BaseModel):
+    hash: str
+    url: str                      # original; usable as banner_img / img / avatar
+    content_type: str
+    size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[MediaVariant] = []
+    duplicate: bool = False       # True when the same bytes were already stored
@@ -0,0 +1,12 @@
+# app/schemas/related.py
+from typing import Optional
+from pydantic import BaseModel
+
+
+class RelatedBlog(BaseModel):
+    id: int
+    slug: str
+    title: str
+    deck: Optional[str] = None
+    banner_img: Optional[str] = None
+    score: float
@@ -0,0 +1,10 @@
+# app/schemas/suggest.py
+from typing import Literal
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    type: Literal["blog", "author", "category"]
+    id: int
+    label: str
+    slug: str
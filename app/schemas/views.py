@@ -0,0 +1,12 @@
+# app/schemas/views.py
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PopularBlog(BaseModel):
+    id: int
+    slug: str
+    title: str
+    deck: Optional[str] = None
+    banner_img: Optional[str] = None
+    views: int
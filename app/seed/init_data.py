@@ -2,12 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.role import Role
 from app.models.user import User
 from app.models.department import Department
-
-
-def generate_employee_id(db: Session) -> str:
-    last_user = db.query(User).order_by(User.id.desc()).first()
-    next_number = (last_user.id if last_user else 0) + 1
-    return f"AW{str(next_number).zfill(3)}"
+from app.utils.emp_id_generator import generate_employee_id
 
 
 def seed_initial_data(db: Session):
@@ -62,7 +57,6 @@ def seed_initial_data(db: Session):
     # ==========================
     if db.query(User).count() == 0 and admin_role and admin_department:
         admin = User(
-            emp_id=generate_employee_id(db),
             username="admin",
             full_name="Super Admin",
             email="admin@ayatiworks.com",
@@ -72,4 +66,6 @@ def seed_initial_data(db: Session):
         )
         admin.set_password("admin123")
         db.add(admin)
+        db.flush()
+        admin.emp_id = generate_employee_id(admin.id)
         db.commit()
@@ -0,0 +1,173 @@
+# app/serve.py
+"""
+Production entry point.
+
+    python -m app.serve                 # settings from the environment
+    python -m app.serve --workers 4 --port 8080
+    python -m app.serve --print-config  # show the resolved settings and exit
+
+With gunicorn installed (`pip install gunicorn`), it runs a gunicorn master
+with uvicorn workers. The app is imported once in the master
+(`WEB_PRELOAD`), so workers fork warm. Without gunicorn it falls back to
+uvicorn's own process manager, where each worker imports the app itself.
+
+- Workers: `WEB_WORKERS`, or one per CPU this process may run on when 0.
+- Event loop: uvloop and httptools when installed, else asyncio and h11.
+- Timeouts: `WEB_KEEPALIVE_SECONDS` for idle keep-alive connections and
+  `WEB_GRACEFUL_TIMEOUT` for in-flight requests to finish on shutdown.
+  `WEB_WORKER_TIMEOUT` restarts a gunicorn worker that stops responding.
+- Listen backlog: `WEB_BACKLOG`.
+
+Pending migrations (`MIGRATE_ON_STARTUP`) are applied here once, before any
+worker starts. Each worker sizes its threadpool to the DB pool on startup (see
+`size_threadpool` in app/main.py). Every worker has its own pool, so the
+database must accept `workers x (DB_POOL_SIZE + DB_POOL_OVERFLOW)`
+connections.
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+
+from app.core.config import settings
+from app.db.session import pool_capacity, threadpool_size
+
+logger = logging.getLogger("app.serve")
+
+APP = "app.main:app"
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # honours taskset / container CPU sets
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def resolve(args: argparse.Namespace) -> dict:
+    workers = args.workers or settings.WEB_WORKERS or cpu_count()
+    return {
+        "server": "gunicorn" if _installed("gunicorn") else "uvicorn",
+        "host": args.host,
+        "port": args.port,
+        "workers": workers,
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "backlog": settings.WEB_BACKLOG,
+        "keepalive": settings.WEB_KEEPALIVE_SECONDS,
+        "graceful_timeout": settings.WEB_GRACEFUL_TIMEOUT,
+        "worker_timeout": settings.WEB_WORKER_TIMEOUT,
+        "preload": settings.WEB_PRELOAD,
+        "threads_per_worker": threadpool_size(),
+        "db_connections_max": workers * (pool_capacity() or 1),
+    }
+
+
+# ------------------------------
+# gunicorn
+# ------------------------------
+def _post_fork(server, worker) -> None:
+    # Connections opened in the master (preload) must not be shared with workers.
+    from app.db.session import engine
+
+    engine.dispose(close=False)
+
+
+def run_gunicorn(config: dict) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    worker_class = (
+        "uvicorn_worker.UvicornWorker" if _installed("uvicorn_worker") else "uvicorn.workers.UvicornWorker"
+    )
+    options = {
+        "bind": f"{config['host']}:{config['port']}",
+        "workers": config["workers"],
+        "worker_class": worker_class,
+        "backlog": config["backlog"],
+        "keepalive": config["keepalive"],
+        "graceful_timeout": config["graceful_timeout"],
+        "timeout": config["worker_timeout"],
+        "preload_app": config["preload"],
+        "post_fork": _post_fork,
+    }
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+
+            return app
+
+    Server().run()
+
+
+# ------------------------------
+# uvicorn
+# ------------------------------
+def run_uvicorn(config: dict) -> None:
+    import uvicorn
+
+    if config["workers"] > 1:
+        # uvicorn's supervisor spawns fresh interpreters; there is no preload.
+        target = APP
+    else:
+        from app.main import app as target
+
+    uvicorn.run(
+        target,
+        host=config["host"],
+        port=config["port"],
+        workers=config["workers"],
+        loop=config["loop"],
+        http=config["http"],
+        backlog=config["backlog"],
+        timeout_keep_alive=config["keepalive"],
+        timeout_graceful_shutdown=config["graceful_timeout"],
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the API in production mode.")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=0, help="default: WEB_WORKERS, or one per CPU")
+    parser.add_argument("--print-config", action="store_true", help="print the resolved settings and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    config = resolve(args)
+    if args.print_config:
+        for key, value in config.items():
+            print(f"{key:<20} {value}")
+        return 0
+
+    logger.info("Starting %s", ", ".join(f"{k}={v}" for k, v in config.items()))
+    if config["workers"] > 1 and settings.METRICS_ENABLED and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        logger.warning("Several workers without PROMETHEUS_MULTIPROC_DIR: /metrics only shows one worker")
+
+    if settings.MIGRATE_ON_STARTUP:
+        # Once, before forking: the workers' own startup then finds nothing pending
+        # (only MySQL has a lock that would keep them from migrating concurrently).
+        from app.db import migrate
+        from app.db.session import engine
+
+        migrate.upgrade(engine)
+        engine.dispose()
+
+    if config["server"] == "gunicorn":
+        run_gunicorn(config)
+    else:
+        run_uvicorn(config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+# app/services/audit.py
+"""
+Audit trail of admin writes (users, roles, departments, blogs, authors,
+categories), queryable at /api/audit.
+
+A write endpoint takes `diff(obj)` (updates) before anything flushes, or
+`snapshot(obj)` (creates, deletes). Once the commit succeeds, it calls
+`record(...)`. `record` adds the actor (the JWT `sub`/`email`
+from the request's Bearer token, if there is a valid one) and the route. It
+then puts the event on a bounded in-process queue, so the request never waits
+on an INSERT. A background thread drains the queue every `AUDIT_FLUSH_SECONDS`
+(sooner once `AUDIT_BATCH_SIZE` events are waiting) and writes up to
+`AUDIT_BATCH_SIZE` rows per INSERT.
+
+Memory is bounded by `AUDIT_QUEUE_SIZE` events plus the one batch being
+written. When the queue is full, `record` blocks for up to
+`AUDIT_ENQUEUE_TIMEOUT`, so a slow database pushes back on writers. If the
+queue is still full after that, the event is dropped and counted
+(`audit_events_total{outcome="dropped"}`) rather than failing a write that has
+already committed. A batch that fails to insert is retried before anything
+newer. If the retry fails too, its rows are written one at a time, so a row
+the database rejects is logged and dropped instead of holding up the log;
+if the database is unreachable, the rest stay queued for the next flush.
+`stop()` (run at shutdown and at exit) writes out whatever is left.
+
+Values are recorded as `[old, new]`. Password hashes, long-text/JSON/binary
+columns and values over `AUDIT_MAX_VALUE_CHARS` are recorded as changed
+(`null`) without their content.
+"""
+import atexit
+import logging
+import queue
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import JSON, LargeBinary, Text, inspect, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import MANYTOONE
+
+from app.core.config import settings
+from app.core.metrics import AUDIT_EVENTS
+from app.core.request_context import current_route, current_scope
+from app.core.security import decode_access_token
+from app.db.session import engine
+from app.models.audit import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+_REDACTED_FIELDS = {"password_hash"}
+_OPAQUE_TYPES = (Text, JSON, LargeBinary)
+
+_queue: "queue.Queue[dict]" = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+_retry: List[dict] = []
+_flush_lock = threading.Lock()
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: threading.Thread = None
+
+
+# ------------------------------
+# Capturing changes
+# ------------------------------
+def _value(column, value: Any) -> Any:
+    if isinstance(column.type, _OPAQUE_TYPES):
+        return None
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    if isinstance(value, str) and len(value) > settings.AUDIT_MAX_VALUE_CHARS:
+        return None
+    return value
+
+
+def diff(obj) -> Dict[str, Optional[List[Any]]]:
+    """
+    Unflushed column changes on a persistent `obj`, as {field: [old, new]}.
+    Take it before anything flushes the session. A many-to-one reassigned
+    through its relationship (`user.role = role`) is reported under its FK
+    column.
+    """
+    state = inspect(obj)
+    found = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if not history.added and not history.deleted:
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old != new:
+            found[attr.key] = _change(attr, old, new)
+
+    for rel in state.mapper.relationships:
+        if rel.direction is not MANYTOONE or len(rel.local_remote_pairs) != 1:
+            continue
+        history = state.attrs[rel.key].history
+        if not history.added:
+            continue
+        local, remote = rel.local_remote_pairs[0]
+        key = state.mapper.get_property_by_column(local).key
+        target = history.added[0]
+        new = getattr(target, rel.mapper.get_property_by_column(remote).key) if target is not None else None
+        old = state.attrs[key].loaded_value
+        if key not in found and old != new:
+            found[key] = [old, new]
+    return found
+
+
+def _change(attr, old: Any, new: Any) -> Optional[List[Any]]:
+    if attr.key in _REDACTED_FIELDS:
+        return None
+    column = attr.columns[0]
+    old, new = _value(column, old), _value(column, new)
+    return None if old is None and new is None else [old, new]
+
+
+def snapshot(obj) -> Dict[str, Optional[List[Any]]]:
+    """Every loaded, non-null column of `obj` as [None, value]; for creates and deletes."""
+    state = inspect(obj)
+    found = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in state.unloaded:
+            continue
+        value = state.attrs[attr.key].loaded_value
+        if value is None:
+            continue
+        found[attr.key] = _change(attr, None, value)
+    return found
+
+
+def _actor() -> Dict[str, Any]:
+    scope = current_scope()
+    if scope is None:
+        return {}
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return {}
+            claims = decode_access_token(token.strip()) or {}
+            sub = claims.get("sub")
+            return {
+                "actor_id": int(sub) if sub is not None and str(sub).isdigit() else None,
+                "actor_email": claims.get("email"),
+            }
+    return {}
+
+
+# ------------------------------
+# Queue
+# ------------------------------
+def record(entity: str, entity_id: int, action: str, changes: Optional[dict] = None) -> bool:
+    """Queue an event for a committed write; False if it was skipped or dropped."""
+    if not settings.AUDIT_LOG or (action == "update" and not changes):
+        return False  # an update that changed nothing
+    event = {
+        "entity": entity,
+        "entity_id": entity_id,
+        "action": action,
+        "changes": changes or None,
+        "actor_id": None,
+        "actor_email": None,
+        "route": current_route(),
+        "created_at": datetime.utcnow(),
+        **_actor(),
+    }
+    try:
+        _queue.put(event, timeout=settings.AUDIT_ENQUEUE_TIMEOUT)
+    except queue.Full:
+        AUDIT_EVENTS.labels("dropped").inc()
+        logger.warning("Audit queue full; dropped %s %s #%s", action, entity, entity_id)
+        return False
+    AUDIT_EVENTS.labels("queued").inc()
+    if _queue.qsize() >= settings.AUDIT_BATCH_SIZE:
+        _wake.set()
+    return True
+
+
+def _next_batch() -> Tuple[List[dict], bool]:
+    """The next batch to write, and whether it already failed once."""
+    global _retry
+    if _retry:
+        batch, _retry = _retry, []
+        return batch, True
+    batch = []
+    while len(batch) < settings.AUDIT_BATCH_SIZE:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch, False
+
+
+def _insert(rows: List[dict]) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(AuditEvent), rows)
+
+
+def _insert_each(rows: List[dict]) -> int:
+    """
+    Write a batch that failed twice one row at a time; returns the number
+    written. A row the database rejects is dropped. If the database is
+    unreachable, the rows from there on go back to `_retry`.
+    """
+    global _retry
+    written = 0
+    for i, row in enumerate(rows):
+        try:
+            _insert([row])
+        except OperationalError:
+            logger.exception("Audit database unavailable; keeping %d events for the next flush", len(rows) - i)
+            _retry = rows[i:]
+            break
+        except Exception:
+            logger.exception(
+                "Dropping audit event %s %s #%s: the database rejects it",
+                row["action"], row["entity"], row["entity_id"],
+            )
+            AUDIT_EVENTS.labels("dropped").inc()
+            continue
+        written += 1
+    AUDIT_EVENTS.labels("written").inc(written)
+    return written
+
+
+def flush() -> int:
+    """Write queued events in batches; returns the number written."""
+    global _retry
+    written = 0
+    with _flush_lock:
+        while True:
+            batch, retried = _next_batch()
+            if not batch:
+                return written
+            try:
+                _insert(batch)
+            except Exception:
+                AUDIT_EVENTS.labels("failed").inc(len(batch))
+                if not retried:
+                    logger.exception("Writing %d audit events failed; retrying them first next time", len(batch))
+                    _retry = batch
+                    return written
+                logger.exception("Retrying %d audit events failed; writing them one at a time", len(batch))
+                written += _insert_each(batch)
+                if _retry:
+                    return written
+                continue
+            AUDIT_EVENTS.labels("written").inc(len(batch))
+            written += len(batch)
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        _wake.wait(settings.AUDIT_FLUSH_SECONDS)
+        _wake.clear()
+        flush()
+
+
+def start() -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="audit-flush", daemon=True)
+    _thread.start()
+    atexit.unregister(stop)  # once, however often the app starts
+    atexit.register(stop)
+
+
+def stop() -> None:
+    """Stop the writer and flush anything still queued."""
+    _stop.set()
+    _wake.set()
+    if _thread is not None and _thread is not threading.current_thread():
+        _thread.join(timeout=settings.AUDIT_FLUSH_SECONDS + 5)
+    flush()
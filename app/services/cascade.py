@@ -0,0 +1,140 @@
+# app/services/cascade.py
+"""
+Set-based cascade deletes for authors and categories.
+
+Deleting an owner never loads its blogs into a session. Blog ids are read in
+batches of `CASCADE_BATCH_SIZE` and deleted with `DELETE ... WHERE id IN`
+(together with the rows that hang off each blog), one transaction per batch,
+so memory stays flat and locks stay short whatever the size of the cascade.
+The owner row itself goes last. The FKs also carry `ON DELETE CASCADE`, but
+the explicit deletes keep SQLite (foreign keys off by default) and databases
+created before those constraints correct.
+
+`start_job` + `run_job` do the same work after the response has been sent and
+record progress in `jobs`, readable at `GET /api/jobs/{id}`.
+"""
+import logging
+import uuid
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, func, select, update
+
+from app.core import cache
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.author import Author
+from app.models.blog import Blog
+from app.models.blog_documents import BlogDocument
+from app.models.blog_views import BlogViewCount
+from app.models.category import Category
+from app.models.job import Job
+from app.models.related import BlogRelated
+from app.services import audit, changes, related, rollups, suggest
+
+logger = logging.getLogger(__name__)
+
+# kind -> (owner model, blog foreign key)
+OWNERS = {
+    "author": (Author, Blog.author_id),
+    "category": (Category, Blog.category_id),
+}
+
+# Tables keyed by blog id that must go before the blog itself.
+BLOG_DEPENDENTS = [
+    (BlogRelated.__table__, BlogRelated.blog_id),
+    (BlogViewCount.__table__, BlogViewCount.blog_id),
+    (BlogDocument.__table__, BlogDocument.blog_id),
+]
+
+# Past this many removed blogs a full related-posts rebuild beats per-blog updates.
+RELATED_REBUILD_THRESHOLD = 200
+
+
+def count_blogs(db, kind: str, owner_id: int) -> int:
+    _, fk = OWNERS[kind]
+    return db.execute(select(func.count()).select_from(Blog).where(fk == owner_id)).scalar_one()
+
+
+def delete_owner(kind: str, owner_id: int, progress: Optional[Callable[[int], None]] = None) -> List[int]:
+    """Delete an author/category and all its blogs; returns the removed blog ids."""
+    model, fk = OWNERS[kind]
+    removed: List[int] = []
+    db = SessionLocal()
+    try:
+        while True:
+            batch = db.execute(
+                select(Blog.id, Blog.slug, Blog.is_published, Blog.created_at, Blog.category_id, Blog.author_id)
+                .where(fk == owner_id).order_by(Blog.id).limit(settings.CASCADE_BATCH_SIZE)
+            ).all()
+            if not batch:
+                break
+            ids = [row.id for row in batch]
+            changes.record(db, batch, "delete")
+            rollups.apply(db, removed=[b for row in batch for b in rollups.blog_buckets(row)])
+            for table, blog_id in BLOG_DEPENDENTS:
+                db.execute(delete(table).where(blog_id.in_(ids)))
+            db.execute(delete(Blog).where(Blog.id.in_(ids)))
+            db.commit()
+            removed.extend(ids)
+            if progress is not None:
+                progress(len(removed))
+        db.execute(delete(model).where(model.id == owner_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    audit.record(kind, owner_id, "delete", {"blogs": [len(removed), 0]})
+    return removed
+
+
+def reindex(kind: str, owner_id: int, removed: List[int]) -> None:
+    """Bring the related-posts and typeahead indexes up to date after a cascade."""
+    if settings.RELATED_ENABLED and removed:
+        if len(removed) > RELATED_REBUILD_THRESHOLD:
+            related.rebuild_in_background()
+        else:
+            related.refresh(removed)
+    suggest.remove(kind, [owner_id])
+    suggest.remove("blog", removed)
+
+
+# ------------------------------
+# Background jobs
+# ------------------------------
+def start_job(db, kind: str, owner_id: int) -> Job:
+    job = Job(
+        id=uuid.uuid4().hex,
+        kind=f"delete_{kind}",
+        target_id=owner_id,
+        status="pending",
+        total=count_blogs(db, kind, owner_id),
+        done=0,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def _update_job(job_id: str, **values) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(update(Job).where(Job.id == job_id).values(updated_at=datetime.utcnow(), **values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_job(job_id: str, kind: str, owner_id: int) -> None:
+    _update_job(job_id, status="running")
+    try:
+        removed = delete_owner(kind, owner_id, progress=lambda done: _update_job(job_id, done=done))
+    except Exception as exc:
+        logger.exception("Cascade delete of %s %s failed", kind, owner_id)
+        _update_job(job_id, status="failed", error=str(exc)[:2000], finished_at=datetime.utcnow())
+        return
+    cache.invalidate(f"{kind}:{owner_id}", "blogs:list")
+    _update_job(job_id, status="done", done=len(removed), finished_at=datetime.utcnow())
+    reindex(kind, owner_id, removed)
@@ -0,0 +1,203 @@
+# app/services/changes.py
+"""
+Blog change log behind `/api/blogs/changes` and its SSE stream.
+
+Every blog write appends a row to `blog_changes` in the same transaction as
+the write (tombstones for deletes, one row per affected blog when an author
+or category changes), so the log can never disagree with `blogs`. The sync
+token is the log id.
+
+Ids are handed out at insert time but transactions commit in any order, so
+a just-written id may still be invisible while a later one is not. The token
+therefore only advances over rows older than `CHANGES_SETTLE_SECONDS`;
+younger rows are returned but may be returned again on the next call.
+Clients apply changes idempotently (upsert by id, delete by id).
+
+`changed_at` is the app clock when the write called `record()`, not its
+commit time. A transaction that stays open longer than the settle window
+after that, typically because it waits on a row lock, can commit an id
+below a token already handed out, and clients following that token never
+see it. The window therefore defaults to the server databases' lock wait
+timeout plus a margin (`DB_LOCK_WAIT_SECONDS`, applied per connection in
+app/db/session.py); raise both together. SQLite is not affected: its single
+writer allocates ids and commits in the same order.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.orm import Session, joinedload
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.blog import Blog
+from app.models.blog_changes import BlogChange
+from app.schemas.changes import BlogChangesPage
+
+
+def record(db: Session, blogs: Iterable, op: str) -> None:
+    """Log `op` for each (already flushed) blog; commit with the write itself."""
+    now = datetime.utcnow()
+    for blog in blogs:
+        db.add(BlogChange(blog_id=blog.id, slug=blog.slug, op=op, changed_at=now))
+
+
+def record_where(db: Session, condition, op: str = "upsert") -> None:
+    """Log `op` for every blog matching `condition` with one INSERT ... SELECT."""
+    rows = select(Blog.id, Blog.slug, literal(op), literal(datetime.utcnow())).where(condition)
+    db.execute(
+        insert(BlogChange).from_select(
+            [BlogChange.blog_id, BlogChange.slug, BlogChange.op, BlogChange.changed_at], rows
+        )
+    )
+
+
+def read(db: Session, since: Optional[int], limit: int) -> BlogChangesPage:
+    """
+    Changes after token `since`, oldest first, at most one per blog (its
+    latest). Without a token, returns no changes and the current head token.
+    """
+    settled = datetime.utcnow() - timedelta(seconds=settings.CHANGES_SETTLE_SECONDS)
+    if since is None:
+        head = db.execute(
+            select(func.max(BlogChange.id)).where(BlogChange.changed_at < settled)
+        ).scalar()
+        return BlogChangesPage(changes=[], next=str(head or 0), has_more=False)
+
+    rows = db.execute(
+        select(BlogChange).where(BlogChange.id > since).order_by(BlogChange.id).limit(limit + 1)
+    ).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    token = since
+    for row in rows:
+        if row.changed_at >= settled:
+            break
+        token = row.id
+
+    latest = {}
+    for row in rows:
+        latest.pop(row.blog_id, None)
+        latest[row.blog_id] = row
+    upserts = [r.blog_id for r in latest.values() if r.op == "upsert"]
+    blogs = {}
+    if upserts:
+        blogs = {
+            b.id: b
+            for b in db.query(Blog)
+            .options(joinedload(Blog.author), joinedload(Blog.category_obj))
+            .filter(Blog.id.in_(upserts))
+        }
+
+    changes = []
+    for row in latest.values():
+        if row.op == "upsert" and row.blog_id not in blogs:
+            continue  # deleted since; its tombstone follows
+        changes.append({
+            "seq": row.id, "op": row.op, "id": row.blog_id, "slug": row.slug,
+            "changed_at": row.changed_at, "blog": blogs.get(row.blog_id),
+        })
+    return BlogChangesPage.model_validate({"changes": changes, "next": str(token), "has_more": has_more})
+
+
+def read_page(since: Optional[int], limit: int) -> BlogChangesPage:
+    db = SessionLocal()
+    try:
+        return read(db, since, limit)
+    finally:
+        db.close()
+
+
+def _head() -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(BlogChange.id))).scalar() or 0
+
+
+class ChangeWatcher:
+    """
+    One poller per process, shared by every open stream: it reads the log
+    head every `CHANGES_POLL_SECONDS` while anyone is listening and wakes the
+    streams when it moves.
+    """
+
+    def __init__(self) -> None:
+        self.head = 0
+        self.listeners = 0
+        self._moved: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _poll(self) -> None:
+        try:
+            while self.listeners:
+                head = await run_in_threadpool(_head)
+                if head != self.head:
+                    self.head = head
+                    moved, self._moved = self._moved, asyncio.Event()
+                    moved.set()
+                await asyncio.sleep(settings.CHANGES_POLL_SECONDS)
+        finally:
+            self._task = None
+
+    async def wait(self, beyond: int, timeout: float) -> bool:
+        """True once the head passes `beyond`; False after `timeout`."""
+        if self.head > beyond:
+            return True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self.listeners += 1
+        if self._moved is None:
+            self._moved = asyncio.Event()
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll())
+        try:
+            while self.head <= beyond:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(self._moved.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return False
+            return True
+        finally:
+            self.listeners -= 1
+
+
+watcher = ChangeWatcher()
+
+
+def _until_settled(page: BlogChangesPage, since: int) -> float:
+    """Seconds until the oldest row past `since` in `page` settles and the token can move."""
+    pending = [c.changed_at for c in page.changes if c.seq > since]
+    if not pending:
+        return settings.CHANGES_POLL_SECONDS
+    settles = min(pending) + timedelta(seconds=settings.CHANGES_SETTLE_SECONDS)
+    return max(0.0, (settles - datetime.utcnow()).total_seconds())
+
+
+async def stream(request, since: Optional[int]):
+    """Server-Sent Events: one `changes` event per batch, id = resume token."""
+    if since is None:
+        since = int((await run_in_threadpool(read_page, None, 0)).next)
+    sent: set = set()
+    yield f"retry: {settings.CHANGES_SSE_RETRY_MS}\n\n"
+    while not await request.is_disconnected():
+        page = await run_in_threadpool(read_page, since, settings.CHANGES_PAGE_SIZE)
+        fresh = [c for c in page.changes if c.seq not in sent]
+        if fresh:
+            data = BlogChangesPage(changes=fresh, next=page.next, has_more=page.has_more).model_dump_json()
+            yield f"id: {page.next}\nevent: changes\ndata: {data}\n\n"
+            sent.update(c.seq for c in fresh)
+        advanced, since = int(page.next) > since, int(page.next)
+        sent = {seq for seq in sent if seq > since}
+        if page.has_more:
+            if not (fresh or advanced):
+                # A full page of rows already sent but not yet settled: the head is
+                # past them, so watcher.wait() would return at once. Sleep instead.
+                await asyncio.sleep(_until_settled(page, since))
+            continue
+        if not await watcher.wait(max(sent, default=since), settings.CHANGES_HEARTBEAT_SECONDS):
+            yield ": keepalive\n\n"
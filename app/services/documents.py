@@ -0,0 +1,186 @@
+# app/services/documents.py
+"""
+Materialized read model for blog detail pages.
+
+`blog_documents` holds the exact `BlogRead` JSON of every published blog,
+keyed by slug, so `get_blog` answers with one primary-key lookup and no ORM
+or Pydantic work.
+
+- Blog writes call `write()` inside their own transaction, so the document
+  commits (or rolls back) with the blog.
+- Author and category edits `drop()` the documents embedding them in the
+  same transaction; until `rebuild_missing()` (run in the background after
+  the commit) re-renders them, those blogs are served by the regular path.
+- Renders take a shared lock on the blog, author and category rows they
+  embed, so a concurrent edit either waits for the document to commit (and
+  then replaces or drops it) or commits first and is seen by the render.
+
+Documents missing for any reason (new table, failed rebuild) are filled in
+at startup, or by hand:
+
+    python -m app.services.documents rebuild
+"""
+import logging
+import sys
+import threading
+from datetime import datetime
+from typing import Iterable, List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+
+from app.db.session import SessionLocal
+from app.models.author import Author
+from app.models.blog import Blog
+from app.models.blog_documents import BlogDocument
+from app.models.category import Category
+from app.schemas.blog import BlogRead
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+_rebuilding = threading.Lock()
+
+
+def render(blog: Blog) -> bytes:
+    return BlogRead.model_validate(blog).model_dump_json().encode()
+
+
+def _lock_owners(db: Session, blogs: List[Blog]) -> list:
+    """
+    Share-lock (and reload) the authors and categories `blogs` embed. Hold on
+    to the result while rendering: the identity map only keeps weak references,
+    and the blogs' lazy loads are answered from it.
+    """
+    author_ids = {b.author_id for b in blogs if b.author_id is not None}
+    category_ids = {b.category_id for b in blogs if b.category_id is not None}
+    owners = []
+    if author_ids:
+        owners += db.query(Author).filter(Author.id.in_(author_ids)).with_for_update(read=True).populate_existing().all()
+    if category_ids:
+        owners += db.query(Category).filter(Category.id.in_(category_ids)).with_for_update(read=True).populate_existing().all()
+    return owners
+
+
+def _rows(blogs: Iterable[Blog]) -> List[dict]:
+    now = datetime.utcnow()
+    return [
+        {
+            "slug": b.slug, "blog_id": b.id, "author_id": b.author_id, "category_id": b.category_id,
+            "body": render(b), "built_at": now,
+        }
+        for b in blogs
+    ]
+
+
+def write(db: Session, blogs: List[Blog]) -> None:
+    """Re-render `blogs` (flushed, in the caller's transaction) and replace their documents."""
+    db.flush()
+    owners = _lock_owners(db, blogs)  # noqa: F841 (kept alive for the render)
+    ids = [b.id for b in blogs]
+    db.execute(delete(BlogDocument).where(BlogDocument.blog_id.in_(ids)))
+    rows = _rows(b for b in blogs if b.is_published)
+    if rows:
+        db.execute(insert(BlogDocument), rows)
+
+
+def drop(db: Session, condition) -> None:
+    """Delete documents matching `condition`; pair with `rebuild_missing()` after commit."""
+    db.execute(delete(BlogDocument).where(condition))
+
+
+def rebuild_missing() -> int:
+    """Render documents for published blogs that have none; returns how many."""
+    built = 0
+    after = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = db.execute(
+                select(Blog.id)
+                .outerjoin(BlogDocument, BlogDocument.blog_id == Blog.id)
+                .where(Blog.is_published.is_(True), BlogDocument.blog_id.is_(None), Blog.id > after)
+                .order_by(Blog.id)
+                .limit(BATCH_SIZE)
+            ).scalars().all()
+            if not ids:
+                return built
+            after = ids[-1]
+            blogs = (
+                db.query(Blog)
+                .options(joinedload(Blog.author), joinedload(Blog.category_obj))
+                .filter(Blog.id.in_(ids), Blog.is_published.is_(True))
+                .with_for_update(read=True, of=Blog)
+                .all()
+            )
+            _lock_owners(db, blogs)
+            try:
+                db.execute(insert(BlogDocument), _rows(blogs))
+                db.commit()
+                built += len(blogs)
+            except IntegrityError:
+                # A blog write rendered some of these meanwhile; its copy wins.
+                db.rollback()
+                built += _insert_one_by_one(db, ids)
+            db.expunge_all()
+    finally:
+        db.close()
+
+
+def _insert_one_by_one(db: Session, ids: List[int]) -> int:
+    built = 0
+    for blog_id in ids:
+        blog = (
+            db.query(Blog)
+            .options(joinedload(Blog.author), joinedload(Blog.category_obj))
+            .filter(Blog.id == blog_id)
+            .with_for_update(read=True, of=Blog)
+            .populate_existing()
+            .first()
+        )
+        if blog is None or not blog.is_published:
+            continue
+        try:
+            _lock_owners(db, [blog])
+            db.execute(insert(BlogDocument), _rows([blog]))
+            db.commit()
+            built += 1
+        except IntegrityError:
+            db.rollback()
+    return built
+
+
+def rebuild_missing_in_background() -> None:
+    if not _rebuilding.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            built = rebuild_missing()
+            if built:
+                logger.info("Rendered %d blog documents", built)
+        except Exception:
+            logger.exception("Blog document rebuild failed")
+        finally:
+            _rebuilding.release()
+
+    threading.Thread(target=run, name="blog-documents", daemon=True).start()
+
+
+def rebuild_all() -> int:
+    db = SessionLocal()
+    try:
+        db.execute(delete(BlogDocument))
+        db.commit()
+    finally:
+        db.close()
+    return rebuild_missing()
+
+
+if __name__ == "__main__":
+    import app.db.all_models  # noqa: F401
+
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m app.services.documents rebuild")
+    print(f"Rendered {rebuild_all()} blog documents")
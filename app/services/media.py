@@ -0,0 +1,356 @@
+# app/services/media.py
+"""
+Content-addressed media storage.
+
+Uploads are parsed straight off the request body (`multipart_file`) and
+written to a temp file while being hashed, so `MEDIA_MAX_BYTES` is enforced
+as the bytes arrive. The file is then moved to
+`MEDIA_ROOT/<aa>/<bb>/<sha256>.<ext>`; an upload whose hash is already
+stored is discarded, so the same banner uploaded twice costs one file.
+
+Resized WebP variants are generated in a process pool (Pillow is CPU-bound
+and would otherwise hold the GIL against request threads) and described in a
+`<sha256>.json` sidecar that later duplicate uploads reuse. Bytes Pillow
+cannot decode (unknown, truncated or corrupt images) are rejected with 422;
+any other failure returns 500. Either way the original is removed again
+unless a sidecar for it exists, so nothing is left behind half-processed.
+"""
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.exceptions import FormParserError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.exceptions import FormParserError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.config import settings
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:  # optional dependency; originals are still stored
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# What Pillow raises from open()/load() for bytes it can't decode: unknown
+# formats, decompression bombs, and OSError/SyntaxError for truncated or
+# corrupt data.
+_DECODE_ERRORS = (
+    (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) if Image is not None else ()
+)
+
+SNIFF_BYTES = 12  # enough for every signature below
+# Room for the boundary and part headers around the file in a multipart body.
+MULTIPART_OVERHEAD = 64 * 1024
+
+ALLOWED_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+
+_MAGIC = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class MediaError(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class UndecodableImage(Exception):
+    """Raised by `generate_variants` (in a worker) when Pillow can't decode the file."""
+
+
+def _allowed_type(head: bytes) -> str:
+    content_type = sniff_type(head)
+    if content_type is None or content_type not in ALLOWED_TYPES:
+        raise MediaError(415, "Unsupported image type")
+    return content_type
+
+
+def sniff_type(head: bytes) -> Optional[str]:
+    for magic, content_type in _MAGIC:
+        if head.startswith(magic):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def relative_dir(digest: str) -> str:
+    return os.path.join(digest[:2], digest[2:4])
+
+
+def _meta_path(digest: str) -> str:
+    return os.path.join(settings.MEDIA_ROOT, relative_dir(digest), f"{digest}.json")
+
+
+# ------------------------------
+# Variant generation (runs in worker processes)
+# ------------------------------
+def generate_variants(path: str, digest: str, widths: Tuple[int, ...], quality: int) -> dict:
+    """Write WebP variants next to `path`; returns the metadata sidecar dict."""
+    meta = {"width": None, "height": None, "variants": []}
+    if Image is None:
+        return meta
+
+    directory = os.path.dirname(path)
+    try:
+        img = Image.open(path)
+        img.load()  # decode everything now, so truncated data fails here and not mid-resize
+    except _DECODE_ERRORS as exc:
+        raise UndecodableImage(str(exc)) from None
+    with img:
+        img = ImageOps.exif_transpose(img)
+        meta["width"], meta["height"] = img.size
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        targets = sorted({w for w in widths if w < img.width} | {img.width})
+        for width in targets:
+            name = f"{digest}-{width}w.webp"
+            variant = img if width == img.width else img.resize(
+                (width, max(1, round(img.height * width / img.width))), Image.LANCZOS
+            )
+            variant.save(os.path.join(directory, name), "WEBP", quality=quality, method=4)
+            meta["variants"].append({
+                "width": width,
+                "height": variant.height,
+                "format": "webp",
+                "file": name,
+            })
+    return meta
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a threaded server process is not safe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.MEDIA_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+
+
+# ------------------------------
+# Upload pipeline
+# ------------------------------
+def check_length(content_length: Optional[str]) -> None:
+    """Refuse a body whose declared size can't fit under MEDIA_MAX_BYTES before reading it."""
+    if content_length and content_length.isdigit():
+        if int(content_length) > settings.MEDIA_MAX_BYTES + MULTIPART_OVERHEAD:
+            raise MediaError(413, "File too large")
+
+
+async def multipart_file(request, field: str) -> AsyncIterator[bytes]:
+    """
+    Yield the bytes of the `field` file part as they come off the request body.
+    Starlette's form parsing would first spool the whole body to a temp file.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise MediaError(400, "Expected multipart/form-data")
+
+    state = {"header": b"", "value": b"", "disposition": b"", "target": False, "done": False, "found": False}
+    pending: List[bytes] = []
+
+    def on_part_begin():
+        state.update(disposition=b"", target=False)
+
+    def on_header_field(data, start, end):
+        state["header"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        if state["header"].lower() == b"content-disposition":
+            state["disposition"] = state["value"]
+        state.update(header=b"", value=b"")
+
+    def on_headers_finished():
+        _, options = parse_options_header(state["disposition"])
+        if options.get(b"name") == field.encode() and b"filename" in options and not state["found"]:
+            state.update(target=True, found=True)
+
+    def on_part_data(data, start, end):
+        if state["target"]:
+            pending.append(bytes(data[start:end]))
+
+    def on_part_end():
+        if state["target"]:
+            state["done"] = True
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    async for chunk in request.stream():
+        try:
+            parser.write(chunk)
+        except FormParserError:
+            raise MediaError(400, "Malformed multipart body")
+        for data in pending:
+            yield data
+        pending.clear()
+        if state["done"]:
+            return  # the rest of the body is not needed
+    if not state["found"]:
+        raise MediaError(422, f"Missing file field '{field}'")
+    raise MediaError(400, "Malformed multipart body")  # body ended mid-file
+
+
+async def store_upload(chunks: AsyncIterator[bytes]) -> dict:
+    """
+    Write an upload's bytes into content-addressed storage as they arrive and
+    make sure its variants exist. Returns the metadata dict (paths relative to
+    MEDIA_ROOT).
+    """
+    tmp_dir = os.path.join(settings.MEDIA_ROOT, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    hasher = hashlib.sha256()
+    size = 0
+    head = b""
+    content_type = None
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > settings.MEDIA_MAX_BYTES:
+                    raise MediaError(413, "File too large")
+                if content_type is None:
+                    head += chunk
+                    if len(head) >= SNIFF_BYTES:
+                        content_type = _allowed_type(head)
+                hasher.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+        if content_type is None:
+            content_type = _allowed_type(head)
+
+        digest = hasher.hexdigest()
+        filename = f"{digest}.{ALLOWED_TYPES[content_type]}"
+        directory = os.path.join(settings.MEDIA_ROOT, relative_dir(digest))
+        final_path = os.path.join(directory, filename)
+        os.makedirs(directory, exist_ok=True)
+        duplicate = os.path.exists(final_path)
+        if duplicate:
+            os.unlink(tmp_path)
+        else:
+            os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    meta = _load_meta(digest) if duplicate else None
+    if meta is None:
+        try:
+            meta = await _run_variants(final_path, digest)
+        except BaseException:
+            # Leave nothing without a sidecar behind; a concurrent upload of
+            # the same bytes that succeeded keeps its file.
+            if _load_meta(digest) is None:
+                _discard(final_path, digest)
+            raise
+        meta.update({"hash": digest, "file": filename, "content_type": content_type, "size": size})
+        _save_meta(digest, meta)
+    meta["duplicate"] = duplicate
+    return meta
+
+
+def _discard(path: str, digest: str) -> None:
+    """Remove an original and any variants already written for it."""
+    directory = os.path.dirname(path)
+    for name in glob.glob(os.path.join(glob.escape(directory), f"{digest}-*w.webp")) + [path]:
+        try:
+            os.unlink(name)
+        except FileNotFoundError:
+            pass
+
+
+async def _run_variants(path: str, digest: str) -> dict:
+    global _pool
+    widths = tuple(settings.MEDIA_VARIANT_WIDTHS)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _process_pool(), generate_variants, path, digest, widths, settings.MEDIA_WEBP_QUALITY
+        )
+    except UndecodableImage as exc:
+        logger.info("Rejected undecodable upload %s: %s", digest, exc)
+        raise MediaError(422, "Image could not be decoded")
+    except BrokenProcessPool:
+        logger.exception("Media worker pool died while processing %s", digest)
+        _pool = None  # a broken pool rejects all later work; start a fresh one next time
+        raise MediaError(500, "Image processing failed; please retry")
+    except Exception:
+        # Infrastructure trouble (I/O, pickling, ...): the next upload of the
+        # same bytes tries again.
+        logger.exception("Generating variants for %s failed", digest)
+        raise MediaError(500, "Image processing failed; please retry")
+
+
+def _load_meta(digest: str) -> Optional[dict]:
+    try:
+        with open(_meta_path(digest)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_meta(digest: str, meta: dict) -> None:
+    path = _meta_path(digest)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh)
+    os.replace(tmp, path)
+
+
+def public_url(base_url: str, digest: str, filename: str) -> str:
+    return f"{base_url.rstrip('/')}/{digest[:2]}/{digest[2:4]}/{filename}"
+
+
+def load(digest: str) -> Optional[dict]:
+    if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+        return None
+    return _load_meta(digest)
+
@@ -0,0 +1,403 @@
+# app/services/related.py
+"""
+Related-posts index.
+
+Published blogs are embedded as L2-normalised TF-IDF vectors over title
+(weighted x3), deck (x2) and content, using the `RELATED_MAX_FEATURES` most
+common terms. Similarity is the dot product plus a boost for a shared
+category and a shared author. Each blog's top-k neighbours are written to
+`blog_related` together with the few fields a "related articles" card shows,
+so serving them is a single key lookup.
+
+Each worker keeps the index in memory. `start()` builds it at startup on a
+background thread, off the request threadpool, and stores lists only for
+blogs that have none yet. After that it is caught up incrementally:
+`refresh()` picks up every blog updated since the last pass (including
+writes made by other workers), re-embeds it, and rewrites only the neighbour
+lists that change.
+
+`refresh()` never waits. It runs after a write as a BackgroundTask, which
+holds a threadpool token, so if a pass or the startup build is already
+running it leaves the work for that one and returns at once. Big changes
+(mass deletes) go through `rebuild_in_background()`, which coalesces
+requests onto a single thread. Vocabulary and IDF weights are fixed at
+build time, so run a full rebuild periodically:
+
+    python -m app.services.related rebuild
+"""
+import logging
+import math
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.blog import Blog
+from app.models.related import BlogRelated
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]{2,}")
+_TAG = re.compile(r"<[^>]+>")
+STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has have how its "
+    "may new now see two who did get him his let say she too use that with this from "
+    "they will what when your more also into than then them some such only just over "
+    "about which their there these those would could should been were being each".split()
+)
+# Blogs re-read from the DB slightly before the watermark, to tolerate clock
+# skew between workers; re-embedding an unchanged blog is harmless.
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+_COLUMNS = (
+    Blog.id, Blog.slug, Blog.title, Blog.deck, Blog.content, Blog.banner_img,
+    Blog.category_id, Blog.author_id, Blog.is_published, Blog.updated_at,
+)
+
+
+def tokens(title: Optional[str], deck: Optional[str], content: Optional[str]) -> List[str]:
+    def words(text: Optional[str]) -> List[str]:
+        if not text:
+            return []
+        return [t for t in _TOKEN.findall(_TAG.sub(" ", text).lower()) if t not in STOPWORDS]
+
+    return words(title) * 3 + words(deck) * 2 + words(content)
+
+
+class RelatedIndex:
+    def __init__(self, max_features: int, top_k: int, category_boost: float, author_boost: float) -> None:
+        self.max_features = max_features
+        self.top_k = top_k
+        self.category_boost = category_boost
+        self.author_boost = author_boost
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.size = 0
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.categories = np.zeros(0, dtype=np.int64)
+        self.authors = np.zeros(0, dtype=np.int64)
+        self.row_of: Dict[int, int] = {}
+        self.cards: Dict[int, dict] = {}
+        self.neighbours: Dict[int, List[Tuple[int, float]]] = {}
+        self.watermark: Optional[datetime] = None
+
+    # ------------------------------
+    # Vectors
+    # ------------------------------
+    def _fit(self, docs: List[List[str]]) -> None:
+        df = Counter()
+        for doc in docs:
+            df.update(set(doc))
+        n = max(1, len(docs))
+        # Terms in nearly every post say nothing about relatedness.
+        candidates = [(c, t) for t, c in df.items() if c <= max(2, 0.6 * n)]
+        candidates.sort(key=lambda ct: (-ct[0], ct[1]))
+        terms = [t for _, t in candidates[: self.max_features]]
+        self.vocabulary = {t: i for i, t in enumerate(terms)}
+        self.idf = np.array(
+            [math.log((1 + n) / (1 + df[t])) + 1.0 for t in terms], dtype=np.float32
+        )
+
+    def _vector(self, doc: List[str]) -> np.ndarray:
+        vec = np.zeros(len(self.vocabulary), dtype=np.float32)
+        counts = Counter(t for t in doc if t in self.vocabulary)
+        if counts:
+            cols = np.fromiter((self.vocabulary[t] for t in counts), dtype=np.int64, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            vec[cols] = (1.0 + np.log(tf)) * self.idf[cols]
+            norm = np.linalg.norm(vec)
+            if norm:
+                vec /= norm
+        return vec
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= self.matrix.shape[0]:
+            return
+        capacity = max(rows, int(self.matrix.shape[0] * 1.5) + 64)
+        grown = np.zeros((capacity, len(self.vocabulary)), dtype=np.float32)
+        grown[: self.size] = self.matrix[: self.size]
+        self.matrix = grown
+        for name in ("ids", "categories", "authors"):
+            old = getattr(self, name)
+            new = np.full(capacity, -1, dtype=np.int64)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def _scores(self, rows: slice) -> np.ndarray:
+        """Similarity of the rows in `rows` against every indexed blog."""
+        live = slice(0, self.size)
+        sims = self.matrix[rows] @ self.matrix[live].T
+        cats, auths = self.categories[rows, None], self.authors[rows, None]
+        sims += self.category_boost * ((cats == self.categories[None, live]) & (cats >= 0))
+        sims += self.author_boost * ((auths == self.authors[None, live]) & (auths >= 0))
+        sims[:, self.ids[live] < 0] = -np.inf  # removed blogs
+        return sims
+
+    def _top(self, row: int, scores: np.ndarray) -> List[Tuple[int, float]]:
+        scores = scores.copy()
+        scores[row] = -np.inf
+        k = min(self.top_k, max(0, self.size - 1))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(self.ids[i]), float(scores[i])) for i in best if np.isfinite(scores[i]) and scores[i] > 0]
+
+    # ------------------------------
+    # Build / update
+    # ------------------------------
+    def build(self, rows: List) -> None:
+        rows = [r for r in rows if r.is_published]
+        docs = [tokens(r.title, r.deck, r.content) for r in rows]
+        self._fit(docs)
+        self.size = 0
+        self.matrix = np.zeros((0, len(self.vocabulary)), dtype=np.float32)
+        self._ensure_capacity(len(rows))
+        self.row_of, self.cards = {}, {}
+        for i, (r, doc) in enumerate(zip(rows, docs)):
+            self._place(i, r, doc)
+        self.size = len(rows)
+
+        self.neighbours = {}
+        block = max(1, (1 << 24) // max(1, self.size))  # ~64 MB of scores per block
+        for start in range(0, self.size, block):
+            stop = min(self.size, start + block)
+            scores = self._scores(slice(start, stop))
+            for offset in range(stop - start):
+                self.neighbours[int(self.ids[start + offset])] = self._top(start + offset, scores[offset])
+        self.watermark = max((r.updated_at for r in rows if r.updated_at), default=None)
+
+    def _place(self, row: int, r, doc: List[str]) -> None:
+        self.matrix[row] = self._vector(doc)
+        self.ids[row] = r.id
+        self.categories[row] = r.category_id if r.category_id is not None else -1
+        self.authors[row] = r.author_id if r.author_id is not None else -1
+        self.row_of[r.id] = row
+        self.cards[r.id] = {
+            "id": r.id, "slug": r.slug, "title": r.title, "deck": r.deck, "banner_img": r.banner_img,
+        }
+
+    def upsert(self, r) -> set:
+        """Index one blog; returns the ids whose neighbour lists changed."""
+        if not r.is_published:
+            return self.remove(r.id)
+        row = self.row_of.get(r.id)
+        if row is None:
+            self._ensure_capacity(self.size + 1)
+            row = self.size
+            self.size += 1
+        self._place(row, r, tokens(r.title, r.deck, r.content))
+
+        scores = self._scores(slice(row, row + 1))[0]
+        changed = {r.id}
+        self.neighbours[r.id] = self._top(row, scores)
+
+        # Fold the new scores into everyone else's lists.
+        for other_row in np.nonzero(np.isfinite(scores) & (scores > 0))[0]:
+            other = int(self.ids[other_row])
+            if other == r.id:
+                continue
+            current = self.neighbours.get(other, [])
+            listed = any(n == r.id for n, _ in current)
+            floor = current[-1][1] if len(current) >= self.top_k else 0.0
+            if listed or scores[other_row] > floor:
+                merged = [(n, s) for n, s in current if n != r.id] + [(r.id, float(scores[other_row]))]
+                merged.sort(key=lambda ns: -ns[1])
+                self.neighbours[other] = merged[: self.top_k]
+                changed.add(other)
+        return changed
+
+    def remove(self, blog_id: int) -> set:
+        row = self.row_of.pop(blog_id, None)
+        self.cards.pop(blog_id, None)
+        self.neighbours.pop(blog_id, None)
+        if row is None:
+            return set()
+        self.ids[row] = -1
+        self.matrix[row] = 0.0
+        # Lists that pointed at the removed blog need a replacement neighbour.
+        changed = {other for other, ns in self.neighbours.items() if any(n == blog_id for n, _ in ns)}
+        for other in changed:
+            other_row = self.row_of[other]
+            self.neighbours[other] = self._top(other_row, self._scores(slice(other_row, other_row + 1))[0])
+        return changed
+
+    def payload(self, blog_id: int) -> List[dict]:
+        return [
+            {**self.cards[n], "score": round(score, 4)}
+            for n, score in self.neighbours.get(blog_id, [])
+            if n in self.cards
+        ]
+
+
+# ------------------------------
+# Process-wide index + persistence
+# ------------------------------
+_index: Optional[RelatedIndex] = None
+_lock = threading.Lock()  # held while the index is built or updated
+
+# Work waiting for the index; guarded by _pending_lock.
+_pending_lock = threading.Lock()
+_pending_removed: set = set()
+_dirty = False
+_builder: Optional[threading.Thread] = None
+_build_queued = False
+_build_rewrite = False
+
+
+def _new_index() -> RelatedIndex:
+    return RelatedIndex(
+        max_features=settings.RELATED_MAX_FEATURES,
+        top_k=settings.RELATED_TOP_K,
+        category_boost=settings.RELATED_CATEGORY_BOOST,
+        author_boost=settings.RELATED_AUTHOR_BOOST,
+    )
+
+
+def _persist(db, index: RelatedIndex, blog_ids: Iterable[int]) -> None:
+    blog_ids = list(blog_ids)
+    for start in range(0, len(blog_ids), 1000):
+        chunk = blog_ids[start:start + 1000]
+        db.execute(delete(BlogRelated).where(BlogRelated.blog_id.in_(chunk)))
+        rows = [
+            {"blog_id": blog_id, "related": index.payload(blog_id), "updated_at": datetime.utcnow()}
+            for blog_id in chunk
+            if blog_id in index.row_of
+        ]
+        if rows:
+            db.execute(insert(BlogRelated), rows)
+    db.commit()
+
+
+def _build_locked(db, rewrite: bool) -> RelatedIndex:
+    """Build a fresh index; store every list (`rewrite`) or only the missing ones."""
+    global _index
+    index = _new_index()
+    index.build(db.execute(select(*_COLUMNS)).all())
+    if rewrite:
+        db.execute(delete(BlogRelated))
+        _persist(db, index, list(index.row_of))
+    else:
+        stored = set(db.execute(select(BlogRelated.blog_id)).scalars())
+        _persist(db, index, [blog_id for blog_id in index.row_of if blog_id not in stored])
+    _index = index
+    return index
+
+
+def _take_pending() -> set:
+    global _dirty
+    with _pending_lock:
+        removed = set(_pending_removed)
+        _pending_removed.clear()
+        _dirty = False
+    return removed
+
+
+def _catch_up_locked(db, removed: Iterable[int]) -> None:
+    stmt = select(*_COLUMNS)
+    if _index.watermark is not None:
+        stmt = stmt.where(Blog.updated_at >= _index.watermark - WATERMARK_OVERLAP)
+    changed = set()
+    for blog_id in removed:
+        changed |= _index.remove(blog_id)
+    for r in db.execute(stmt).all():
+        changed |= _index.upsert(r)
+        if r.updated_at and (_index.watermark is None or r.updated_at > _index.watermark):
+            _index.watermark = r.updated_at
+    if changed:
+        _persist(db, _index, changed)
+
+
+def _drain_locked() -> None:
+    """Apply refreshes that arrived while the lock was held."""
+    while _dirty:
+        removed = _take_pending()
+        db = SessionLocal()
+        try:
+            _catch_up_locked(db, removed)
+        except Exception:
+            db.rollback()
+            logger.exception("Related-posts refresh failed")
+        finally:
+            db.close()
+
+
+def rebuild(rewrite: bool = True) -> int:
+    """Full rebuild: refits vocabulary and (by default) rewrites every stored list."""
+    with _lock:
+        db = SessionLocal()
+        try:
+            size = _build_locked(db, rewrite).size
+        finally:
+            db.close()
+        _drain_locked()
+        return size
+
+
+def _build_loop() -> None:
+    global _builder, _build_queued, _build_rewrite
+    while True:
+        with _pending_lock:
+            rewrite, _build_queued, _build_rewrite = _build_rewrite, False, False
+        try:
+            size = rebuild(rewrite)
+            logger.info("Related-posts index built over %d published blogs", size)
+        except Exception:
+            logger.exception("Related-posts index build failed")
+        with _pending_lock:
+            if not _build_queued:
+                _builder = None
+                return
+
+
+def rebuild_in_background(rewrite: bool = True) -> None:
+    """Rebuild on a background thread; calls made while one runs queue one more."""
+    global _builder, _build_queued, _build_rewrite
+    with _pending_lock:
+        _build_queued = True
+        _build_rewrite = _build_rewrite or rewrite
+        if _builder is None:
+            _builder = threading.Thread(target=_build_loop, name="related-index", daemon=True)
+            _builder.start()
+
+
+def start() -> None:
+    """Build this worker's index at startup, storing lists only where missing."""
+    rebuild_in_background(rewrite=False)
+
+
+def refresh(removed: Iterable[int] = ()) -> None:
+    """
+    Catch the index up with blogs changed since the last pass and persist the
+    neighbour lists that moved. Meant to run after a write has been committed.
+    Returns at once if a pass or build holds the index; that one picks the
+    work up. Deletions made by other workers are only picked up by `rebuild`.
+    """
+    global _dirty
+    with _pending_lock:
+        _pending_removed.update(removed)
+        _dirty = True
+    # Re-checked after releasing: work queued while the lock was held must not be lost.
+    while _dirty and _index is not None:
+        if not _lock.acquire(blocking=False):
+            return
+        try:
+            _drain_locked()
+        finally:
+            _lock.release()
+
+
+if __name__ == "__main__":
+    import app.db.all_models  # noqa: F401
+
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m app.services.related rebuild")
+    print(f"Indexed {rebuild()} published blogs")
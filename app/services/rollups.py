@@ -0,0 +1,225 @@
+# app/services/rollups.py
+"""
+Dashboard rollups: blog and user counts by month, status, category, author,
+role and department, kept in `dashboard_stats`.
+
+Each write that creates, changes or deletes a blog or user passes the
+buckets the row counted in before and after the write to `apply`. `apply`
+adds the difference with one batched upsert on the write's own connection, so
+the counts commit or roll back with the write. Buckets that did not change
+are not touched. Cascading deletes in app/services/cascade.py do the same per
+batch.
+
+`reconcile()` corrects drift (for example from rows written outside the API).
+A single plain SELECT groups `blogs` and `users` per metric and subtracts
+the stored counts. Because it is one statement, both sides come from the
+same snapshot, and on MySQL it is a non-locking read. Only the non-zero
+differences are then added back, as increments in a short transaction, so
+they commute with writes that `apply` in the meantime. It runs in a
+background thread at startup and then every `ROLLUP_RECONCILE_SECONDS`. Each
+run is claimed through the `rollup-reconcile` row in `jobs`, so one process
+reconciles per period however many workers there are.
+
+`stats()` reads everything back with a single primary-key-ordered SELECT.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, case, cast, func, insert, literal, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.db.upsert import increment_rows
+from app.models.blog import Blog
+from app.models.dashboard import DashboardStat
+from app.models.job import Job
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+Bucket = Tuple[str, str]  # (metric, bucket)
+
+_table = DashboardStat.__table__
+_jobs = Job.__table__
+JOB_ID = "rollup-reconcile"
+_stop = threading.Event()
+_thread: threading.Thread = None
+
+
+def _key(value) -> str:
+    return "none" if value is None else str(value)
+
+
+def _month_key(value: Optional[datetime]) -> str:
+    return "none" if value is None else value.strftime("%Y-%m")
+
+
+# ------------------------------
+# Incremental maintenance
+# ------------------------------
+def blog_buckets(blog) -> List[Bucket]:
+    """Buckets a blog (model instance or row) counts in; take it after a flush."""
+    return [
+        ("blogs_by_status", "published" if blog.is_published else "draft"),
+        ("blogs_by_month", _month_key(blog.created_at)),
+        ("blogs_by_category", _key(blog.category_id)),
+        ("blogs_by_author", _key(blog.author_id)),
+    ]
+
+
+def user_buckets(user) -> List[Bucket]:
+    """Buckets a user counts in; take it after a flush."""
+    return [
+        ("users_by_status", "active" if user.is_active else "inactive"),
+        ("users_by_role", _key(user.role_id)),
+        ("users_by_department", _key(user.department_id)),
+    ]
+
+
+def apply(db: Session, removed: Iterable[Bucket] = (), added: Iterable[Bucket] = ()) -> None:
+    """Move counts from `removed` to `added` inside the session's transaction."""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    rows = [{"metric": m, "bucket": b, "value": n} for (m, b), n in deltas.items() if n]
+    increment_rows(db.connection(), _table, ("metric", "bucket"), "value", rows)
+
+
+# ------------------------------
+# Full reconcile
+# ------------------------------
+def _month(dialect: str, column):
+    if dialect == "mysql":
+        return func.date_format(column, "%Y-%m")
+    if dialect == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def _grouped(metric: str, bucket, model):
+    # Grouped by label: repeating the expression would repeat its bind parameters.
+    bucket = func.coalesce(bucket, "none").label("bucket")
+    return (
+        select(literal(metric).label("metric"), bucket, func.count().label("value"))
+        .select_from(model).group_by("bucket")
+    )
+
+
+def _queries(dialect: str) -> list:
+    return [
+        _grouped("blogs_by_status", case((Blog.is_published.is_(True), "published"), else_="draft"), Blog),
+        _grouped("blogs_by_month", _month(dialect, Blog.created_at), Blog),
+        _grouped("blogs_by_category", cast(Blog.category_id, String), Blog),
+        _grouped("blogs_by_author", cast(Blog.author_id, String), Blog),
+        _grouped("users_by_status", case((User.is_active.is_(True), "active"), else_="inactive"), User),
+        _grouped("users_by_role", cast(User.role_id, String), User),
+        _grouped("users_by_department", cast(User.department_id, String), User),
+    ]
+
+
+def _drift(dialect: str):
+    """(metric, bucket, true count - stored count) for every bucket that is off."""
+    stored = select(_table.c.metric, _table.c.bucket, (-_table.c.value).label("value"))
+    both = union_all(*_queries(dialect), stored).subquery()
+    delta = func.sum(both.c.value)
+    return select(both.c.metric, both.c.bucket, delta).group_by(both.c.metric, both.c.bucket).having(delta != 0)
+
+
+def reconcile() -> int:
+    """Bring every rollup back in line with the base tables; returns the buckets corrected."""
+    with engine.connect() as conn:
+        rows = [{"metric": m, "bucket": b, "value": int(n)} for m, b, n in conn.execute(_drift(conn.dialect.name))]
+    if rows:
+        with engine.begin() as conn:
+            increment_rows(conn, _table, ("metric", "bucket"), "value", rows)
+        logger.info("Dashboard rollups: corrected %d buckets", len(rows))
+    return len(rows)
+
+
+def claim(min_age: float) -> bool:
+    """
+    Take this period's reconcile unless another process ran one in the last
+    `min_age` seconds (the `jobs` row's `updated_at` moves at claim and at
+    finish). The row is updated conditionally, so exactly one of several
+    workers waking together gets it.
+    """
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        taken = conn.execute(
+            update(_jobs)
+            .where(_jobs.c.id == JOB_ID)
+            .where(or_(_jobs.c.updated_at.is_(None), _jobs.c.updated_at <= now - timedelta(seconds=min_age)))
+            .values(status="running", updated_at=now, error=None)
+        ).rowcount
+        if taken or conn.execute(select(_jobs.c.id).where(_jobs.c.id == JOB_ID)).first() is not None:
+            return bool(taken)
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(_jobs).values(
+                id=JOB_ID, kind="reconcile_rollups", status="running", done=0, created_at=now, updated_at=now,
+            ))
+    except IntegrityError:
+        return False  # another worker created it first
+    return True
+
+
+def _finish(corrected: Optional[int], error: Optional[str] = None) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            update(_jobs).where(_jobs.c.id == JOB_ID).values(
+                status="failed" if error else "done", done=corrected or 0, error=error, finished_at=datetime.utcnow(),
+            )
+        )
+
+
+def _run() -> None:
+    # Slightly under the period, so a worker's own last claim never refuses its next wake-up.
+    min_age = settings.ROLLUP_RECONCILE_SECONDS * 0.9 if settings.ROLLUP_RECONCILE_SECONDS > 0 else 60
+    while True:
+        try:
+            if claim(min_age):
+                try:
+                    _finish(reconcile())
+                except Exception as exc:
+                    _finish(None, str(exc))
+                    raise
+        except Exception:
+            logger.exception("Dashboard rollup reconcile failed")
+        if settings.ROLLUP_RECONCILE_SECONDS <= 0 or _stop.wait(settings.ROLLUP_RECONCILE_SECONDS):
+            return
+
+
+def start() -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="rollup-reconcile", daemon=True)
+    _thread.start()
+    atexit.unregister(stop)  # once, however often the app starts
+    atexit.register(stop)
+
+
+def stop() -> None:
+    _stop.set()
+
+
+# ------------------------------
+# Reading
+# ------------------------------
+def stats(db: Session) -> Dict[str, Dict[str, int]]:
+    """{metric: {bucket: count}} for every non-zero bucket, buckets in key order."""
+    result: Dict[str, Dict[str, int]] = {}
+    rows = db.execute(
+        select(DashboardStat.metric, DashboardStat.bucket, DashboardStat.value)
+        .where(DashboardStat.value > 0)
+        .order_by(DashboardStat.metric, DashboardStat.bucket)
+    )
+    for metric, bucket, value in rows:
+        result.setdefault(metric, {})[bucket] = value
+    return result
@@ -0,0 +1,231 @@
+# app/services/suggest.py
+"""
+In-memory typeahead over blog titles/slugs, author names/slugs and category
+names/slugs.
+
+Each type keeps a sorted array of normalised keys; a prefix query is one
+`bisect` plus a scan of at most `limit` matches, so lookups stay in the
+microseconds even with 100k+ entries. Keys whose label starts with the query
+("primary") rank ahead of matches on a later word of the label
+("secondary").
+
+`start()` builds the index on a background thread at startup; until it is
+ready, queries return no matches rather than build inside a request. Writes
+in this process apply their change directly (`upsert` / `remove`): the key
+arrays are copied with the new keys merged in and swapped whole, so a
+concurrent search sees the old or the new arrays, never a mix. Every process
+also rebuilds in the background once its copy is older than
+`SUGGEST_REFRESH_SECONDS`, so writes made by other workers show up; it keeps
+serving the old index meanwhile, and changes applied during the rebuild are
+replayed onto the new one.
+"""
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.author import Author
+from app.models.blog import Blog
+from app.models.category import Category
+
+logger = logging.getLogger(__name__)
+
+TYPES = ("blog", "author", "category")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalise(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _keys(label: str, slug: str) -> Tuple[List[str], List[str]]:
+    """(primary, secondary) keys of one entry."""
+    words = normalise(label).split()
+    primary, secondary = [], []
+    if words:
+        primary.append(" ".join(words))
+        secondary.extend(" ".join(words[i:]) for i in range(1, len(words)))
+    slug_key = normalise(slug)
+    if slug_key and slug_key != " ".join(words):
+        primary.append(slug_key)
+    return primary, secondary
+
+
+class PrefixIndex:
+    def __init__(self, entries: List[Tuple[int, str, str]]) -> None:
+        """`entries` are (id, label, slug)."""
+        # Removed entries become None; their keys are skipped until the next rebuild.
+        self.entries: List[Optional[Tuple[int, str, str]]] = list(entries)
+        self.ref_of: Dict[int, int] = {}
+        primary, secondary = [], []
+        for ref, (id_, label, slug) in enumerate(self.entries):
+            self.ref_of[id_] = ref
+            first, rest = _keys(label, slug)
+            primary.extend((k, ref) for k in first)
+            secondary.extend((k, ref) for k in rest)
+        self.tiers = []
+        for pairs in (primary, secondary):
+            pairs.sort()
+            self.tiers.append(([k for k, _ in pairs], [r for _, r in pairs]))
+
+    def __len__(self) -> int:
+        return len(self.ref_of)
+
+    def upsert(self, id_: int, label: str, slug: str) -> None:
+        """Add or replace one entry. Callers serialise writes; searches may run alongside."""
+        self.remove(id_)
+        ref = len(self.entries)
+        self.entries.append((id_, label, slug))
+        tiers = []
+        for (keys, refs), new_keys in zip(self.tiers, _keys(label, slug)):
+            pairs = list(zip(keys, refs))
+            for key in new_keys:
+                insort(pairs, (key, ref))
+            tiers.append(([k for k, _ in pairs], [r for _, r in pairs]))
+        self.tiers = tiers
+        self.ref_of[id_] = ref
+
+    def remove(self, id_: int) -> None:
+        ref = self.ref_of.pop(id_, None)
+        if ref is not None:
+            self.entries[ref] = None
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[int, str, str]]:
+        found: List[int] = []
+        seen = set()
+        entries = self.entries
+        for keys, refs in self.tiers:
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and keys[i].startswith(prefix):
+                ref = refs[i]
+                if ref not in seen and entries[ref] is not None:
+                    seen.add(ref)
+                    found.append(ref)
+                    if len(found) >= limit:
+                        return [entries[r] for r in found]
+                i += 1
+        return [entries[r] for r in found]
+
+
+_indexes: Dict[str, PrefixIndex] = {}
+_built_at = 0.0
+_ready = threading.Event()
+_rebuilding = threading.Lock()
+_write_lock = threading.Lock()  # serialises changes and the swap to a rebuilt index
+_journal: Optional[List[Callable[[Dict[str, PrefixIndex]], None]]] = None  # changes made during a rebuild
+
+
+def build() -> Dict[str, PrefixIndex]:
+    db = SessionLocal()
+    try:
+        return {
+            "blog": PrefixIndex(db.execute(select(Blog.id, Blog.title, Blog.slug)).all()),
+            "author": PrefixIndex(db.execute(select(Author.id, Author.name, Author.slug)).all()),
+            "category": PrefixIndex(db.execute(select(Category.id, Category.name, Category.slug)).all()),
+        }
+    finally:
+        db.close()
+
+
+def _rebuild() -> None:
+    global _indexes, _built_at, _journal
+    started = time.monotonic()
+    with _write_lock:
+        _journal = []
+    try:
+        fresh = build()
+    except Exception:
+        logger.exception("Suggest index rebuild failed")
+        with _write_lock:
+            _journal = None
+        return
+    with _write_lock:
+        # Changes committed after build() read their table would otherwise be lost.
+        for change in _journal:
+            change(fresh)
+        _indexes, _built_at, _journal = fresh, started, None
+    _ready.set()
+
+
+def _rebuild_in_background() -> None:
+    if not _rebuilding.acquire(blocking=False):
+        return  # one rebuild at a time
+
+    def run():
+        try:
+            _rebuild()
+        finally:
+            _rebuilding.release()
+
+    threading.Thread(target=run, name="suggest-rebuild", daemon=True).start()
+
+
+def start() -> None:
+    """Build the index at startup, off the request path."""
+    _rebuild_in_background()
+
+
+def _apply(change: Callable[[Dict[str, PrefixIndex]], None]) -> None:
+    with _write_lock:
+        change(_indexes)
+        if _journal is not None:
+            _journal.append(change)
+
+
+def upsert(kind: str, id_: int, label: str, slug: str) -> None:
+    """Call after committing a create or update of a blog, author or category."""
+    def change(indexes: Dict[str, PrefixIndex]) -> None:
+        if kind in indexes:
+            indexes[kind].upsert(id_, label, slug)
+
+    _apply(change)
+
+
+def remove(kind: str, ids: Iterable[int]) -> None:
+    """Call after committing deletes."""
+    ids = list(ids)
+
+    def change(indexes: Dict[str, PrefixIndex]) -> None:
+        if kind in indexes:
+            for id_ in ids:
+                indexes[kind].remove(id_)
+
+    _apply(change)
+
+
+def _ensure_index() -> None:
+    if not _ready.is_set() or time.monotonic() - _built_at > settings.SUGGEST_REFRESH_SECONDS:
+        _rebuild_in_background()
+
+
+def suggest(q: str, types: Optional[List[str]] = None, limit: int = 10) -> List[dict]:
+    """Up to `limit` matches; with several types, results alternate between them."""
+    prefix = normalise(q)
+    if not prefix:
+        return []
+    _ensure_index()
+    indexes = _indexes
+
+    per_type = []
+    for kind in types or TYPES:
+        index = indexes.get(kind)
+        if index is not None:
+            per_type.append([
+                {"type": kind, "id": id_, "label": label, "slug": slug}
+                for id_, label, slug in index.search(prefix, limit)
+            ])
+
+    results = []
+    for rank in range(limit):
+        for matches in per_type:
+            if rank < len(matches):
+                results.append(matches[rank])
+    return results[:limit]
@@ -0,0 +1,125 @@
+# app/services/views.py
+"""
+Buffered blog view counters.
+
+`record()` only bumps an in-memory counter keyed by (blog id, UTC day), so a
+popular article costs no database write per hit. A background thread swaps
+the buffer out every `VIEW_FLUSH_SECONDS` and writes the aggregated deltas
+with one batched upsert into `blog_view_counts`; each worker flushes its own
+buffer, and the upsert adds to whatever the others wrote. A failed flush puts
+its deltas back into the buffer, and `stop()` (run at shutdown and at exit)
+flushes whatever is still pending.
+
+`popular()` ranks blogs by the views summed over the last N days, from a
+ranking cached for `POPULAR_CACHE_SECONDS`.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.session import engine
+from app.db.upsert import increment_rows
+from app.models.blog import Blog
+from app.models.blog_views import BlogViewCount
+
+logger = logging.getLogger(__name__)
+
+_pending: Counter = Counter()
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_stop = threading.Event()
+_thread: threading.Thread = None
+
+_ranking: Dict[Tuple[int, int], Tuple[float, List[dict]]] = {}
+
+
+def record(blog_id: int) -> None:
+    bucket = datetime.utcnow().date()
+    with _lock:
+        _pending[(blog_id, bucket)] += 1
+
+
+def flush() -> int:
+    """Write buffered deltas; returns the number of views flushed."""
+    global _pending
+    with _flush_lock:
+        with _lock:
+            batch, _pending = _pending, Counter()
+        if not batch:
+            return 0
+        rows = [{"blog_id": b, "bucket": d, "views": n} for (b, d), n in batch.items()]
+        try:
+            try:
+                with engine.begin() as conn:
+                    increment_rows(conn, BlogViewCount.__table__, ("blog_id", "bucket"), "views", rows)
+            except IntegrityError:
+                # Some blogs were deleted since they were viewed; drop their counts.
+                with engine.begin() as conn:
+                    live = set(conn.execute(
+                        select(Blog.id).where(Blog.id.in_({r["blog_id"] for r in rows}))
+                    ).scalars())
+                    rows = [r for r in rows if r["blog_id"] in live]
+                    increment_rows(conn, BlogViewCount.__table__, ("blog_id", "bucket"), "views", rows)
+        except Exception:
+            logger.exception("Flushing %d view counters failed; keeping them for the next attempt", len(rows))
+            with _lock:
+                _pending.update(batch)
+            return 0
+        return sum(batch.values())
+
+
+def _run() -> None:
+    while not _stop.wait(settings.VIEW_FLUSH_SECONDS):
+        flush()
+
+
+def start() -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="view-counter-flush", daemon=True)
+    _thread.start()
+    atexit.register(stop)
+
+
+def stop() -> None:
+    """Stop the flusher and write out anything still buffered."""
+    _stop.set()
+    if _thread is not None and _thread is not threading.current_thread():
+        _thread.join(timeout=settings.VIEW_FLUSH_SECONDS + 5)
+    flush()
+
+
+def popular(days: int, limit: int) -> List[dict]:
+    key = (days, limit)
+    cached = _ranking.get(key)
+    if cached is not None and time.monotonic() - cached[0] < settings.POPULAR_CACHE_SECONDS:
+        return cached[1]
+
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    totals = (
+        select(BlogViewCount.blog_id, func.sum(BlogViewCount.views).label("views"))
+        .where(BlogViewCount.bucket >= since)
+        .group_by(BlogViewCount.blog_id)
+        .subquery()
+    )
+    stmt = (
+        select(Blog.id, Blog.slug, Blog.title, Blog.deck, Blog.banner_img, totals.c.views)
+        .join(totals, totals.c.blog_id == Blog.id)
+        .where(Blog.is_published.is_(True))
+        .order_by(totals.c.views.desc(), Blog.id)
+        .limit(limit)
+    )
+    with engine.connect() as conn:
+        ranking = [dict(row._mapping) for row in conn.execute(stmt)]
+    _ranking[key] = (time.monotonic(), ranking)
+    return ranking
@@ -0,0 +1,43 @@
+# app/utils/batch.py
+from typing import Callable, Hashable, Iterable, List, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+def parse_keys(raw: str, cast: Callable[[str], K] = str) -> List[K]:
+    """
+    Split a comma-separated key list, dropping blanks and repeats while
+    keeping the requested order.
+    """
+    keys: List[K] = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            keys.append(cast(part))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid key: {part}")
+    return unique_keys(keys)
+
+
+def unique_keys(keys: Iterable[K]) -> List[K]:
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        raise HTTPException(status_code=400, detail="No keys given")
+    if len(keys) > settings.BATCH_MAX_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_KEYS} keys per request")
+    return keys
+
+
+def in_request_order(keys: List[K], rows: Iterable[T], key: Callable[[T], K]) -> Tuple[List[T], List[K]]:
+    """Order `rows` as `keys` were requested; returns (found, missing keys)."""
+    by_key = {key(r): r for r in rows}
+    found = [by_key[k] for k in keys if k in by_key]
+    missing = [k for k in keys if k not in by_key]
+    return found, missing
@@ -1,3 +1,4 @@
-def generate_employee_id(last_id: int) -> str:
-    # Example: last_id = 1 → "AW001"
-    return f"AW{str(last_id + 1).zfill(3)}"
+def generate_employee_id(user_id: int) -> str:
+    # Derived from the user's own id (after a flush), so concurrent creates can't collide.
+    # Example: user_id = 1 → "AW001"
+    return f"AW{str(user_id).zfill(3)}"
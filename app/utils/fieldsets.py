@@ -0,0 +1,65 @@
+# app/utils/fieldsets.py
+"""
+Sparse fieldsets: `?fields=id,slug,title` trims a response to the named
+top-level fields of its read schema and tells the query which columns and
+relationships it actually has to load.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy.orm import joinedload, load_only
+
+
+def parse_fields(raw: Optional[str], schema: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """None when no fieldset was asked for; otherwise the fields in schema order."""
+    if raw is None:
+        return None
+    names = {n.strip() for n in raw.split(",") if n.strip()}
+    if not names:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    unknown = names - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(n for n in schema.model_fields if n in names)
+
+
+def load_options(model, fields: Tuple[str, ...], relations: Dict[str, tuple]) -> List:
+    """
+    Query options loading only what `fields` needs. `relations` maps a schema
+    field to (relationship, foreign key column); those are joined only when
+    requested. The primary key is always loaded.
+    """
+    columns = []
+    options = []
+    for name in fields:
+        if name in relations:
+            relationship, fk = relations[name]
+            columns.append(fk)
+            options.append(joinedload(relationship))
+        else:
+            columns.append(getattr(model, name))
+    return [load_only(*columns), *options]
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(schema.model_fields[name].annotation)
+
+
+def dump_fields(schema: Type[BaseModel], obj, fields: Tuple[str, ...]) -> dict:
+    """Serialize just `fields` of an ORM object, validated as `schema` would."""
+    out = {}
+    for name in fields:
+        adapter = _adapter(schema, name)
+        value = adapter.validate_python(getattr(obj, name), from_attributes=True)
+        out[name] = adapter.dump_python(value, mode="json")
+    return out
+
+
+def dump_json(schema: Type[BaseModel], objs, fields: Tuple[str, ...]) -> bytes:
+    if isinstance(objs, list):
+        return to_json([dump_fields(schema, o, fields) for o in objs])
+    return to_json(dump_fields(schema, objs, fields))
@@ -0,0 +1,69 @@
+# benchmarks/compression.py
+"""
+CPU per request and bytes on the wire for blog detail / list responses:
+plain JSON, per-request gzip and brotli, and the per-revision compressed
+cache used by get_blog and list_blogs.
+
+    python -m benchmarks.compression --save bench/compression.json
+"""
+import sys
+
+from starlette.requests import Request
+
+from app.core import compression
+from app.core.compression import body_cache, cached_json_response, compress
+from app.schemas.blog import BlogRead
+from benchmarks import fixtures
+from benchmarks.harness import main
+
+
+def _request(encoding: str) -> Request:
+    return Request({"type": "http", "method": "GET", "headers": [(b"accept-encoding", encoding.encode())]})
+
+
+def _payloads():
+    r = fixtures.rng()
+    detail = fixtures.make_blog(r, 1, sections=30)
+    page = [fixtures.make_blog(r, i, sections=8) for i in range(2, 22)]
+
+    def dump_detail() -> bytes:
+        return BlogRead.model_validate(detail).model_dump_json().encode()
+
+    def dump_page() -> bytes:
+        return b"[" + b",".join(BlogRead.model_validate(b).model_dump_json().encode() for b in page) + b"]"
+
+    return {"detail": dump_detail, "list-20": dump_page}
+
+
+def print_sizes() -> None:
+    print(f"\n{'payload':<10} {'identity':>10} {'gzip-6':>10} {'gzip-9':>10}", end="")
+    encodings = [("gzip", False), ("gzip", True)]
+    if compression.brotli is not None:
+        print(f" {'br-dyn':>10} {'br-cached':>10}", end="")
+        encodings += [("br", False), ("br", True)]
+    print()
+    for name, dump in _payloads().items():
+        body = dump()
+        sizes = [len(compress(body, enc, cached=cached)) for enc, cached in encodings]
+        print(f"{name:<10} {len(body):>10} " + " ".join(f"{s:>10}" for s in sizes))
+    print()
+
+
+def build_cases():
+    print_sizes()
+    cases = []
+    encodings = ["gzip"] + (["br"] if compression.brotli is not None else [])
+    for name, dump in _payloads().items():
+        cases.append((f"{name}/serialize-only", dump))
+        for enc in encodings:
+            cases.append((f"{name}/serialize+{enc}-per-request", lambda d=dump, e=enc: compress(d(), e)))
+            request = _request(enc)
+            key = ("bench", name)
+            body_cache.clear()
+            cached_json_response(request, key, dump)  # warm the revision
+            cases.append((f"{name}/cached-{enc}-hit", lambda r=request, k=key, d=dump: cached_json_response(r, k, d)))
+    return cases
+
+
+if __name__ == "__main__":
+    sys.exit(main("compression", __doc__, build_cases))
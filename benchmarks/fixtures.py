@@ -0,0 +1,119 @@
+# benchmarks/fixtures.py
+"""
+Synthetic, deterministic fixtures shared by the benchmark and load-test scripts.
+Everything here is built from a seeded RNG so two runs see identical data.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+from app.models.author import Author
+from app.models.blog import Blog
+from app.models.category import Category
+from app.models.department import Department
+from app.models.role import Role
+from app.models.user import User
+
+WORDS = (
+    "seo content strategy marketing design brand growth search social video "
+    "analytics campaign audience conversion funnel landing page mobile ux ui "
+    "performance web development launch guide tips trends agency client "
+    "story creative editorial product data insight workflow team hiring"
+).split()
+
+BASE_DATE = datetime(2024, 1, 1)
+
+
+def rng(seed: int = 42) -> random.Random:
+    return random.Random(seed)
+
+
+def sentence(r: random.Random, words: int = 12) -> str:
+    return " ".join(r.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def paragraph(r: random.Random, sentences: int = 6) -> str:
+    return " ".join(sentence(r, r.randint(8, 20)) for _ in range(sentences))
+
+
+def make_sections(r: random.Random, count: int = 20) -> List[dict]:
+    """Raw section dicts shaped like the admin panel sends them."""
+    return [
+        {
+            "title": sentence(r, 5),
+            "text": paragraph(r, 4),
+            "img": f"https://cdn.example.com/img/{r.randint(1, 10**6)}.jpg" if i % 3 == 0 else None,
+            "order": str(i) if i % 2 else None,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_author(r: random.Random, idx: int) -> Author:
+    return Author(
+        id=idx,
+        name=f"Author {idx}",
+        slug=f"author-{idx}",
+        role="Senior SEO Strategist",
+        bio=paragraph(r, 3),
+        avatar=f"https://cdn.example.com/avatars/{idx}.png",
+        created_at=BASE_DATE,
+        updated_at=BASE_DATE,
+    )
+
+
+def make_category(r: random.Random, idx: int) -> Category:
+    return Category(
+        id=idx,
+        name=f"Category {idx}",
+        slug=f"category-{idx}",
+        description=sentence(r, 15),
+        created_at=BASE_DATE,
+        updated_at=BASE_DATE,
+    )
+
+
+def make_blog(r: random.Random, idx: int, sections: int = 20) -> Blog:
+    """A transient Blog with nested author/category, as get_blog would load it."""
+    author = make_author(r, idx % 50 + 1)
+    category = make_category(r, idx % 12 + 1)
+    created = BASE_DATE + timedelta(minutes=idx)
+    return Blog(
+        id=idx,
+        title=sentence(r, 8),
+        slug=f"post-{idx}",
+        deck=sentence(r, 20),
+        banner_img=f"https://cdn.example.com/banners/{idx}.jpg",
+        banner_title=sentence(r, 6),
+        content=paragraph(r, 40),
+        content_html="<p>" + paragraph(r, 40) + "</p>",
+        sections=make_sections(r, sections),
+        author_id=author.id,
+        category_id=category.id,
+        author_name=author.name,
+        author_slug=author.slug,
+        author=author,
+        category_obj=category,
+        read_mins=r.randint(2, 15),
+        is_published=True,
+        created_at=created,
+        updated_at=created,
+    )
+
+
+def make_user(r: random.Random, idx: int) -> User:
+    role = Role(id=idx % 4 + 1, name=f"role-{idx % 4}", description="Standard employee")
+    dept = Department(id=idx % 10 + 1, name=f"Department {idx % 10}", description=None, is_active=True)
+    return User(
+        id=idx,
+        emp_id=f"AW{str(idx).zfill(3)}",
+        username=f"user{idx}",
+        full_name=f"User Number {idx}",
+        email=f"user{idx}@example.com",
+        password_hash="x",
+        is_active=bool(r.getrandbits(1)),
+        role_id=role.id,
+        role=role,
+        department_id=dept.id,
+        department=dept,
+    )
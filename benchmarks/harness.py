@@ -0,0 +1,139 @@
+# benchmarks/harness.py
+"""
+Tiny timing harness used by the benchmark scripts.
+
+Each case is timed like `timeit`: the loop count is calibrated until one
+repeat takes at least `min_time` seconds, then `repeat` repeats are recorded
+and reported per call. Results are saved as JSON so they can be compared
+against a baseline from an earlier build.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def time_case(fn: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> dict:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+
+    median = statistics.median(samples)
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "median_us": median * 1e6,
+        "min_us": min(samples) * 1e6,
+        "stdev_us": statistics.pstdev(samples) * 1e6,
+        "ops_per_sec": 1.0 / median if median else None,
+    }
+
+
+def run_cases(cases: List[Case], repeat: int, min_time: float, only: Optional[str] = None) -> Dict[str, dict]:
+    results = {}
+    for name, fn in cases:
+        if only and only not in name:
+            continue
+        results[name] = time_case(fn, repeat=repeat, min_time=min_time)
+        r = results[name]
+        print(f"{name:<45} {r['median_us']:>12.2f} us  (min {r['min_us']:.2f}, loops {r['loops']})")
+    return results
+
+
+def environment() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+    }
+
+
+def save(path: str, suite: str, results: Dict[str, dict]) -> None:
+    with open(path, "w") as fh:
+        json.dump({"suite": suite, "environment": environment(), "results": results}, fh, indent=2)
+    print(f"\nSaved {len(results)} results to {path}")
+
+
+def compare(baseline_path: str, results: Dict[str, dict], threshold: float) -> bool:
+    """
+    Compare medians against a saved baseline. Returns False when any case is
+    slower than baseline by more than `threshold` (0.2 == 20%).
+    """
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)["results"]
+
+    ok = True
+    print(f"\n{'case':<45} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<45} {'-':>12} {current['median_us']:>10.2f}us {'new':>8}")
+            continue
+        change = current["median_us"] / base["median_us"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(
+            f"{name:<45} {base['median_us']:>10.2f}us {current['median_us']:>10.2f}us "
+            f"{change:>+7.1%}{flag}"
+        )
+    for name in baseline:
+        if name not in results:
+            print(f"{name:<45} missing from current run")
+    return ok
+
+
+def build_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--save", metavar="PATH", help="write results JSON to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a baseline JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="allowed slowdown vs baseline before failing (default 0.2 == 20%%)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--only", help="run only cases whose name contains this string")
+    return parser
+
+
+def main(
+    suite: str,
+    description: str,
+    cases_factory: Callable[[], List[Case]],
+    argv=None,
+    annotate: Optional[Callable[[Dict[str, dict]], None]] = None,
+) -> int:
+    """`annotate`, if given, may add suite-specific figures to each result before saving."""
+    args = build_parser(description).parse_args(argv)
+    results = run_cases(cases_factory(), args.repeat, args.min_time, args.only)
+    if annotate is not None:
+        annotate(results)
+    if args.save:
+        save(args.save, suite, results)
+    if args.compare and not compare(args.compare, results, args.threshold):
+        print(f"\nFAILED: regression beyond {args.threshold:.0%} threshold")
+        return 1
+    return 0
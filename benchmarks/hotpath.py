@@ -0,0 +1,70 @@
+# benchmarks/hotpath.py
+"""
+Microbenchmarks for the per-request CPU work on the hot paths.
+
+    python -m benchmarks.hotpath --save bench/hotpath.json
+    python -m benchmarks.hotpath --compare bench/hotpath.json --threshold 0.2
+
+No database is needed: models are built as transient ORM objects.
+"""
+import sys
+
+from passlib.context import CryptContext
+
+from app.api.routes_blogs import _normalise_sections
+from app.core.security import create_access_token, pwd_context
+from app.schemas.blog import BlogRead, SectionItem
+from app.schemas.user import UserRead
+from app.services.suggest import PrefixIndex
+from app.utils.slugify import slugify
+from benchmarks import fixtures
+from benchmarks.harness import main
+
+
+def build_cases():
+    r = fixtures.rng()
+
+    raw_sections = fixtures.make_sections(r, 30)
+    model_sections = [SectionItem(**s) for s in raw_sections]
+
+    titles = [fixtures.sentence(r, 10) for _ in range(50)]
+    titles.append("Ünïcödé Tïtlé — with “quotes” & symbols: 2024/25 édition!")
+
+    blog_small = fixtures.make_blog(r, 1, sections=5)
+    blog_large = fixtures.make_blog(r, 2, sections=60)
+    blogs_page = [fixtures.make_blog(r, i, sections=10) for i in range(10, 30)]
+    user = fixtures.make_user(r, 7)
+    users = [fixtures.make_user(r, i) for i in range(100)]
+
+    password = "correct horse battery staple"
+    hashed = pwd_context.hash(password)
+    # The default context is slow on purpose; a low-rounds context isolates
+    # the passlib overhead from the key-stretching cost.
+    cheap_ctx = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__rounds=1000)
+    cheap_hash = cheap_ctx.hash(password)
+
+    suggest_index = PrefixIndex([
+        (i, fixtures.sentence(r, 7), f"post-{i}") for i in range(100_000)
+    ])
+
+    return [
+        ("normalise_sections/dicts-30", lambda: _normalise_sections(raw_sections)),
+        ("normalise_sections/models-30", lambda: _normalise_sections(model_sections)),
+        ("slugify/title", lambda: slugify(titles[0])),
+        ("slugify/titles-51", lambda: [slugify(t) for t in titles]),
+        ("blogread/5-sections", lambda: BlogRead.model_validate(blog_small)),
+        ("blogread/60-sections", lambda: BlogRead.model_validate(blog_large)),
+        ("blogread/page-20x10", lambda: [BlogRead.model_validate(b) for b in blogs_page]),
+        ("blogread/60-sections-json", lambda: BlogRead.model_validate(blog_large).model_dump_json()),
+        ("userread/single", lambda: UserRead.model_validate(user)),
+        ("userread/list-100", lambda: [UserRead.model_validate(u) for u in users]),
+        ("jwt/create_access_token", lambda: create_access_token({"sub": "1", "email": "admin@example.com"})),
+        ("suggest/prefix-100k", lambda: suggest_index.search("seo con", 10)),
+        ("suggest/word-prefix-100k", lambda: suggest_index.search("gro", 10)),
+        ("password/verify-default", lambda: pwd_context.verify(password, hashed)),
+        ("password/verify-1000-rounds", lambda: cheap_ctx.verify(password, cheap_hash)),
+    ]
+
+
+if __name__ == "__main__":
+    sys.exit(main("hotpath", __doc__, build_cases))
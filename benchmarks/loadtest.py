@@ -0,0 +1,364 @@
+# benchmarks/loadtest.py
+"""
+End-to-end load test: runs the real `app.main:app` in-process (no network,
+no uvicorn) against a local database, after seeding a synthetic dataset.
+
+    python -m benchmarks.loadtest --database-url sqlite:///./loadtest.db \\
+        --blogs 1000000 --authors 10000 --categories 500 --users 20000 \\
+        --concurrency 64 --duration 60 --report bench/loadtest.json
+
+Seeding only adds what an earlier run against the same database has not: each
+table is extended from the last seeded row up to the requested count, so
+repeated runs pay for it once and a larger `--blogs` seeds just the extra
+blogs. Timing starts once the app's startup work (document rendering, the
+related-posts and typeahead indexes, the rollup reconcile) has finished; the
+periodic reconcile is off for the run.
+Requires httpx (`pip install -r requirements-dev.txt`).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List
+
+from benchmarks import fixtures
+from benchmarks.harness import environment
+
+DEFAULT_MIX = "list=30,search=15,category=10,detail=30,create=5,update=5,login=5"
+PASSWORD = "loadtest-password"
+CHUNK = 5000
+
+
+# ------------------------------
+# Seeding
+# ------------------------------
+def seed(engine, args) -> None:
+    from sqlalchemy import func, insert, select
+
+    from app.core.security import pwd_context
+    from app.db.session import SessionLocal
+    from app.models.author import Author
+    from app.models.blog import Blog
+    from app.models.category import Category
+    from app.models.department import Department
+    from app.models.role import Role
+    from app.models.user import User
+    from app.seed.init_data import seed_initial_data
+
+    def seeded(column, pattern: str) -> int:
+        # Rows are seeded in order in one transaction, so the count is the last number seeded.
+        return db.execute(select(func.count()).where(column.like(pattern))).scalar()
+
+    db = SessionLocal()
+    try:
+        seed_initial_data(db)
+        have = {
+            "categories": seeded(Category.slug, "category-%"),
+            "authors": seeded(Author.slug, "author-%"),
+            "users": seeded(User.username, "lt-user-%"),
+            "blogs": seeded(Blog.slug, "lt-post-%"),
+        }
+        role_ids = [r for (r,) in db.execute(select(Role.id))]
+        dept_ids = [d for (d,) in db.execute(select(Department.id))]
+    finally:
+        db.close()
+
+    want = {"categories": args.categories, "authors": args.authors, "users": args.users, "blogs": args.blogs}
+    if all(have[k] >= want[k] for k in want):
+        print(f"Dataset present ({have['blogs']} blogs), skipping seed")
+        return
+
+    def missing(name: str) -> range:
+        return range(have[name] + 1, want[name] + 1)
+
+    r = fixtures.rng(args.seed)
+    started = time.perf_counter()
+
+    def bulk(conn, table, rows_iter, label):
+        total = len(missing(label))
+        if not total:
+            return
+        batch = []
+        for n, row in enumerate(rows_iter, start=1):
+            batch.append(row)
+            if len(batch) == CHUNK:
+                conn.execute(insert(table), batch)
+                batch = []
+                print(f"\r  {label}: {n}/{total}", end="", flush=True)
+        if batch:
+            conn.execute(insert(table), batch)
+        print(f"\r  {label}: {total}/{total}")
+
+    with engine.begin() as conn:
+        bulk(conn, Category.__table__, (
+            {
+                "id": i, "name": f"Category {i}", "slug": f"category-{i}",
+                "description": fixtures.sentence(r, 12),
+                "created_at": fixtures.BASE_DATE, "updated_at": fixtures.BASE_DATE,
+            }
+            for i in missing("categories")
+        ), "categories")
+
+        bulk(conn, Author.__table__, (
+            {
+                "id": i, "name": f"Author {i}", "slug": f"author-{i}",
+                "role": "Writer", "bio": fixtures.sentence(r, 25),
+                "avatar": f"https://cdn.example.com/avatars/{i}.png",
+                "created_at": fixtures.BASE_DATE, "updated_at": fixtures.BASE_DATE,
+            }
+            for i in missing("authors")
+        ), "authors")
+
+        password_hash = pwd_context.hash(PASSWORD)
+        bulk(conn, User.__table__, (
+            {
+                "emp_id": f"LT{str(i).zfill(6)}", "username": f"lt-user-{i}",
+                "full_name": f"Load Test User {i}", "email": f"lt-user-{i}@example.com",
+                "password_hash": password_hash, "is_active": True,
+                "role_id": r.choice(role_ids), "department_id": r.choice(dept_ids),
+            }
+            for i in missing("users")
+        ), "users")
+
+        def blog_rows():
+            # No explicit id: the workload's creates take ids past the seeded ones.
+            for i in missing("blogs"):
+                author_id = r.randint(1, args.authors)
+                created = fixtures.BASE_DATE + timedelta(minutes=i)
+                yield {
+                    "title": fixtures.sentence(r, 8), "slug": f"lt-post-{i}",
+                    "deck": fixtures.sentence(r, 18),
+                    "banner_img": f"https://cdn.example.com/banners/{i}.jpg",
+                    "content": fixtures.paragraph(r, args.content_sentences),
+                    "sections": fixtures.make_sections(r, args.sections),
+                    "author_id": author_id, "category_id": r.randint(1, args.categories),
+                    "author_name": f"Author {author_id}", "author_slug": f"author-{author_id}",
+                    "read_mins": r.randint(2, 15), "is_published": r.random() < 0.9,
+                    "created_at": created, "updated_at": created,
+                }
+
+        bulk(conn, Blog.__table__, blog_rows(), "blogs")
+
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+
+# ------------------------------
+# Workload
+# ------------------------------
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def op_list(r, args):
+    return "GET /api/blogs", "GET", "/api/blogs", {"params": {"skip": r.randint(0, 200), "limit": 20}}
+
+
+def op_search(r, args):
+    return "GET /api/blogs?q", "GET", "/api/blogs", {"params": {"q": r.choice(fixtures.WORDS), "limit": 20}}
+
+
+def op_category(r, args):
+    slug = f"category-{r.randint(1, args.categories)}"
+    return "GET /api/blogs?category", "GET", "/api/blogs", {"params": {"category": slug, "limit": 20}}
+
+
+def op_detail(r, args):
+    return "GET /api/blogs/{slug}", "GET", f"/api/blogs/lt-post-{r.randint(1, args.blogs)}", {}
+
+
+def op_create(r, args):
+    body = {
+        "title": fixtures.sentence(r, 8),
+        "deck": fixtures.sentence(r, 18),
+        "content": fixtures.paragraph(r, args.content_sentences),
+        "sections": fixtures.make_sections(r, args.sections),
+        "author_id": r.randint(1, args.authors),
+        "category_id": r.randint(1, args.categories),
+    }
+    return "POST /api/blogs", "POST", "/api/blogs", {"json": body}
+
+
+def op_update(r, args):
+    path = f"/api/blogs/lt-post-{r.randint(1, args.blogs)}"
+    return "PUT /api/blogs/{slug}", "PUT", path, {"json": {"deck": fixtures.sentence(r, 18)}}
+
+
+def op_login(r, args):
+    body = {"email": f"lt-user-{r.randint(1, args.users)}@example.com", "password": PASSWORD}
+    return "POST /api/auth/login", "POST", "/api/auth/login", {"json": body}
+
+
+OPERATIONS = {
+    "list": op_list,
+    "search": op_search,
+    "category": op_category,
+    "detail": op_detail,
+    "create": op_create,
+    "update": op_update,
+    "login": op_login,
+}
+
+
+# Threads app.main's startup launches; each ends once its one-off pass is done.
+STARTUP_THREADS = {"blog-documents", "related-index", "suggest-rebuild", "rollup-reconcile"}
+
+
+def wait_for_startup_work() -> None:
+    started = time.perf_counter()
+    for thread in threading.enumerate():
+        if thread.name in STARTUP_THREADS:
+            print(f"Waiting for {thread.name}...", flush=True)
+            thread.join()
+    print(f"Startup work finished in {time.perf_counter() - started:.1f}s")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+async def drive(app, args) -> dict:
+    import httpx
+
+    mix = parse_mix(args.mix)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    errors: Dict[str, int] = defaultdict(int)
+
+    deadline = time.perf_counter() + args.duration
+    remaining = [args.requests] if args.requests else None
+
+    async def worker(idx: int, client) -> None:
+        r = random.Random(args.seed * 1000 + idx)
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            label, method, path, kwargs = OPERATIONS[r.choices(names, weights)[0]](r, args)
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, path, **kwargs)
+                statuses[label][resp.status_code] += 1
+                if resp.status_code >= 500:
+                    errors[label] += 1
+            except Exception:
+                errors[label] += 1
+            latencies[label].append((time.perf_counter() - start) * 1000.0)
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        await asyncio.to_thread(wait_for_startup_work)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(i, client) for i in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+
+    def summarize(values: List[float]) -> dict:
+        values = sorted(values)
+        return {
+            "count": len(values),
+            "throughput_rps": len(values) / elapsed if elapsed else 0.0,
+            "mean_ms": sum(values) / len(values) if values else 0.0,
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "max_ms": values[-1] if values else 0.0,
+        }
+
+    routes = {}
+    for label, values in sorted(latencies.items()):
+        routes[label] = summarize(values)
+        routes[label]["errors"] = errors.get(label, 0)
+        routes[label]["status"] = {str(k): v for k, v in sorted(statuses[label].items())}
+
+    overall = summarize([v for values in latencies.values() for v in values])
+    overall["errors"] = sum(errors.values())
+    return {"elapsed_s": elapsed, "overall": overall, "routes": routes}
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{'route':<28} {'count':>8} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'err':>5}")
+    rows = list(report["routes"].items()) + [("TOTAL", report["overall"])]
+    for label, s in rows:
+        print(
+            f"{label:<28} {s['count']:>8} {s['throughput_rps']:>9.1f} {s['p50_ms']:>7.2f}ms "
+            f"{s['p95_ms']:>7.2f}ms {s['p99_ms']:>7.2f}ms {s['errors']:>5}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="In-process load test for app.main:app")
+    parser.add_argument("--database-url", default="sqlite:///./loadtest.db")
+    parser.add_argument("--blogs", type=int, default=100_000)
+    parser.add_argument("--authors", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, default=500)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--sections", type=int, default=6, help="sections per seeded blog")
+    parser.add_argument("--content-sentences", type=int, default=12, help="content length per seeded blog")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed-only", action="store_true", help="seed the dataset and exit")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--requests", type=int, default=0, help="stop after N requests (0 = duration only)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--report", metavar="PATH", help="write the JSON report to PATH")
+    return parser
+
+
+def run(args) -> dict:
+    # The engine is built when app.db.session is first imported, so the URL
+    # must be in place before that happens.
+    from app.core.config import settings
+
+    os.environ["DATABASE_URL"] = settings.DATABASE_URL = args.database_url
+    settings.ROLLUP_RECONCILE_SECONDS = 0  # reconcile once at startup, not mid-measurement
+
+    from app.db import migrate
+    from app.db.session import engine
+    from app.main import app
+
+    migrate.upgrade(engine)
+    seed(engine, args)
+    if args.seed_only:
+        return {}
+
+    results = asyncio.run(drive(app, args))
+    report = {
+        "environment": environment(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("report", "seed_only")},
+        **results,
+    }
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nReport written to {args.report}")
+    return report
+
+
+def main(argv=None) -> int:
+    run(build_parser().parse_args(argv))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# benchmarks/readpath.py
+"""
+ORM vs Core (app/db/reads.py) for the read-only listings: time per call,
+rows per second and peak memory allocated per call.
+
+    python -m benchmarks.loadtest --database-url sqlite:///./loadtest.db --seed-only
+    DATABASE_URL=sqlite:///./loadtest.db python -m benchmarks.readpath --save bench/readpath.json
+
+Runs against whatever `DATABASE_URL` points at; each case is the database
+query plus validation into the response schema (and JSON for blog pages),
+without the HTTP stack.
+"""
+import sys
+import tracemalloc
+from typing import Callable, Dict
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+import app.db.all_models  # noqa: F401
+from app.api.routes_blogs import _dump_blogs
+from app.db import reads
+from app.db.session import SessionLocal
+from app.models.author import Author
+from app.models.blog import Blog
+from app.models.category import Category
+from app.models.department import Department
+from app.models.role import Role
+from app.schemas.author import AuthorRead
+from app.schemas.category import CategoryRead
+from app.schemas.department import DepartmentRead
+from app.schemas.role import RoleRead
+from benchmarks.harness import main
+
+_rows: Dict[str, int] = {}
+_peak: Dict[str, int] = {}
+
+
+def _orm_blogs(db, ids):
+    rows = (
+        db.query(Blog)
+        .options(joinedload(Blog.author), joinedload(Blog.category_obj))
+        .filter(Blog.id.in_(ids))
+        .all()
+    )
+    by_id = {b.id: b for b in rows}
+    return _dump_blogs([by_id[i] for i in ids if i in by_id])
+
+
+def _measure(name: str, fn: Callable[[], object], rows: int) -> None:
+    fn()  # warm the statement cache
+    tracemalloc.start()
+    fn()
+    _peak[name] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    _rows[name] = rows
+
+
+def build_cases():
+    db = SessionLocal()
+    # A fresh session per call, as a request would get; closing it drops the identity map.
+    def per_request(fn):
+        def call():
+            session = SessionLocal()
+            try:
+                return fn(session)
+            finally:
+                session.close()
+        return call
+
+    cases = []
+    for size in (20, 100):
+        ids = db.execute(select(Blog.id).order_by(Blog.created_at.desc()).limit(size)).scalars().all()
+        cases.append((f"blogs/page-{size}/orm", per_request(lambda s, ids=ids: _orm_blogs(s, ids)), len(ids)))
+        cases.append((
+            f"blogs/page-{size}/core",
+            per_request(lambda s, ids=ids: _dump_blogs(reads.blogs_by_id(s, ids))),
+            len(ids),
+        ))
+    for name, model, schema, stmt, order in [
+        ("authors", Author, AuthorRead, reads.AUTHORS, Author.name),
+        ("categories", Category, CategoryRead, reads.CATEGORIES, Category.name),
+        ("roles", Role, RoleRead, reads.ROLES, None),
+        ("departments", Department, DepartmentRead, reads.DEPARTMENTS, None),
+    ]:
+        count = len(db.execute(stmt).all())
+
+        def orm(s, model=model, schema=schema, order=order):
+            query = s.query(model)
+            if order is not None:
+                query = query.order_by(order)
+            return [schema.model_validate(o) for o in query.all()]
+
+        cases.append((f"{name}/orm", per_request(orm), count))
+        cases.append((
+            f"{name}/core",
+            per_request(lambda s, schema=schema, stmt=stmt: [schema.model_validate(r) for r in reads.rows(s, stmt)]),
+            count,
+        ))
+    db.close()
+
+    for name, fn, rows in cases:
+        _measure(name, fn, rows)
+    return [(name, fn) for name, fn, _ in cases]
+
+
+def annotate(results: Dict[str, dict]) -> None:
+    print(f"\n{'case':<45} {'rows':>6} {'rows/sec':>12} {'peak KiB':>10}")
+    for name, r in results.items():
+        r["rows"] = _rows[name]
+        r["rows_per_sec"] = _rows[name] * r["ops_per_sec"] if r["ops_per_sec"] else None
+        r["peak_kib"] = _peak[name] / 1024
+        print(f"{name:<45} {r['rows']:>6} {r['rows_per_sec'] or 0:>12.0f} {r['peak_kib']:>10.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main("readpath", __doc__, build_cases, annotate=annotate))
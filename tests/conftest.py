@@ -0,0 +1,28 @@
+# tests/conftest.py
+"""
+Settings are read from the environment when app.core.config is imported, so
+point the app at a throwaway SQLite database (and media directory) before any
+test module imports it. Background view counting and periodic rollup
+reconciles are off so only the requests under test touch the database.
+"""
+import os
+import tempfile
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="aw-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp, 'app.db')}")
+os.environ.setdefault("MEDIA_ROOT", os.path.join(_tmp, "media"))
+os.environ.setdefault("VIEW_COUNTING", "false")
+os.environ.setdefault("ROLLUP_RECONCILE_SECONDS", "0")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """The app on the test database, started up (migrated and seeded) once."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
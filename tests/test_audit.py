@@ -0,0 +1,73 @@
+# tests/test_audit.py
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import engine
+from app.models.audit import AuditEvent
+from app.services import audit
+
+
+def _event(entity_id: int, entity="blog") -> dict:
+    return {
+        "entity": entity, "entity_id": entity_id, "action": "update", "changes": None,
+        "actor_id": None, "actor_email": None, "route": None, "created_at": datetime.utcnow(),
+    }
+
+
+def _written(*entity_ids: int) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).where(AuditEvent.entity_id.in_(entity_ids))).scalar()
+
+
+def test_a_rejected_event_is_dropped_without_blocking_the_log(client):
+    for event in (_event(900001), _event(900002, entity=None), _event(900003)):  # entity is NOT NULL
+        audit._queue.put(event)
+
+    audit.flush()  # the batch fails and is kept for a retry
+    audit.flush()  # the retry fails too: one row at a time
+
+    assert _written(900001, 900002, 900003) == 2
+    assert audit._retry == []
+
+    audit._queue.put(_event(900004))
+    audit.flush()
+    assert _written(900004) == 1
+
+
+def test_events_are_kept_while_the_database_is_unreachable(client, monkeypatch):
+    def unreachable(rows):
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(audit, "_insert", unreachable)
+    for entity_id in (900011, 900012):
+        audit._queue.put(_event(entity_id))
+
+    audit.flush()
+    audit.flush()
+    assert [e["entity_id"] for e in audit._retry] == [900011, 900012]
+
+    monkeypatch.undo()
+    audit.flush()
+    assert _written(900011, 900012) == 2
+
+
+class ExitHooks:
+    def __init__(self) -> None:
+        self.funcs = []
+
+    def register(self, func) -> None:
+        self.funcs.append(func)
+
+    def unregister(self, func) -> None:
+        self.funcs = [f for f in self.funcs if f != func]
+
+
+def test_stop_is_registered_at_exit_once(monkeypatch):
+    hooks = ExitHooks()
+    monkeypatch.setattr(audit, "atexit", hooks)
+    for _ in range(3):
+        audit.start()
+        audit.stop()
+    assert hooks.funcs == [audit.stop]
@@ -0,0 +1,45 @@
+# tests/test_body_cache.py
+"""
+Compressed bodies are cached per payload revision. Two edits within one
+second (MySQL's DATETIME resolution) must still produce different keys.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.db.session import engine
+from app.models.blog import Blog
+from app.models.blog_documents import BlogDocument
+
+_SAME_SECOND = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _pin_timestamps(blog_id: int) -> None:
+    """What MySQL stores for two writes in the same second: identical timestamps."""
+    with engine.begin() as conn:
+        conn.execute(update(Blog).where(Blog.id == blog_id).values(updated_at=_SAME_SECOND))
+        conn.execute(update(BlogDocument).where(BlogDocument.blog_id == blog_id).values(built_at=_SAME_SECOND))
+
+
+@pytest.mark.parametrize("query", ["", "?fields=id,slug,deck"], ids=["document", "fieldset"])
+def test_edits_in_the_same_second_are_not_served_stale(client, query):
+    slug = f"same-second{'-fields' if query else ''}"
+    blog = client.post("/api/blogs", json={"title": "Same second", "slug": slug}).json()
+    # gzip so the compressed variant is cached too
+    headers = {"Accept-Encoding": "gzip"}
+
+    for deck in ("first", "second"):
+        assert client.put(f"/api/blogs/{slug}", json={"deck": deck}).status_code == 200
+        _pin_timestamps(blog["id"])
+        assert client.get(f"/api/blogs/{slug}{query}", headers=headers).json()["deck"] == deck
+
+
+def test_list_pages_follow_edits_in_the_same_second(client):
+    blog = client.post("/api/blogs", json={"title": "Same second list"}).json()
+
+    for deck in ("first", "second"):
+        assert client.put(f"/api/blogs/{blog['slug']}", json={"deck": deck}).status_code == 200
+        _pin_timestamps(blog["id"])
+        page = client.get("/api/blogs?limit=100&fields=id,deck").json()
+        assert {b["id"]: b["deck"] for b in page}[blog["id"]] == deck
@@ -0,0 +1,255 @@
+# tests/test_cache.py
+import itertools
+
+import fakeredis
+import pytest
+import redis
+from starlette.requests import Request
+
+from app.core import cache
+from app.core.cache import Entry, MemoryBackend, RedisBackend
+
+_ids = itertools.count(1)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def entry(*tags: str, body: bytes = b"{}") -> Entry:
+    return Entry(body, None, tags)
+
+
+# ------------------------------
+# MemoryBackend
+# ------------------------------
+def test_memory_entry_expires_after_ttl(clock):
+    backend = MemoryBackend(max_entries=10)
+    backend.set("k", entry("blog:1"), ttl=30, token=backend.token())
+
+    clock.now += 29
+    assert backend.get("k") == entry("blog:1")
+    clock.now += 2
+    assert backend.get("k") is None
+
+
+def test_memory_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", entry(), ttl=60, token=backend.token())
+    backend.set("b", entry(), ttl=60, token=backend.token())
+    backend.get("a")  # a is now the most recently used
+    backend.set("c", entry(), ttl=60, token=backend.token())
+
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.get("c") is not None
+
+
+def test_memory_invalidate_drops_only_tagged_entries():
+    backend = MemoryBackend(max_entries=10)
+    backend.set("detail", entry("blog:1", "author:2"), ttl=60, token=backend.token())
+    backend.set("other", entry("blog:3", "author:4"), ttl=60, token=backend.token())
+    backend.set("list", entry("blogs:list"), ttl=60, token=backend.token())
+
+    backend.invalidate(["author:2"])
+
+    assert backend.get("detail") is None
+    assert backend.get("other") is not None
+    assert backend.get("list") is not None
+
+
+# ------------------------------
+# RedisBackend
+# ------------------------------
+@pytest.fixture
+def fake_redis():
+    return fakeredis.FakeRedis()
+
+
+def test_redis_entry_is_stored_with_ttl(fake_redis):
+    backend = RedisBackend(fake_redis)
+    backend.set("k", entry("blog:1", body=b'{"id": 1}'), ttl=30, token=backend.token())
+
+    assert backend.get("k") == entry("blog:1", body=b'{"id": 1}')
+    assert 0 < fake_redis.ttl("aw:cache:k") <= 30
+
+    fake_redis.delete("aw:cache:k")  # what Redis does once the TTL runs out
+    assert backend.get("k") is None
+
+
+def test_redis_invalidate_bumps_tag_versions(fake_redis):
+    backend = RedisBackend(fake_redis)
+    backend.set("detail", entry("blog:1", "category:5"), ttl=60, token=backend.token())
+    backend.set("list", entry("blogs:list"), ttl=60, token=backend.token())
+
+    backend.invalidate(["category:5"])
+
+    assert backend.get("detail") is None
+    assert backend.get("list") is not None
+    assert fake_redis.zscore("aw:cache:tags", "category:5") == 1
+
+    # Stored again after the write, under the new version: valid until the next bump.
+    backend.set("detail", entry("blog:1", "category:5"), ttl=60, token=backend.token())
+    assert backend.get("detail") is not None
+    backend.invalidate(["blog:1"])
+    assert backend.get("detail") is None
+
+
+class BrokenRedis(fakeredis.FakeRedis):
+    def get(self, *args, **kwargs):
+        raise redis.ConnectionError("connection refused")
+
+    def zmscore(self, *args, **kwargs):
+        raise redis.ConnectionError("connection refused")
+
+
+def test_redis_errors_are_misses():
+    backend = RedisBackend(BrokenRedis())
+
+    backend.set("k", entry("blog:1"), ttl=60, token=0)  # logged, not raised
+    assert backend.get("k") is None
+
+
+def test_redis_read_error_after_write_is_a_miss(fake_redis, monkeypatch):
+    backend = RedisBackend(fake_redis)
+    backend.set("k", entry("blog:1"), ttl=60, token=backend.token())
+
+    def down(*args, **kwargs):
+        raise redis.TimeoutError("timed out")
+
+    monkeypatch.setattr(fake_redis, "zmscore", down)
+    assert backend.get("k") is None
+
+
+# ------------------------------
+# Invalidation through the write routes
+# ------------------------------
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, monkeypatch):
+    if request.param == "memory":
+        backend = MemoryBackend(max_entries=100)
+    else:
+        backend = RedisBackend(fakeredis.FakeRedis())
+    monkeypatch.setattr(cache, "backend", backend)
+    return backend
+
+
+def _get(client, path: str):
+    # identity: the cache key is then exactly "<path>?<query>|identity"
+    response = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _cached(backend, path: str) -> bool:
+    return backend.get(f"{path}?|identity") is not None
+
+
+def _blog(client):
+    n = next(_ids)
+    author = client.post("/api/authors", json={"name": f"Cache Author {n}", "slug": f"cache-author-{n}"}).json()
+    category = client.post("/api/categories", json={"name": f"Cache Category {n}", "slug": f"cache-category-{n}"}).json()
+    blog = client.post("/api/blogs", json={
+        "title": f"Cache Post {n}", "slug": f"cache-post-{n}",
+        "author_id": author["id"], "category_id": category["id"],
+    })
+    assert blog.status_code == 201, blog.text
+    return blog.json()
+
+
+def test_blog_update_invalidates_its_detail_page(client, backend):
+    blog, other = _blog(client), _blog(client)
+    path, other_path = f"/api/blogs/{blog['slug']}", f"/api/blogs/{other['slug']}"
+    _get(client, path)
+    _get(client, other_path)
+    assert _cached(backend, path)
+
+    assert client.put(path, json={"deck": "Updated deck"}).status_code == 200
+
+    assert not _cached(backend, path)
+    assert _cached(backend, other_path)
+    assert _get(client, path).json()["deck"] == "Updated deck"
+
+
+def test_author_update_invalidates_its_blogs(client, backend):
+    blog, other = _blog(client), _blog(client)
+    path, other_path = f"/api/blogs/{blog['slug']}", f"/api/blogs/{other['slug']}"
+    _get(client, path)
+    _get(client, other_path)
+
+    response = client.put(f"/api/authors/{blog['author_id']}", json={"name": "Renamed Author"})
+    assert response.status_code == 200
+
+    assert not _cached(backend, path)
+    assert _cached(backend, other_path)
+    assert _get(client, path).json()["author"]["name"] == "Renamed Author"
+
+
+def test_category_update_invalidates_its_blogs(client, backend):
+    blog, other = _blog(client), _blog(client)
+    path, other_path = f"/api/blogs/{blog['slug']}", f"/api/blogs/{other['slug']}"
+    _get(client, path)
+    _get(client, other_path)
+
+    name = f"Renamed Category {blog['id']}"  # category names are unique
+    response = client.put(f"/api/categories/{blog['category_id']}", json={"name": name})
+    assert response.status_code == 200
+
+    assert not _cached(backend, path)
+    assert _cached(backend, other_path)
+    assert _get(client, path).json()["category"]["name"] == name
+
+
+def test_blog_write_invalidates_listings(client, backend):
+    _get(client, "/api/blogs")
+    assert _cached(backend, "/api/blogs")
+
+    _blog(client)
+
+    assert not _cached(backend, "/api/blogs")
+
+
+# ------------------------------
+# Reads racing writes
+# ------------------------------
+def _request(path: str) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": path, "query_string": b"",
+        "headers": [(b"accept-encoding", b"identity")],
+    })
+
+
+def test_write_between_read_and_store_is_not_cached(backend):
+    # lookup() -> SELECT (old rows) -> write commits + invalidate() -> store()
+    request = _request("/api/blogs/racy")
+    assert cache.lookup(request) is None
+    cache.invalidate("blog:7")
+    cache.store(request, b'{"deck": "old"}', None, ["blog:7", "blogs:list"])
+
+    assert not _cached(backend, "/api/blogs/racy")
+
+    # The next read starts after the write and is cached as usual.
+    request = _request("/api/blogs/racy")
+    assert cache.lookup(request) is None
+    cache.store(request, b'{"deck": "new"}', None, ["blog:7", "blogs:list"])
+    assert cache.lookup(_request("/api/blogs/racy")).body == b'{"deck": "new"}'
+
+
+def test_unrelated_write_during_read_does_not_block_caching(backend):
+    request = _request("/api/blogs/calm")
+    cache.lookup(request)
+    cache.invalidate("blog:8")
+    cache.store(request, b"{}", None, ["blog:9"])
+
+    assert _cached(backend, "/api/blogs/calm")
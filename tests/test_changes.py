@@ -0,0 +1,51 @@
+# tests/test_changes.py
+import asyncio
+from datetime import datetime
+
+from app.core.config import settings
+from app.schemas.changes import BlogChangesPage
+from app.services import changes
+
+
+class Connected:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_stream_sleeps_on_a_full_page_of_unsettled_rows(monkeypatch):
+    # Every row is younger than the settle window, so the token cannot move;
+    # the head is past the page, so the watcher would not block either.
+    monkeypatch.setattr(settings, "CHANGES_SETTLE_SECONDS", 0.5)
+    monkeypatch.setattr(changes.watcher, "head", 10_000)
+    now = datetime.utcnow()
+    page = BlogChangesPage.model_validate({
+        "changes": [{"seq": seq, "op": "delete", "id": seq, "slug": f"b{seq}", "changed_at": now} for seq in (5, 6)],
+        "next": "4",
+        "has_more": True,
+    })
+    reads = []
+
+    def read_page(since, limit):
+        reads.append(since)
+        return page
+
+    monkeypatch.setattr(changes, "read_page", read_page)
+
+    async def follow(seconds: float) -> list:
+        events = []
+        stream = changes.stream(Connected(), 4)
+
+        async def consume():
+            async for event in stream:
+                events.append(event)
+
+        try:
+            await asyncio.wait_for(consume(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        return events
+
+    events = asyncio.run(follow(0.3))
+
+    assert [e for e in events if e.startswith("id:")] == [events[1]]  # the page, sent once
+    assert len(reads) == 2  # the first read, then one re-read; then asleep until the rows settle
@@ -0,0 +1,55 @@
+# tests/test_media.py
+import io
+import os
+
+import pytest
+
+from app.core.config import settings
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(width: int = 800, height: int = 600) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _stored_files() -> list:
+    return sorted(
+        os.path.relpath(os.path.join(root, name), settings.MEDIA_ROOT)
+        for root, _, names in os.walk(settings.MEDIA_ROOT)
+        for name in names
+    )
+
+
+def _upload(client, data: bytes):
+    return client.post("/api/media", files={"file": ("upload.png", data, "image/png")})
+
+
+@pytest.mark.parametrize("data", [
+    _png()[:200],                    # valid signature, truncated body
+    b"GIF89a" + b"\x00" * 64,        # signature only
+], ids=["truncated-png", "corrupt-gif"])
+def test_undecodable_upload_is_rejected_and_not_kept(client, data):
+    before = _stored_files()
+
+    for _ in range(2):  # and stays rejected on retry
+        response = _upload(client, data)
+        assert response.status_code == 422, response.text
+        assert response.json() == {"detail": "Image could not be decoded"}
+
+    assert _stored_files() == before
+
+
+def test_upload_stores_original_variants_and_dedupes(client):
+    data = _png(700, 100)
+
+    first = _upload(client, data)
+    assert first.status_code == 201, first.text
+    assert [v["width"] for v in first.json()["variants"]] == [320, 640, 700]
+
+    second = _upload(client, data)
+    assert second.status_code == 201
+    assert second.json()["duplicate"] is True
+    assert second.json()["hash"] == first.json()["hash"]
@@ -0,0 +1,56 @@
+# tests/test_migrations.py
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+from app.db import migrate
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_matches_models_and_is_idempotent(engine):
+    versions = [m.VERSION for m in migrate.load_migrations()]
+
+    assert migrate.upgrade(engine) == versions
+    assert migrate.check(engine) == []
+    assert migrate.upgrade(engine) == []
+
+
+def test_baseline_is_the_pre_migration_schema(engine):
+    assert migrate.upgrade(engine, target=1) == [1]
+
+    inspector = inspect(engine)
+    blog_indexes = {i["name"] for i in inspector.get_indexes("blogs")}
+    assert "ix_blogs_published_created" not in blog_indexes
+    assert "ix_blogs_author_id" not in blog_indexes
+    assert not inspector.has_table("blog_changes")
+    assert all(not fk["options"].get("ondelete") for fk in inspector.get_foreign_keys("blogs"))
+    assert "foreign key on blogs ('author_id',) is ON DELETE NO ACTION, models say CASCADE" in migrate.check(engine)
+
+    assert migrate.upgrade(engine) == [v for v in (m.VERSION for m in migrate.load_migrations()) if v > 1]
+    assert migrate.check(engine) == []
+
+
+def test_sqlite_cascade_rebuild_keeps_rows(engine):
+    # Like the app's engine (app/db/sqlite.py): the rebuild must not cascade
+    # the old blogs table's drop into the tables that reference it.
+    event.listen(engine, "connect", lambda dbapi, _: dbapi.execute("PRAGMA foreign_keys = ON"))
+    migrate.upgrade(engine, target=2)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO authors (id, name, slug) VALUES (1, 'A', 'a')"))
+        conn.execute(text("INSERT INTO blogs (id, title, slug, author_id, is_published) VALUES (1, 'T', 't', 1, 1)"))
+        conn.execute(text("INSERT INTO blog_related (blog_id, related) VALUES (1, '[]')"))
+
+    migrate.upgrade(engine)
+
+    assert migrate.check(engine) == []
+    with engine.begin() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("SELECT count(*) FROM blog_related")).scalar() == 1
+        conn.execute(text("DELETE FROM authors WHERE id = 1"))
+        assert conn.execute(text("SELECT count(*) FROM blogs")).scalar() == 0
+        assert conn.execute(text("SELECT count(*) FROM blog_related")).scalar() == 0
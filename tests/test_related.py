@@ -0,0 +1,72 @@
+# tests/test_related.py
+import threading
+import time
+
+from app.services import related
+
+
+def _wait_for_builder(timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while related._builder is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert related._builder is None
+
+
+def _related_ids(client, slug: str) -> list:
+    response = client.get(f"/api/blogs/{slug}/related")
+    assert response.status_code == 200, response.text
+    return [r["id"] for r in response.json()]
+
+
+def _post(client, title: str) -> dict:
+    body = {"title": title, "content": "kubernetes autoscaling clusters pods nodes " * 5}
+    response = client.post("/api/blogs", json=body)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_startup_builds_the_index_off_the_request_path(client):
+    _wait_for_builder()
+    assert related._index is not None
+
+
+def test_refresh_does_not_wait_for_a_running_pass(client):
+    _wait_for_builder()
+    first = _post(client, "Kubernetes autoscaling basics")
+    related.rebuild()  # the vocabulary is fixed at build time; make sure it has these terms
+
+    related._lock.acquire()  # a pass (or build) in progress
+    try:
+        started = time.monotonic()
+        second = _post(client, "Kubernetes autoscaling in depth")  # its refresh must not block
+        assert time.monotonic() - started < 5
+        assert related._dirty
+    finally:
+        related._lock.release()
+
+    # The next refresh (here: the next write's) picks up the queued work too.
+    _post(client, "Unrelated gardening notes")
+    assert not related._dirty
+    assert second["id"] in _related_ids(client, first["slug"])
+
+
+def test_rebuild_in_background_coalesces(client, monkeypatch):
+    _wait_for_builder()
+    calls = []
+    gate = threading.Event()
+
+    def slow_rebuild(rewrite=True):
+        calls.append(rewrite)
+        gate.wait(5)
+        return 0
+
+    monkeypatch.setattr(related, "rebuild", slow_rebuild)
+    related.rebuild_in_background()
+    while not calls:
+        time.sleep(0.01)
+    for _ in range(4):
+        related.rebuild_in_background()
+    gate.set()
+    _wait_for_builder()
+
+    assert calls == [True, True]  # the running build plus one for everything queued behind it
@@ -0,0 +1,50 @@
+# tests/test_rollups.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+from app.db.session import SessionLocal, engine
+from app.models.blog import Blog
+from app.models.dashboard import DashboardStat
+from app.models.job import Job
+from app.services import rollups
+
+
+def _stats() -> dict:
+    db = SessionLocal()
+    try:
+        return rollups.stats(db)
+    finally:
+        db.close()
+
+
+def test_reconcile_corrects_only_the_drift(client):
+    author = client.post("/api/authors", json={"name": "Rollup Author", "slug": "rollup-author"}).json()
+    blog = client.post("/api/blogs", json={"title": "Rollup Post", "slug": "rollup-post", "author_id": author["id"]})
+    assert blog.status_code == 201, blog.text
+    rollups.reconcile()
+    table = DashboardStat.__table__
+    with engine.begin() as conn:
+        conn.execute(update(table).where(table.c.metric == "blogs_by_status").values(value=table.c.value + 3))
+        conn.execute(table.insert().values(metric="blogs_by_author", bucket="999999", value=4))
+        blogs = conn.execute(select(func.count()).select_from(Blog)).scalar()
+
+    assert rollups.reconcile() > 0
+    assert rollups.reconcile() == 0
+
+    stats = _stats()
+    assert "999999" not in stats.get("blogs_by_author", {})
+    assert sum(stats.get("blogs_by_status", {}).values()) == blogs
+
+
+def test_one_process_claims_each_period(client):
+    rollups._thread.join()  # the startup reconcile has claimed and finished
+    jobs = Job.__table__
+    with engine.begin() as conn:
+        conn.execute(update(jobs).where(jobs.c.id == rollups.JOB_ID).values(
+            updated_at=datetime.utcnow() - timedelta(hours=1),
+        ))
+
+    assert rollups.claim(60)
+    assert not rollups.claim(60)  # another worker waking now
+    assert rollups.claim(0)
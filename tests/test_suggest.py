@@ -0,0 +1,67 @@
+# tests/test_suggest.py
+import time
+
+from app.services import suggest
+from app.services.suggest import PrefixIndex
+
+
+def _labels(index: PrefixIndex, prefix: str) -> list:
+    return [label for _, label, _ in index.search(prefix, 10)]
+
+
+def test_prefix_index_upsert_and_remove():
+    index = PrefixIndex([(1, "Technical SEO checklist", "technical-seo-checklist")])
+
+    index.upsert(2, "SEO for startups", "seo-for-startups")
+    assert _labels(index, "seo") == ["SEO for startups", "Technical SEO checklist"]  # primary first
+
+    index.upsert(2, "Growth for startups", "growth-for-startups")  # renamed
+    assert _labels(index, "seo") == ["Technical SEO checklist"]
+    assert _labels(index, "gro") == ["Growth for startups"]
+
+    index.remove(1)
+    assert _labels(index, "seo") == []
+    assert len(index) == 1
+
+
+def _ready(timeout: float = 10.0) -> None:
+    assert suggest._ready.wait(timeout)
+    deadline = time.monotonic() + timeout
+    while suggest._rebuilding.locked() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def _suggested(client, q: str) -> list:
+    response = client.get("/api/suggest", params={"q": q, "type": "blog"})
+    assert response.status_code == 200, response.text
+    return [s["label"] for s in response.json()]
+
+
+def test_writes_update_the_index_without_a_rebuild(client, monkeypatch):
+    _ready()
+    monkeypatch.setattr(suggest, "build", lambda: (_ for _ in ()).throw(AssertionError("rebuilt")))
+
+    blog = client.post("/api/blogs", json={"title": "Zanzibar travel notes"}).json()
+    assert _suggested(client, "zanz") == ["Zanzibar travel notes"]
+
+    client.put(f"/api/blogs/{blog['slug']}", json={"title": "Zanzibar food notes"})
+    assert _suggested(client, "zanz") == ["Zanzibar food notes"]  # the old label is gone
+
+    client.delete(f"/api/blogs/{blog['slug']}")
+    assert _suggested(client, "zanz") == []
+
+
+def test_changes_during_a_rebuild_are_replayed(client, monkeypatch):
+    _ready()
+    real_build = suggest.build
+
+    def build_then_write():
+        indexes = real_build()  # read before the write below committed
+        suggest.upsert("blog", 10**9, "Quokka spotting guide", "quokka-spotting-guide")
+        return indexes
+
+    monkeypatch.setattr(suggest, "build", build_then_write)
+    suggest._rebuild()
+
+    assert [s["label"] for s in suggest.suggest("quokka", ["blog"])] == ["Quokka spotting guide"]
+    suggest.remove("blog", [10**9])
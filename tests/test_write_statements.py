@@ -0,0 +1,259 @@
+# tests/test_write_statements.py
+"""
+Write endpoints let the unique constraints reject conflicts instead of
+SELECTing first, and answer from the objects they just wrote instead of
+reloading them. These tests pin the statements each write issues and the 400
+each conflict maps to.
+"""
+import itertools
+import threading
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import engine
+
+# Threads started by the app itself; their statements are not the request's.
+_BACKGROUND_THREADS = {
+    "audit-flush", "rollup-reconcile", "blog-documents", "related-index", "suggest-rebuild", "view-counter-flush",
+}
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    """SQL issued while handling requests, reset with `statements.clear()`."""
+    # The related-posts refresh is a background task that runs after the response.
+    monkeypatch.setattr(settings, "RELATED_ENABLED", False)
+    seen = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.current_thread().name not in _BACKGROUND_THREADS:
+            seen.append(statement.split(None, 1)[0].upper() + " " + _table(statement))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield seen
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _table(statement: str) -> str:
+    words = statement.replace("\n", " ").split()
+    for keyword in ("INTO", "UPDATE", "FROM"):
+        if keyword in words:
+            return words[words.index(keyword) + 1]
+    return ""
+
+
+def _ok(response, code: int = 200) -> dict:
+    assert response.status_code == code, response.text
+    return response.json()
+
+
+def _conflict(response, detail: str) -> None:
+    assert response.status_code == 400, response.text
+    assert response.json() == {"detail": detail}
+
+
+def _role(client) -> dict:
+    return _ok(client.post("/api/roles", json={"name": f"role-{next(_ids)}"}), 201)
+
+
+def _department(client) -> dict:
+    return _ok(client.post("/api/departments", json={"name": f"dept-{next(_ids)}"}), 201)
+
+
+def _user(client, role: dict, **fields) -> dict:
+    n = next(_ids)
+    body = {
+        "username": f"user-{n}", "full_name": "Test User", "email": f"user-{n}@example.com",
+        "password": "secret", "role_id": role["id"], **fields,
+    }
+    return _ok(client.post("/api/users", json=body), 201)
+
+
+def _author(client) -> dict:
+    n = next(_ids)
+    return _ok(client.post("/api/authors", json={"name": f"Author {n}", "slug": f"author-{n}"}), 201)
+
+
+def _category(client) -> dict:
+    n = next(_ids)
+    return _ok(client.post("/api/categories", json={"name": f"Category {n}", "slug": f"category-{n}"}), 201)
+
+
+def _blog(client, **fields) -> dict:
+    return _ok(client.post("/api/blogs", json={"title": f"Post {next(_ids)}", **fields}), 201)
+
+
+# ------------------------------
+# Statements per write
+# ------------------------------
+def test_role_writes(client, statements):
+    statements.clear()
+    role = _role(client)
+    assert statements == ["INSERT roles"]
+
+    statements.clear()
+    _ok(client.put(f"/api/roles/{role['id']}", json={"description": "Updated"}))
+    assert statements == ["SELECT roles", "UPDATE roles"]
+
+
+def test_department_writes(client, statements):
+    statements.clear()
+    dept = _department(client)
+    assert statements == ["INSERT departments"]
+
+    statements.clear()
+    _ok(client.put(f"/api/departments/{dept['id']}", json={"description": "Updated"}))
+    assert statements == ["SELECT departments", "UPDATE departments"]
+
+
+def test_user_writes(client, statements):
+    role, dept = _role(client), _department(client)
+
+    statements.clear()
+    user = _user(client, role, department_id=dept["id"])
+    # role + department (part of the response), the row, its rollups, emp_id from the new id
+    assert statements == [
+        "SELECT roles", "SELECT departments", "INSERT users", "INSERT dashboard_stats", "UPDATE users",
+    ]
+    assert user["emp_id"] == f"AW{str(user['id']).zfill(3)}"
+    assert user["role"]["id"] == role["id"] and user["department"]["id"] == dept["id"]
+
+    statements.clear()
+    updated = _ok(client.put(f"/api/users/{user['id']}", json={"full_name": "Renamed"}))
+    # role and department are joined into the user's SELECT
+    assert statements == ["SELECT users", "UPDATE users"]
+    assert updated["full_name"] == "Renamed" and updated["role"]["id"] == role["id"]
+
+
+def test_author_writes(client, statements):
+    statements.clear()
+    author = _author(client)
+    assert statements == ["INSERT authors"]
+
+    statements.clear()
+    _ok(client.put(f"/api/authors/{author['id']}", json={"bio": "Updated"}))
+    # its blogs go on the changes feed and their documents are re-rendered later
+    assert statements == ["SELECT authors", "INSERT blog_changes", "DELETE blog_documents", "UPDATE authors"]
+
+
+def test_category_writes(client, statements):
+    statements.clear()
+    category = _category(client)
+    assert statements == ["INSERT categories"]
+
+    statements.clear()
+    _ok(client.put(f"/api/categories/{category['id']}", json={"description": "Updated"}))
+    assert statements == [
+        "SELECT categories", "INSERT blog_changes", "DELETE blog_documents", "UPDATE categories",
+    ]
+
+
+def test_blog_writes(client, statements):
+    author, category = _author(client), _category(client)
+
+    statements.clear()
+    blog = _blog(client, author_id=author["id"], category_id=category["id"])
+    assert statements == [
+        "SELECT blogs",            # free slug, one query
+        "SELECT authors", "SELECT categories",
+        "INSERT blogs",
+        "INSERT blog_changes",
+        "SELECT authors", "SELECT categories",  # documents.write share-locks them while rendering
+        "DELETE blog_documents", "INSERT blog_documents",
+        "INSERT dashboard_stats",
+    ]
+    assert blog["author"]["id"] == author["id"] and blog["category"]["id"] == category["id"]
+
+    statements.clear()
+    updated = _ok(client.put(f"/api/blogs/{blog['slug']}", json={"deck": "Updated"}))
+    assert statements == [
+        "SELECT blogs", "UPDATE blogs", "INSERT blog_changes",
+        "SELECT authors", "SELECT categories",
+        "DELETE blog_documents", "INSERT blog_documents",
+    ]
+    assert updated["deck"] == "Updated"
+
+
+# ------------------------------
+# Conflicts keep their 400s
+# ------------------------------
+def test_user_conflicts(client, statements):
+    role = _role(client)
+    taken = _user(client, role)
+    user = _user(client, role)
+
+    statements.clear()
+    _conflict(client.post("/api/users", json={
+        "username": taken["username"], "full_name": "Dup", "email": f"dup-{next(_ids)}@example.com",
+        "password": "secret", "role_id": role["id"],
+    }), "Username already in use")
+    assert statements == ["SELECT roles", "INSERT users"]  # no uniqueness pre-check
+
+    _conflict(client.post("/api/users", json={
+        "username": f"dup-{next(_ids)}", "full_name": "Dup", "email": taken["email"],
+        "password": "secret", "role_id": role["id"],
+    }), "Email already in use")
+    _conflict(client.put(f"/api/users/{user['id']}", json={"username": taken["username"]}), "Username already in use")
+    _conflict(client.put(f"/api/users/{user['id']}", json={"email": taken["email"]}), "Email already in use")
+    _conflict(client.post("/api/users", json={
+        "username": f"dup-{next(_ids)}", "full_name": "Dup", "email": f"dup-{next(_ids)}@example.com",
+        "password": "secret", "role_id": 999999,
+    }), "Invalid role_id")
+    _conflict(client.put(f"/api/users/{user['id']}", json={"department_id": 999999}), "Invalid department_id")
+
+    # Nothing from the failed writes stuck.
+    assert _ok(client.get(f"/api/users/{user['id']}"))["username"] == user["username"]
+
+
+def test_role_conflicts(client, statements):
+    taken, role = _role(client), _role(client)
+
+    statements.clear()
+    _conflict(client.post("/api/roles", json={"name": taken["name"]}), "Role already exists")
+    assert statements == ["INSERT roles"]
+    _conflict(client.put(f"/api/roles/{role['id']}", json={"name": taken["name"]}), "Role already exists")
+
+
+def test_department_conflicts(client):
+    taken, dept = _department(client), _department(client)
+
+    _conflict(client.post("/api/departments", json={"name": taken["name"]}), "Department already exists")
+    _conflict(client.put(f"/api/departments/{dept['id']}", json={"name": taken["name"]}), "Department already exists")
+
+
+def test_author_conflicts(client, statements):
+    taken, author = _author(client), _author(client)
+
+    statements.clear()
+    _conflict(client.post("/api/authors", json={"name": "Dup", "slug": taken["slug"]}), "Author slug already exists")
+    assert statements == ["INSERT authors"]
+    _conflict(client.put(f"/api/authors/{author['id']}", json={"slug": taken["slug"]}), "Author slug already exists")
+
+
+def test_category_conflicts(client, statements):
+    taken, category = _category(client), _category(client)
+
+    statements.clear()
+    _conflict(
+        client.post("/api/categories", json={"name": f"Fresh {next(_ids)}", "slug": taken["slug"]}),
+        "Category slug already exists",
+    )
+    assert statements == ["INSERT categories"]
+    _conflict(
+        client.post("/api/categories", json={"name": taken["name"], "slug": f"fresh-{next(_ids)}"}),
+        "Category name already exists",
+    )
+    _conflict(client.put(f"/api/categories/{category['id']}", json={"slug": taken["slug"]}), "Category slug already exists")
+    _conflict(client.put(f"/api/categories/{category['id']}", json={"name": taken["name"]}), "Category name already exists")
+
+
+def test_blog_slug_conflicts(client):
+    taken, blog = _blog(client), _blog(client)
+
+    _conflict(client.put(f"/api/blogs/{blog['slug']}", json={"slug": taken["slug"]}), "Slug already in use")
+    # Creating with a taken slug picks the next free one instead.
+    assert _blog(client, slug=taken["slug"])["slug"] == f"{taken['slug']}-2"